@@ -3,6 +3,8 @@ import json
 import math
 import os
 
+from simulacao import JOGADOR_W, JOGADOR_H, OBS_W, OBS_H, RAIO_MOEDA, politica
+
 ARQ_MELHOR = "melhor_agente.json"
 
 def _norm(vx, vy):
@@ -30,8 +32,7 @@ class AgenteParametrico:
         px, py = player_rect.center
         return min(moedas, key=lambda m: math.hypot(px - m.centerx, py - m.centery))
 
-    def _vet_atrair_moeda(self, player_rect, moedas):
-        alvo = self._moeda_alvo(player_rect, moedas)
+    def _vet_atrair_moeda(self, player_rect, alvo):
         if alvo is None:
             return 0.0, 0.0
         px, py = player_rect.center
@@ -55,14 +56,69 @@ class AgenteParametrico:
             rx, ry = rx / mag, ry / mag
         return rx, ry
 
+    def acao(self, estado):
+        """Direção para `simulacao.step` — a mesma política usada no treino."""
+        return politica(estado, self.alc, self.peso)
+
+    @staticmethod
+    def decidir_lote(px, py, alc, peso, moedas_x, moedas_y, obs_x, obs_y):
+        """
+        `politica` para N agentes de uma vez (arrays NumPy).
+        px, py, alc, peso: (N,) centros e genes de cada agente;
+        moedas_x/y, obs_x/y: cantos superiores esquerdos compartilhados por todos.
+        Devolve (vx, vy), dois arrays (N,) de direções unitárias.
+        """
+        import numpy as np  # só o modo multiagente precisa de NumPy
+
+        n = len(px)
+        ax = np.zeros(n)
+        ay = np.zeros(n)
+        if len(moedas_x):
+            cx = np.asarray(moedas_x) + RAIO_MOEDA
+            cy = np.asarray(moedas_y) + RAIO_MOEDA
+            alvo = np.argmin(np.hypot(px[:, None] - cx, py[:, None] - cy), axis=1)
+            tx = cx[alvo] - px
+            ty = cy[alvo] - py
+            m = np.hypot(tx, ty)
+            ok = m != 0.0
+            m = np.where(ok, m, 1.0)
+            ax = np.where(ok, tx / m, 0.0)
+            ay = np.where(ok, ty / m, 0.0)
+
+        # repulsão: um obstáculo por vez sobre todos os agentes (mesma ordem de soma
+        # do laço escalar; são no máximo QTD_OBS_MAX iterações)
+        rx = np.zeros(n)
+        ry = np.zeros(n)
+        for left, top in zip(obs_x, obs_y):
+            dx = px - np.clip(px, left, left + OBS_W)
+            dy = py - np.clip(py, top, top + OBS_H)
+            d = np.hypot(dx, dy)
+            dentro = (d > 0.0) & (d < alc)
+            d = np.where(dentro, d, 1.0)
+            f = np.where(dentro, (alc - d) / alc, 0.0)
+            rx += dx / d * f
+            ry += dy / d * f
+        mag = np.hypot(rx, ry)
+        grande = mag > 1.0
+        mag = np.where(grande, mag, 1.0)
+        rx /= mag
+        ry /= mag
+
+        vx = ax + rx * peso
+        vy = ay + ry * peso
+        m = np.hypot(vx, vy)
+        ok = m != 0.0
+        m = np.where(ok, m, 1.0)
+        return np.where(ok, vx / m, 1.0), np.where(ok, vy / m, 0.0)  # fallback: direita
+
     def decidir(self, player_rect, moedas, obstaculos_rects):
-        ax, ay = self._vet_atrair_moeda(player_rect, moedas)
+        alvo = self._moeda_alvo(player_rect, moedas)  # calculado uma vez só
+        ax, ay = self._vet_atrair_moeda(player_rect, alvo)
         rx, ry = self._vet_repulsao(player_rect, obstaculos_rects)
         vx, vy = ax + rx * self.peso, ay + ry * self.peso
         vx, vy = _norm(vx, vy)
         # fallback para nunca ficar parado
         if vx == 0.0 and vy == 0.0:
-            alvo = self._moeda_alvo(player_rect, moedas)
             if alvo:
                 px, py = player_rect.center
                 dx, dy = alvo.centerx - px, alvo.centery - py
@@ -72,18 +128,51 @@ class AgenteParametrico:
                     vy = 1.0 if dy > 0 else -1.0
         return vx, vy
 
+class AgenteNeural:
+    """
+    Agente cuja política é uma MLP pequena (ver politica_neural.py); o genoma
+    são os pesos. `acao` calcula os sensores em Python puro e passa pelo mesmo
+    `forward` do treino, com N = 1, num buffer reaproveitado a cada tick.
+    """
+    def __init__(self, pesos):
+        import numpy as np  # só o agente neural precisa de NumPy
+        import politica_neural as pn
+
+        if len(pesos) != pn.N_PESOS:
+            raise ValueError(f"esperava {pn.N_PESOS} pesos, recebeu {len(pesos)}")
+        self._pn = pn
+        self._camadas = pn.empilhar([pesos])
+        self._s = np.zeros((1, pn.N_ENTRADAS))
+
+    def acao(self, estado):
+        """Direção para `simulacao.step`."""
+        ob = estado.obstaculos
+        self._s[0] = self._pn.sensores_escalar(estado.jx + JOGADOR_W / 2, estado.jy + JOGADOR_H / 2,
+                                               estado.moedas.x, estado.moedas.y, ob.x, ob.y, ob.velx)
+        vx, vy = self._pn.forward(self._camadas, self._s)
+        return float(vx[0]), float(vy[0])
+
+def agente_do_genoma(g):
+    """Agente correspondente a um genoma do treino (neural se tiver "pesos")."""
+    if "pesos" in g:
+        return AgenteNeural(g["pesos"])
+    return AgenteParametrico(g["alcance_repulsao"], g["peso_repulsao"])
+
 def carregar_melhor_agente():
     """
-    Carrega parâmetros do arquivo JSON salvo pelo algoritmo genético.
+    Carrega o agente do arquivo JSON salvo pelo algoritmo genético
+    (paramétrico ou, com "tipo": "neural", a MLP).
     Se não existir, devolve um agente com parâmetros padrão.
     """
     if os.path.exists(ARQ_MELHOR):
         try:
             with open(ARQ_MELHOR, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                alc = float(data.get("alcance_repulsao", 120.0))
-                peso = float(data.get("peso_repulsao", 1.2))
-                return AgenteParametrico(alcance_repulsao=alc, peso_repulsao=peso)
-        except Exception:
-            pass
+            if data.get("tipo") == "neural":
+                return AgenteNeural(data["pesos"])
+            alc = float(data.get("alcance_repulsao", 120.0))
+            peso = float(data.get("peso_repulsao", 1.2))
+            return AgenteParametrico(alcance_repulsao=alc, peso_repulsao=peso)
+        except Exception as e:
+            print(f"[AVISO] '{ARQ_MELHOR}' inválido ({e}); usando o agente padrão.")
     return AgenteParametrico()
@@ -0,0 +1,145 @@
+# ambiente_vetorizado.py
+"""
+Ambiente vetorizado no estilo Gym: N episódios independentes avançando juntos.
+
+    env = VecEnv(1000)
+    obs = env.reset(seeds=range(1000))           # (N, dim_obs)
+    obs, recompensa, fim, info = env.step(acoes)  # acoes: (N, 2)
+
+Cada episódio segue as regras de `simulacao.step` (mesma seed e mesmas ações
+=> mesma trajetória), com contador de passos, dificuldade (a cada 10 s) e
+obstáculos próprios; a física é a de `simulacao_vetorizada.LoteEpisodios`,
+a mesma da avaliação da população. Episódios que terminam reiniciam sozinhos na mesma
+chamada com uma seed nova: `fim[i]` marca a troca, a observação devolvida já
+é a do episódio novo e `info` traz a pontuação final e a última observação.
+
+As ações são direções (vx, vy) multiplicadas pela velocidade do jogador, como
+em `simulacao.step` (norma <= 1 para não passar da velocidade).
+"""
+import argparse
+import time
+
+import numpy as np
+
+from simulacao import (
+    LARGURA, ALTURA, JOGADOR_W, JOGADOR_H, RAIO_MOEDA, QTD_MOEDAS,
+    OBS_W, OBS_H, QTD_OBS_MAX, STEPS_POR_AVALIACAO, VEL_JOGADOR_BASE,
+)
+from simulacao_vetorizada import LoteEpisodios
+
+ESCALA_VEL = 10.0
+OBSERVACOES = ("completa", "sensores")
+
+# observação "completa": centro do jogador, moedas e obstáculos (relativos ao
+# jogador, com velocidade e máscara de ativo) e o tempo decorrido
+DIM_OBS_COMPLETA = 2 + 2 * QTD_MOEDAS + 4 * QTD_OBS_MAX + 1
+
+class VecEnv(LoteEpisodios):
+    def __init__(self, n, vel_jogador=VEL_JOGADOR_BASE, obs="completa"):
+        if obs not in OBSERVACOES:
+            raise ValueError(f"observação desconhecida: {obs!r} (opções: {', '.join(OBSERVACOES)})")
+        super().__init__(n, vel_jogador)
+        self.tipo_obs = obs
+        if obs == "sensores":
+            # mesmos sensores da política neural (politica_neural.py)
+            import politica_neural
+            self._sensores = politica_neural.sensores
+            self.dim_obs = politica_neural.N_ENTRADAS
+        else:
+            self.dim_obs = DIM_OBS_COMPLETA
+        self.proxima_seed = 0
+        self.episodios = 0   # episódios concluídos desde o reset
+
+    # ----------------- Início de episódio -----------------
+    def reset(self, seeds=0):
+        """
+        Reinicia todos os episódios. `seeds`: uma por ambiente ou um inteiro
+        (seeds consecutivas a partir dele). Os reinícios automáticos continuam
+        a numeração depois da maior seed. Devolve as observações (N, dim_obs).
+        """
+        seeds = list(range(seeds, seeds + self.n)) if isinstance(seeds, int) else [int(s) for s in seeds]
+        if len(seeds) != self.n:
+            raise ValueError(f"esperava {self.n} seeds, recebeu {len(seeds)}")
+        for i, s in enumerate(seeds):
+            self.iniciar(i, s)
+        self.proxima_seed = max(seeds) + 1
+        self.episodios = 0
+        return self.observar()
+
+    # ----------------- Observação -----------------
+    def observar(self):
+        px = self.jx + JOGADOR_W / 2
+        py = self.jy + JOGADOR_H / 2
+        if self.tipo_obs == "sensores":
+            # obstáculos inativos vão para longe: nunca estão entre os mais próximos
+            longe = -10.0 * (LARGURA + ALTURA)
+            ox = np.where(self.ativo, self.ox, longe)
+            oy = np.where(self.ativo, self.oy, longe)
+            return self._sensores(px, py, self.mx, self.my, ox, oy, self.ovel)
+
+        obs = np.empty((self.n, self.dim_obs))
+        obs[:, 0] = px / LARGURA
+        obs[:, 1] = py / ALTURA
+        m = 2 + 2 * QTD_MOEDAS
+        obs[:, 2:m:2] = (self.mx + RAIO_MOEDA - px[:, None]) / LARGURA
+        obs[:, 3:m:2] = (self.my + RAIO_MOEDA - py[:, None]) / ALTURA
+        ativo = self.ativo
+        obs[:, m + 0:-1:4] = np.where(ativo, (self.ox + OBS_W / 2 - px[:, None]) / LARGURA, 0.0)
+        obs[:, m + 1:-1:4] = np.where(ativo, (self.oy + OBS_H / 2 - py[:, None]) / ALTURA, 0.0)
+        obs[:, m + 2:-1:4] = self.ovel / ESCALA_VEL
+        obs[:, m + 3:-1:4] = ativo
+        obs[:, -1] = self.passo / STEPS_POR_AVALIACAO
+        return obs
+
+    # ----------------- Passo -----------------
+    def step(self, acoes):
+        """
+        Avança todos os ambientes um passo fixo. Devolve (obs, recompensa, fim, info):
+        recompensa (N,) do passo, fim (N,) bool e, para os episódios que
+        terminaram, info = {"indices", "seeds", "pontuacao", "coletas",
+        "colisoes", "obs_final"}.
+        """
+        acoes = np.asarray(acoes, dtype=np.float64)
+        recompensa = self.passo_lote(acoes[:, 0], acoes[:, 1])
+
+        # fim de episódio e reinício automático
+        fim = self.passo >= STEPS_POR_AVALIACAO
+        info = {}
+        if fim.any():
+            idx = np.flatnonzero(fim)
+            info = {
+                "indices": idx,
+                "seeds": [self.seeds[i] for i in idx],
+                "pontuacao": self.pontuacao[idx].copy(),
+                "coletas": self.coletas[idx].copy(),
+                "colisoes": self.colisoes[idx].copy(),
+                "obs_final": self.observar()[idx],
+            }
+            for i in idx:
+                self.iniciar(i, self.proxima_seed)
+                self.proxima_seed += 1
+            self.episodios += len(idx)
+        return self.observar(), recompensa, fim, info
+
+# ----------------- Medição de vazão -----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede passos/s do VecEnv com ações aleatórias.")
+    parser.add_argument("--envs", type=int, default=1000, help="Ambientes em paralelo")
+    parser.add_argument("--passos", type=int, default=1000, help="Chamadas de step")
+    parser.add_argument("--obs", choices=OBSERVACOES, default="completa")
+    parser.add_argument("--seed", type=int, default=1000)
+    args = parser.parse_args()
+
+    env = VecEnv(args.envs, obs=args.obs)
+    env.reset(args.seed)
+    r = np.random.default_rng(args.seed)
+    ang = r.uniform(0, 2 * np.pi, (args.passos, args.envs))
+    acoes = np.stack([np.cos(ang), np.sin(ang)], axis=-1)
+    t0 = time.perf_counter()
+    for t in range(args.passos):
+        env.step(acoes[t])
+    dt = time.perf_counter() - t0
+    total = args.envs * args.passos
+    print(f"[VECENV] {args.envs} ambientes x {args.passos} passos ({args.obs}): "
+          f"{total / dt:,.0f} passos/s = {60 * total / dt / 1e6:.1f} milhões/min | "
+          f"episódios concluídos={env.episodios}")
@@ -0,0 +1,141 @@
+# arena_multi.py
+"""
+Arena multiagente (NumPy): N agentes paramétricos disputam as mesmas moedas
+entre os mesmos obstáculos.
+
+Segue as regras de `simulacao.step` (passo fixo, +1 por moeda, -2 por colisão,
+dificuldade a cada 10 s), mas com as posições de todos os jogadores em arrays.
+As decisões saem de `AgenteParametrico.decidir_lote`, uma vez por tick para a
+arena inteira. Moeda tocada por vários agentes no mesmo tick pontua para todos
+e renasce uma vez só.
+"""
+import json
+import random
+
+import numpy as np
+
+from agente import AgenteParametrico
+from simulacao import (
+    LARGURA, ALTURA, JOGADOR_W, JOGADOR_H, RAIO_MOEDA, QTD_MOEDAS,
+    OBS_W, OBS_H, QTD_OBS_INICIAL, QTD_OBS_MAX, DT,
+    STEPS_POR_AVALIACAO, PASSOS_POR_MARCO, VEL_OBS_BASE, VEL_OBS_INCR, VEL_JOGADOR_BASE,
+    RECOMPENSA_MOEDA, PENALIDADE_COLISAO, sortear_moeda, criar_moedas, criar_obstaculos,
+)
+
+_MOEDA_LADO = RAIO_MOEDA * 2
+
+def carregar_genomas(caminho):
+    """
+    Lista de genomas de um JSON: um genoma (melhor_agente.json), uma lista de
+    genomas ou um checkpoint do treino (usa a população, elite primeiro).
+    """
+    with open(caminho, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("populacao", [data])
+    if any(g.get("tipo") == "neural" or "pesos" in g for g in data):
+        raise ValueError(f"'{caminho}' tem genomas neurais; a arena multiagente usa só os paramétricos")
+    return [{
+        "alcance_repulsao": float(g.get("alcance_repulsao", 120.0)),
+        "peso_repulsao": float(g.get("peso_repulsao", 1.2)),
+        "vel_jogador": float(g.get("vel_jogador", VEL_JOGADOR_BASE)),
+    } for g in data]
+
+class ArenaMulti:
+    def __init__(self, genomas, n=None, seed=None):
+        n = n or len(genomas)
+        self.genomas = [genomas[i % len(genomas)] for i in range(n)]
+        self.alc = np.array([g["alcance_repulsao"] for g in self.genomas])
+        self.peso = np.array([g["peso_repulsao"] for g in self.genomas])
+        self.vel = np.array([g["vel_jogador"] for g in self.genomas])
+
+        # mundo (moedas/obstáculos) com o mesmo sorteio de `novo_estado`
+        self.rng = random.Random(seed)
+        moedas = criar_moedas(self.rng, QTD_MOEDAS)
+        obs = criar_obstaculos(QTD_OBS_INICIAL, VEL_OBS_BASE, self.rng)
+        self.mx = np.array(moedas.x)
+        self.my = np.array(moedas.y)
+        self.ox = np.zeros(QTD_OBS_MAX)
+        self.oy = np.zeros(QTD_OBS_MAX)
+        self.ovel = np.zeros(QTD_OBS_MAX)
+        self.n_obs = len(obs)
+        self.ox[:self.n_obs] = obs.x
+        self.oy[:self.n_obs] = obs.y
+        self.ovel[:self.n_obs] = obs.velx
+        self.vel_obs = VEL_OBS_BASE
+
+        # o agente 0 nasce no centro, como no jogo; os demais espalhados
+        # (com outro RNG, para o mundo não depender de N)
+        espalhar = np.random.default_rng(seed)
+        self.jx = espalhar.uniform(0, LARGURA - JOGADOR_W, n)
+        self.jy = espalhar.uniform(0, ALTURA - JOGADOR_H, n)
+        self.jx[0] = LARGURA/2 - JOGADOR_W/2
+        self.jy[0] = ALTURA/2 - JOGADOR_H/2
+
+        self.passo = 0
+        self.pontuacao = np.zeros(n, dtype=np.int64)
+        self.coletas = np.zeros(n, dtype=np.int64)
+        self.colisoes = np.zeros(n, dtype=np.int64)
+        self.bateu = np.zeros(n, dtype=bool)   # quem colidiu no último passo
+
+    def __len__(self):
+        return len(self.genomas)
+
+    @property
+    def tempo(self):
+        return self.passo * DT
+
+    @property
+    def fim(self):
+        return self.passo >= STEPS_POR_AVALIACAO
+
+    def step(self):
+        n_obs = self.n_obs
+        ox, oy, ovel = self.ox[:n_obs], self.oy[:n_obs], self.ovel[:n_obs]
+
+        # decisões de todos os agentes de uma vez
+        vx, vy = AgenteParametrico.decidir_lote(self.jx + JOGADOR_W / 2, self.jy + JOGADOR_H / 2,
+                                                self.alc, self.peso, self.mx, self.my, ox, oy)
+
+        # move jogadores
+        self.jx = np.clip(self.jx + vx * self.vel, 0.0, LARGURA - JOGADOR_W)
+        self.jy = np.clip(self.jy + vy * self.vel, 0.0, ALTURA - JOGADOR_H)
+        rjx = np.trunc(self.jx)[:, None]
+        rjy = np.trunc(self.jy)[:, None]
+
+        # move obstáculos (arredondados como pygame.Rect, quicando nas bordas)
+        x = ox + ovel
+        ox[:] = np.copysign(np.floor(np.abs(x) + 0.5), x)
+        quica = (ox <= 0) | (ox + OBS_W >= LARGURA)
+        ovel[quica] = -ovel[quica]
+
+        # moedas: (N, M) — quem tocou pontua, a moeda renasce pelo RNG do mundo
+        pegou = (rjx < self.mx + _MOEDA_LADO) & (rjx + JOGADOR_W > self.mx) & \
+                (rjy < self.my + _MOEDA_LADO) & (rjy + JOGADOR_H > self.my)
+        coletas = pegou.sum(axis=1)
+        for k in np.flatnonzero(pegou.any(axis=0)):
+            self.mx[k], self.my[k] = sortear_moeda(self.rng)
+
+        # colisões: (N, K)
+        bateu = (rjx < ox + OBS_W) & (rjx + JOGADOR_W > ox) & \
+                (rjy < oy + OBS_H) & (rjy + JOGADOR_H > oy)
+        colisoes = bateu.sum(axis=1)
+        self.bateu = colisoes > 0
+
+        self.coletas += coletas
+        self.colisoes += colisoes
+        self.pontuacao += coletas * RECOMPENSA_MOEDA - colisoes * PENALIDADE_COLISAO
+
+        # dificuldade progressiva
+        self.passo += 1
+        if self.passo % PASSOS_POR_MARCO == 0:
+            self.vel_obs += VEL_OBS_INCR
+            ovel[:] = np.where(ovel > 0, self.vel_obs, -self.vel_obs)
+            if n_obs < QTD_OBS_MAX:
+                novo = criar_obstaculos(1, self.vel_obs, self.rng)
+                self.ox[n_obs], self.oy[n_obs], self.ovel[n_obs] = novo.x[0], novo.y[0], novo.velx[0]
+                self.n_obs += 1
+
+    def ranking(self):
+        """Índices dos agentes da maior para a menor pontuação."""
+        return [int(i) for i in np.argsort(-self.pontuacao, kind="stable")]
@@ -0,0 +1,185 @@
+# avaliar_agente.py
+"""
+Avaliação de robustez de um genoma (melhor_agente.json) em muitas seeds.
+
+Roda o agente headless em milhares de seeds fora das usadas no treino, em
+paralelo (processos) ou em lockstep com NumPy (--vetorizado), e mostra média,
+desvio, percentis, a parcela da recompensa perdida em colisões e um histograma
+das pontuações. Com --comparar, avalia dois genomas nas MESMAS seeds e aplica
+um teste pareado (diferença média, IC 95% e p-valor).
+
+    python avaliar_agente.py melhor_agente.json --seeds 2000 --workers 8
+    python avaliar_agente.py melhor_agente.json --comparar outro_agente.json --vetorizado
+"""
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import statistics
+
+from agente import agente_do_genoma
+from simulacao import (
+    PENALIDADE_COLISAO, RECOMPENSA_MOEDA, STEPS_POR_AVALIACAO, VEL_JOGADOR_BASE,
+    novo_estado, step,
+)
+
+SEED_INICIAL = 1_000_000   # longe das seeds do treino (1000 + geração + 10007 * j)
+PERCENTIS = (5, 25, 50, 75, 95)
+
+def carregar_genes(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("tipo") == "neural":
+        return {"vel_jogador": float(data["vel_jogador"]), "pesos": [float(w) for w in data["pesos"]]}
+    return {
+        "alcance_repulsao": float(data.get("alcance_repulsao", 120.0)),
+        "peso_repulsao": float(data.get("peso_repulsao", 1.2)),
+        "vel_jogador": float(data.get("vel_jogador", VEL_JOGADOR_BASE)),
+    }
+
+# ----------------- Execução -----------------
+def _episodios(g, seeds):
+    """(pontuação, coletas, colisões) de cada seed, no caminho escalar."""
+    agente = agente_do_genoma(g)
+    out = []
+    for seed in seeds:
+        estado = novo_estado(seed, vel_jogador=g["vel_jogador"])
+        for _ in range(STEPS_POR_AVALIACAO):
+            step(estado, agente.acao(estado))
+        out.append((estado.pontuacao, estado.coletas, estado.colisoes))
+    return out
+
+def _episodios_vetorizados(g, seeds):
+    from simulacao_vetorizada import fitness_populacao
+    return fitness_populacao([g] * len(seeds), seeds=seeds, detalhes=True)
+
+def avaliar(g, seeds, workers=1, vetorizado=False):
+    """Resultados por seed, na ordem de `seeds` (independe do nº de workers)."""
+    fn = _episodios_vetorizados if vetorizado else _episodios
+    if workers <= 1:
+        return fn(g, seeds)
+    # lotes grandes no vetorizado (amortiza o tick), ~4 por worker no escalar
+    n_lotes = workers if vetorizado else workers * 4
+    tam = max(1, math.ceil(len(seeds) / n_lotes))
+    lotes = [seeds[i:i+tam] for i in range(0, len(seeds), tam)]
+    with multiprocessing.Pool(processes=workers) as pool:
+        partes = pool.starmap(fn, [(g, lote) for lote in lotes])
+    return [r for parte in partes for r in parte]
+
+# ----------------- Estatística -----------------
+def percentil(ordenados, p):
+    """Percentil com interpolação linear (como numpy.percentile)."""
+    if len(ordenados) == 1:
+        return float(ordenados[0])
+    pos = (len(ordenados) - 1) * p / 100.0
+    i = int(pos)
+    frac = pos - i
+    if i + 1 >= len(ordenados):
+        return float(ordenados[-1])
+    return ordenados[i] + (ordenados[i + 1] - ordenados[i]) * frac
+
+def resumir(resultados):
+    pontos = [r[0] for r in resultados]
+    ganho = sum(r[1] for r in resultados) * RECOMPENSA_MOEDA
+    penalidade = sum(r[2] for r in resultados) * PENALIDADE_COLISAO
+    ordenados = sorted(pontos)
+    return {
+        "episodios": len(pontos),
+        "media": statistics.fmean(pontos),
+        "desvio": statistics.stdev(pontos) if len(pontos) > 1 else 0.0,
+        "min": ordenados[0],
+        "max": ordenados[-1],
+        "percentis": {p: percentil(ordenados, p) for p in PERCENTIS},
+        "coletas_media": ganho / RECOMPENSA_MOEDA / len(pontos),
+        "colisoes_media": penalidade / PENALIDADE_COLISAO / len(pontos),
+        # fração da recompensa bruta (moedas + penalidades) que veio de colisões
+        "parcela_penalidade": penalidade / (ganho + penalidade) if ganho + penalidade else 0.0,
+    }
+
+def _normal_sf(z):
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+def teste_pareado(a, b):
+    """
+    Teste pareado nas mesmas seeds (números aleatórios comuns): diferença média
+    a - b, IC 95% e p-valor bilateral. Usa a aproximação normal da estatística t,
+    adequada para as centenas/milhares de seeds desta ferramenta.
+    """
+    d = [x - y for x, y in zip(a, b)]
+    n = len(d)
+    media = statistics.fmean(d)
+    dp = statistics.stdev(d) if n > 1 else 0.0
+    ep = dp / math.sqrt(n) if n else 0.0
+    if ep == 0.0:
+        z = 0.0 if media == 0 else math.copysign(math.inf, media)
+    else:
+        z = media / ep
+    p = 2.0 * _normal_sf(abs(z))
+    return {"diferenca": media, "ic95": (media - 1.96 * ep, media + 1.96 * ep), "z": z, "p": p, "n": n}
+
+# ----------------- Relatório -----------------
+def histograma(pontos, caixas=15, largura=50):
+    lo, hi = min(pontos), max(pontos)
+    passo = max(1e-9, (hi - lo) / caixas)
+    contagem = [0] * caixas
+    for v in pontos:
+        contagem[min(caixas - 1, int((v - lo) / passo))] += 1
+    maior = max(contagem)
+    linhas = []
+    for i, c in enumerate(contagem):
+        a = lo + i * passo
+        barra = "#" * (round(c / maior * largura) if maior else 0)
+        linhas.append(f"  [{a:8.1f}, {a + passo:8.1f}) {c:6d} {barra}")
+    return linhas
+
+def imprimir_resumo(nome, r):
+    pct = " ".join(f"p{p}={v:.1f}" for p, v in r["percentis"].items())
+    print(f"[AVALIAÇÃO] {nome} | {r['episodios']} episódios")
+    print(f"  média={r['media']:.2f} desvio={r['desvio']:.2f} min={r['min']} max={r['max']}")
+    print(f"  {pct}")
+    print(f"  coletas/episódio={r['coletas_media']:.1f} colisões/episódio={r['colisoes_media']:.1f} "
+          f"parcela da penalidade={r['parcela_penalidade']:.1%}")
+
+def salvar_csv(caminho, seeds, colunas):
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["seed"] + [f"{nome}_{campo}" for nome in colunas
+                               for campo in ("pontuacao", "coletas", "colisoes")])
+        for i, seed in enumerate(seeds):
+            w.writerow([seed] + [v for res in colunas.values() for v in res[i]])
+    print(f"[SALVO] {caminho}")
+
+# ----------------- CLI -----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avalia a robustez de um genoma em muitas seeds.")
+    parser.add_argument("genes", nargs="?", default="melhor_agente.json", help="JSON do genoma")
+    parser.add_argument("--comparar", type=str, default=None, help="Segundo genoma para o teste pareado")
+    parser.add_argument("--seeds", type=int, default=1000, help="Número de seeds (episódios)")
+    parser.add_argument("--seed-inicial", type=int, default=SEED_INICIAL, help="Primeira seed avaliada")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos em paralelo")
+    parser.add_argument("--vetorizado", action="store_true", help="Episódios em lockstep com NumPy")
+    parser.add_argument("--caixas", type=int, default=15, help="Caixas do histograma")
+    parser.add_argument("--csv", type=str, default=None, help="Salva os resultados por seed neste CSV")
+    args = parser.parse_args()
+
+    seeds = list(range(args.seed_inicial, args.seed_inicial + args.seeds))
+    arquivos = [args.genes] + ([args.comparar] if args.comparar else [])
+    resultados = {}
+    for caminho in arquivos:
+        g = carregar_genes(caminho)
+        resultados[caminho] = avaliar(g, seeds, workers=args.workers, vetorizado=args.vetorizado)
+        imprimir_resumo(caminho, resumir(resultados[caminho]))
+        print("\n".join(histograma([r[0] for r in resultados[caminho]], args.caixas)))
+
+    if args.comparar:
+        a = [r[0] for r in resultados[args.genes]]
+        b = [r[0] for r in resultados[args.comparar]]
+        t = teste_pareado(a, b)
+        veredito = ("diferença significativa" if t["p"] < 0.05 else "sem diferença significativa") + " (alfa=0,05)"
+        print(f"[COMPARAÇÃO] {args.genes} - {args.comparar}: diferença média={t['diferenca']:+.2f} "
+              f"IC95%=[{t['ic95'][0]:+.2f}, {t['ic95'][1]:+.2f}] z={t['z']:.2f} p={t['p']:.4g} | {veredito}")
+
+    if args.csv:
+        salvar_csv(args.csv, seeds, resultados)
@@ -0,0 +1,245 @@
+# benchmark.py
+"""
+Benchmarks dos caminhos quentes (simulação, treino, agente e renderização).
+
+Cada medida usa seeds fixas, faz aquecimento e fica com a melhor de algumas
+repetições. Os resultados vão para JSON; `--comparar` confronta com uma linha
+de base salva e aponta regressões acima da tolerância.
+
+    python benchmark.py --saida bench.json
+    python benchmark.py --comparar bench_base.json --tolerancia 0.10
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import simulacao as sim
+import genetico
+from agente import AgenteParametrico
+
+AQUECIMENTO = 1
+REPETICOES = 3
+GENES_PADRAO = {"alcance_repulsao": 120.0, "peso_repulsao": 1.2, "vel_jogador": 6.0}
+DIR_PROJETO = os.path.dirname(os.path.abspath(__file__))
+
+def _taxa(fn, n, repeticoes=REPETICOES, aquecimento=AQUECIMENTO):
+    """Operações por segundo de `fn` (que executa `n` operações), melhor de `repeticoes`."""
+    for _ in range(aquecimento):
+        fn()
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return n / melhor
+
+@contextlib.contextmanager
+def _diretorio_temporario():
+    # evoluir/main escrevem arquivos relativos ao cwd: isola em um diretório temporário
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as d:
+        os.chdir(d)
+        try:
+            yield d
+        finally:
+            os.chdir(anterior)
+
+# ----------------- Medidas -----------------
+def bench_step(passos=20000):
+    g = GENES_PADRAO
+    def rodar():
+        estado = sim.novo_estado(1000, vel_jogador=g["vel_jogador"])
+        for _ in range(passos):
+            if estado.fim:
+                estado = sim.novo_estado(1000, vel_jogador=g["vel_jogador"])
+            sim.step_ambiente(estado, g["alcance_repulsao"], g["peso_repulsao"])
+    return _taxa(rodar, passos)
+
+def bench_fitness(episodios=5):
+    def rodar():
+        for i in range(episodios):
+            genetico.fitness_do_cromossomo(GENES_PADRAO, seed_base=1000 + i)
+    return _taxa(rodar, episodios)
+
+def bench_evoluir(pop_size, geracoes=2):
+    def rodar():
+        with _diretorio_temporario(), contextlib.redirect_stdout(io.StringIO()):
+            genetico.evoluir(geracoes=geracoes, pop_size=pop_size, seed=42, plotar=False)
+    return _taxa(rodar, geracoes, repeticoes=1, aquecimento=0)
+
+def bench_acao(chamadas=20000):
+    agente = AgenteParametrico()
+    estado = sim.novo_estado(1000)
+    def rodar():
+        for _ in range(chamadas):
+            agente.acao(estado)
+    return _taxa(rodar, chamadas)
+
+def bench_decidir(chamadas=20000):
+    import pygame
+    agente = AgenteParametrico()
+    estado = sim.novo_estado(1000)
+    jogador = pygame.Rect(int(estado.jx), int(estado.jy), sim.JOGADOR_W, sim.JOGADOR_H)
+    moedas = [pygame.Rect(int(x), int(y), sim.RAIO_MOEDA * 2, sim.RAIO_MOEDA * 2)
+              for x, y in zip(estado.moedas.x, estado.moedas.y)]
+    obstaculos = [pygame.Rect(int(x), int(y), sim.OBS_W, sim.OBS_H)
+                  for x, y in zip(estado.obstaculos.x, estado.obstaculos.y)]
+    def rodar():
+        for _ in range(chamadas):
+            agente.decidir(jogador, moedas, obstaculos)
+    return _taxa(rodar, chamadas)
+
+def bench_arena_multi(agentes=300, passos=600):
+    from arena_multi import ArenaMulti
+    def rodar():
+        arena = ArenaMulti([GENES_PADRAO], agentes, seed=1000)
+        for _ in range(passos):
+            arena.step()
+    return _taxa(rodar, passos)
+
+def bench_neural_lote(agentes=200, passos=600):
+    """Ticks/s da política neural decidindo por uma população inteira (sensores + forward)."""
+    import random
+    import numpy as np
+    import politica_neural as pn
+    rng = random.Random(1000)
+    decidir = pn.decisor_lote([{"pesos": pn.pesos_aleatorios(rng)} for _ in range(agentes)])
+    r = np.random.default_rng(1000)
+    estado = (r.uniform(0, sim.LARGURA, agentes), r.uniform(0, sim.ALTURA, agentes),
+              r.uniform(0, sim.LARGURA, (agentes, sim.QTD_MOEDAS)), r.uniform(0, sim.ALTURA, (agentes, sim.QTD_MOEDAS)),
+              r.uniform(0, sim.LARGURA, (agentes, sim.QTD_OBS_MAX)), r.uniform(0, sim.ALTURA, (agentes, sim.QTD_OBS_MAX)),
+              r.uniform(-8, 8, (agentes, sim.QTD_OBS_MAX)))
+    def rodar():
+        for _ in range(passos):
+            decidir(*estado)
+    return _taxa(rodar, passos)
+
+def bench_vecenv(envs=500, passos=300):
+    """Passos de ambiente por segundo do VecEnv (todos os ambientes contam)."""
+    import numpy as np
+    from ambiente_vetorizado import VecEnv
+    env = VecEnv(envs)
+    ang = np.random.default_rng(1000).uniform(0, 2 * np.pi, envs)
+    acoes = np.stack([np.cos(ang), np.sin(ang)], axis=-1)
+    def rodar():
+        env.reset(1000)
+        for _ in range(passos):
+            env.step(acoes)
+    return _taxa(rodar, envs * passos)
+
+def bench_render(frames=300, descartar=30, **kw_main):
+    """Mediana do tempo de frame (lógica + desenho) do main.py, sem limite de FPS."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    import main
+
+    marcas = []
+    get_original = pygame.event.get
+    def get_instrumentado(*a, **kw):
+        marcas.append(time.perf_counter())
+        eventos = get_original(*a, **kw)
+        if len(marcas) >= frames + descartar:
+            eventos.append(pygame.event.Event(pygame.QUIT))
+        return eventos
+
+    salvos = {nome: getattr(main, nome) for nome in ("FPS", "PATH_BG", "PATH_PLAYER", "PATH_COIN", "PATH_OBS")}
+    try:
+        main.FPS = 0
+        for nome in ("PATH_BG", "PATH_PLAYER", "PATH_COIN", "PATH_OBS"):
+            setattr(main, nome, os.path.join(DIR_PROJETO, salvos[nome]))
+        pygame.event.get = get_instrumentado
+        with _diretorio_temporario(), contextlib.redirect_stdout(io.StringIO()):
+            try:
+                main.main(play_best=True, nome_jogador="benchmark", **kw_main)
+            except SystemExit:
+                pass
+    finally:
+        pygame.event.get = get_original
+        for nome, valor in salvos.items():
+            setattr(main, nome, valor)
+
+    duracoes = [b - a for a, b in zip(marcas[descartar:], marcas[descartar + 1:])]
+    return statistics.median(duracoes) * 1000.0
+
+# ----------------- Execução / comparação -----------------
+def executar(pops=(10, 20, 40), render=True):
+    metricas = {}
+    def registrar(nome, fn, unidade, maior_melhor=True):
+        try:
+            valor = fn()
+        except ImportError as e:
+            print(f"[AVISO] {nome} ignorado: {e}")
+            return
+        metricas[nome] = {"valor": valor, "unidade": unidade, "maior_melhor": maior_melhor}
+        print(f"[BENCH] {nome:<32} {valor:12.2f} {unidade}")
+
+    registrar("simulacao.step_ambiente", bench_step, "passos/s")
+    registrar("genetico.fitness_do_cromossomo", bench_fitness, "episodios/s")
+    for p in pops:
+        registrar(f"genetico.evoluir[pop={p}]", lambda p=p: bench_evoluir(p), "geracoes/s")
+    registrar("agente.acao", bench_acao, "chamadas/s")
+    registrar("agente.decidir", bench_decidir, "chamadas/s")
+    registrar("arena_multi.step[agentes=300]", bench_arena_multi, "passos/s")
+    registrar("politica_neural.lote[agentes=200]", bench_neural_lote, "passos/s")
+    registrar("ambiente_vetorizado.step[envs=500]", bench_vecenv, "passos/s")
+    if render:
+        registrar("main.frame", bench_render, "ms/frame", maior_melhor=False)
+
+    return {
+        "data_hora": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "metricas": metricas,
+    }
+
+def comparar(atual, base, tolerancia=0.10):
+    """Imprime a variação por métrica e devolve a lista de regressões."""
+    regressoes = []
+    for nome, m in atual["metricas"].items():
+        b = base.get("metricas", {}).get(nome)
+        if b is None or not b["valor"]:
+            continue
+        razao = m["valor"] / b["valor"]
+        variacao = (razao - 1.0) if m["maior_melhor"] else (1.0 / razao - 1.0)  # > 0 = melhorou
+        pior = variacao < -tolerancia
+        if pior:
+            regressoes.append(nome)
+        marca = "REGRESSÃO" if pior else "ok"
+        print(f"[COMPARA] {nome:<32} base={b['valor']:10.2f} atual={m['valor']:10.2f} "
+              f"{m['unidade']:<12} {variacao:+7.1%} {marca}")
+    return regressoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes do projeto.")
+    parser.add_argument("--saida", type=str, default=None, help="Arquivo JSON para salvar os resultados")
+    parser.add_argument("--comparar", type=str, default=None, help="JSON de linha de base para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Piora relativa tolerada (0.10 = 10%%)")
+    parser.add_argument("--pops", type=int, nargs="+", default=[10, 20, 40], help="Tamanhos de população para evoluir")
+    parser.add_argument("--sem-render", action="store_true", help="Não mede o renderizador do main.py")
+    args = parser.parse_args()
+
+    resultado = executar(pops=args.pops, render=not args.sem_render)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"[SALVO] {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        regressoes = comparar(resultado, base, args.tolerancia)
+        if regressoes:
+            print(f"[REGRESSÃO] {len(regressoes)} métrica(s) pioraram mais que {args.tolerancia:.0%}: "
+                  + ", ".join(regressoes))
+            sys.exit(1)
+        print("[OK] nenhuma regressão acima da tolerância.")
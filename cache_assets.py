@@ -0,0 +1,121 @@
+# cache_assets.py
+"""
+Cache dos sprites já redimensionados, em bytes RGBA crus (.cache_assets/).
+
+Decodificar o PNG e rodar smoothscale (e, para a moeda, os 576 rotozooms do
+atlas) a cada abertura do jogo custa dezenas de ms; ler os pixels prontos é
+só um read + frombuffer. Cada arquivo do cache guarda o mtime e o tamanho do
+PNG de origem e os parâmetros da transformação: se qualquer um mudar, o
+quadro é recalculado e o cache regravado.
+
+    img = carregar_imagem("assets/coin.png", (25, 25))
+    quadros = carregar_quadros("assets/coin.png", "atlas 48x12", lambda: [...])
+
+Requer um modo de vídeo já aberto (as superfícies saem com convert_alpha).
+"""
+import hashlib
+import os
+import struct
+import tempfile
+
+import pygame
+
+DIR_CACHE = ".cache_assets"
+EXTENSAO = ".rgba"
+MAGICO = b"BCAS"
+VERSAO = 1
+
+# mágico, versão, mtime_ns e tamanho da origem, sha1 dos parâmetros, nº de quadros
+_CABECALHO = struct.Struct("<4sHqq20sI")
+_QUADRO = struct.Struct("<HH")   # largura, altura (seguidos de w*h*4 bytes RGBA)
+
+_contadores = {"hits": 0, "misses": 0}
+
+def contadores(zerar=False):
+    """(hits, misses) desde o início (ou desde o último zerar)."""
+    hm = (_contadores["hits"], _contadores["misses"])
+    if zerar:
+        _contadores["hits"] = _contadores["misses"] = 0
+    return hm
+
+def _caminho_cache(path, parametros, dir_cache):
+    base = os.path.splitext(os.path.basename(path))[0]
+    h = hashlib.sha1(f"{os.path.abspath(path)}|{parametros}".encode("utf-8")).hexdigest()[:12]
+    return os.path.join(dir_cache, f"{base}_{h}{EXTENSAO}")
+
+def _ler(arq, st, digest):
+    """Quadros do arquivo de cache, ou None se faltar, estiver velho ou corrompido."""
+    try:
+        with open(arq, "rb") as f:
+            dados = f.read()
+    except OSError:
+        return None
+    if len(dados) < _CABECALHO.size:
+        return None
+    magico, versao, mtime_ns, tamanho, d, n = _CABECALHO.unpack_from(dados, 0)
+    if (magico, versao, mtime_ns, tamanho, d) != (MAGICO, VERSAO, st.st_mtime_ns, st.st_size, digest):
+        return None
+    quadros = []
+    vista = memoryview(dados)   # fatiar bytes copiaria; a fatia da memoryview não
+    pos = _CABECALHO.size
+    for _ in range(n):
+        if pos + _QUADRO.size > len(dados):
+            return None
+        w, h = _QUADRO.unpack_from(dados, pos)
+        pos += _QUADRO.size
+        fim = pos + w * h * 4
+        if fim > len(dados):
+            return None
+        # frombuffer usa a fatia sem copiar; convert_alpha faz a única cópia, já no formato da tela
+        quadros.append(pygame.image.frombuffer(vista[pos:fim], (w, h), "RGBA").convert_alpha())
+        pos = fim
+    return quadros
+
+def _gravar(arq, st, digest, quadros):
+    partes = [_CABECALHO.pack(MAGICO, VERSAO, st.st_mtime_ns, st.st_size, digest, len(quadros))]
+    for img in quadros:
+        partes.append(_QUADRO.pack(*img.get_size()))
+        partes.append(pygame.image.tostring(img, "RGBA"))
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(arq), exist_ok=True)
+        # temporário com nome único: dois jogos abrindo juntos não escrevem no mesmo
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(arq), prefix=os.path.basename(arq) + ".",
+                                         suffix=".tmp", delete=False) as f:
+            tmp = f.name
+            f.write(b"".join(partes))
+        os.replace(tmp, arq)   # outro processo nunca lê um arquivo pela metade
+    except OSError as e:
+        print(f"[AVISO] cache de assets não gravado ({e})")
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+def carregar_quadros(path, parametros, construir, dir_cache=DIR_CACHE):
+    """
+    Lista de superfícies derivadas de `path`. `parametros` (texto) descreve a
+    transformação; `construir()` gera os quadros quando o cache não serve.
+    """
+    st = os.stat(path)
+    digest = hashlib.sha1(parametros.encode("utf-8")).digest()
+    arq = _caminho_cache(path, parametros, dir_cache)
+    quadros = _ler(arq, st, digest)
+    if quadros is not None:
+        _contadores["hits"] += 1
+        return quadros
+    _contadores["misses"] += 1
+    quadros = construir()
+    _gravar(arq, st, digest, quadros)
+    return quadros
+
+def carregar_imagem(path, size=None, dir_cache=DIR_CACHE):
+    """pygame.image.load + convert_alpha + smoothscale(size), pelo cache."""
+    def construir():
+        img = pygame.image.load(path).convert_alpha()
+        if size is not None:
+            img = pygame.transform.smoothscale(img, size)
+        return [img]
+    parametros = f"imagem {size[0]}x{size[1]}" if size is not None else "imagem"
+    return carregar_quadros(path, parametros, construir, dir_cache)[0]
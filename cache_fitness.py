@@ -0,0 +1,105 @@
+# cache_fitness.py
+"""
+Memoização do fitness: (genes quantizados, seed, configuração do ambiente) -> fitness.
+
+Dois níveis: um LRU em memória e um SQLite em disco (opcional). Elites copiadas
+sem alteração e execuções repetidas com a mesma `--seed` deixam de re-simular.
+"""
+import hashlib
+import sqlite3
+from collections import OrderedDict
+
+import simulacao
+
+ARQ_CACHE = "fitness_cache.sqlite3"
+
+# constantes que mudam o resultado de uma simulação
+_CONSTANTES_AMBIENTE = (
+    "LARGURA", "ALTURA", "JOGADOR_W", "JOGADOR_H", "RAIO_MOEDA", "QTD_MOEDAS",
+    "OBS_W", "OBS_H", "QTD_OBS_INICIAL", "QTD_OBS_MAX",
+    "STEPS_POR_AVALIACAO", "DT", "PASSOS_POR_MARCO", "VEL_OBS_BASE", "VEL_OBS_INCR",
+    "RECOMPENSA_MOEDA", "PENALIDADE_COLISAO",
+)
+
+def hash_ambiente():
+    cfg = ";".join(f"{nome}={getattr(simulacao, nome)!r}" for nome in _CONSTANTES_AMBIENTE)
+    return hashlib.sha1(cfg.encode("utf-8")).hexdigest()[:16]
+
+class CacheFitness:
+    def __init__(self, caminho=ARQ_CACHE, capacidade=4096, casas=6):
+        self.capacidade = capacidade
+        self.casas = casas
+        self.ambiente = hash_ambiente()
+        self._lru = OrderedDict()
+        self._pendentes = []
+        self._db = None
+        if caminho:
+            self._db = sqlite3.connect(caminho)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS fitness (chave TEXT PRIMARY KEY, valor REAL NOT NULL)"
+            )
+            self._db.commit()
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+
+    def _valor(self, v):
+        if isinstance(v, list):
+            # pesos do agente neural: resumidos num hash para a chave não crescer
+            txt = ",".join(repr(round(float(x), self.casas)) for x in v)
+            return hashlib.sha1(txt.encode("utf-8")).hexdigest()
+        return repr(round(float(v), self.casas))
+
+    def chave(self, g, seed):
+        genes = ",".join(f"{k}={self._valor(g[k])}" for k in sorted(g))
+        return f"{self.ambiente}|{seed}|{genes}"
+
+    def _lembrar(self, chave, valor):
+        self._lru[chave] = valor
+        self._lru.move_to_end(chave)
+        if len(self._lru) > self.capacidade:
+            self._lru.popitem(last=False)
+
+    def obter(self, g, seed):
+        """Devolve o fitness memorizado ou None."""
+        chave = self.chave(g, seed)
+        valor = self._lru.get(chave)
+        if valor is not None:
+            self._lru.move_to_end(chave)
+            self.hits_memoria += 1
+            return valor
+        if self._db is not None:
+            row = self._db.execute("SELECT valor FROM fitness WHERE chave = ?", (chave,)).fetchone()
+            if row is not None:
+                self._lembrar(chave, row[0])
+                self.hits_disco += 1
+                return row[0]
+        self.misses += 1
+        return None
+
+    def guardar(self, g, seed, valor):
+        chave = self.chave(g, seed)
+        self._lembrar(chave, valor)
+        if self._db is not None:
+            self._pendentes.append((chave, valor))
+
+    def persistir(self):
+        """Grava em disco (uma transação) os valores novos desde a última chamada."""
+        if self._db is None or not self._pendentes:
+            return
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO fitness (chave, valor) VALUES (?, ?)",
+                                 self._pendentes)
+        self._pendentes = []
+
+    def contadores(self, zerar=False):
+        c = (self.hits_memoria, self.hits_disco, self.misses)
+        if zerar:
+            self.hits_memoria = self.hits_disco = self.misses = 0
+        return c
+
+    def fechar(self):
+        self.persistir()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
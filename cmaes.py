@@ -0,0 +1,109 @@
+# cmaes.py
+"""
+CMA-ES (mu/mu_w, lambda) para o vetor de genes, na interface ask/tell do
+`genetico.evoluir` (--otimizador cmaes).
+
+A busca acontece no cubo [0, 1]^n, mapeado linearmente para os limites de cada
+gene; amostras fora do cubo são espelhadas para dentro, então todo genoma
+avaliado respeita os limites. Maximiza o fitness. O RNG (random.Random) é o do
+treino, para que checkpoint/retomada continuem reproduzíveis.
+"""
+import math
+
+import numpy as np
+
+class CMAES:
+    def __init__(self, pop_size, rng, limites, sigma0=0.3):
+        self.rng = rng
+        self.nomes = list(limites)
+        self.lo = np.array([limites[k][0] for k in self.nomes], dtype=np.float64)
+        self.hi = np.array([limites[k][1] for k in self.nomes], dtype=np.float64)
+        n = self.n = len(self.nomes)
+
+        # parâmetros de estratégia padrão (Hansen, "The CMA Evolution Strategy: A Tutorial")
+        self.lam = max(4, pop_size)
+        self.mu = self.lam // 2
+        w = np.array([math.log(self.mu + 0.5) - math.log(i + 1) for i in range(self.mu)])
+        self.pesos = w / w.sum()
+        self.mueff = 1.0 / float(np.sum(self.pesos ** 2))
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chin = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+        # estado
+        self.media = np.array([rng.random() for _ in range(n)])
+        self.sigma = sigma0
+        self.C = np.eye(n)
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.geracao = 0
+        self._amostras = None
+        self.populacao = []
+        self._decompor()
+
+    def _decompor(self):
+        self.C = (self.C + self.C.T) / 2
+        d2, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(d2, 1e-20))
+
+    @staticmethod
+    def _espelhar(y):
+        y = np.mod(y, 2.0)
+        return np.where(y > 1.0, 2.0 - y, y)
+
+    def _genoma(self, y):
+        x = self.lo + y * (self.hi - self.lo)
+        return {k: float(v) for k, v in zip(self.nomes, x)}
+
+    def ask(self):
+        BD = self.B * self.D
+        ys = []
+        for _ in range(self.lam):
+            z = np.array([self.rng.gauss(0.0, 1.0) for _ in range(self.n)])
+            ys.append(self._espelhar(self.media + self.sigma * (BD @ z)))
+        self._amostras = np.array(ys)
+        return [self._genoma(y) for y in ys]
+
+    def tell(self, genomas, fitness):
+        ordem = sorted(range(len(fitness)), key=lambda i: fitness[i], reverse=True)
+        self.populacao = [genomas[i] for i in ordem]
+        n = self.n
+        antiga = self.media
+        passos = (self._amostras[ordem[:self.mu]] - antiga) / self.sigma   # (mu, n)
+        y_w = self.pesos @ passos
+        self.media = antiga + self.sigma * y_w
+
+        # caminhos de evolução
+        inv_raiz = self.B @ np.diag(1.0 / self.D) @ self.B.T
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * (inv_raiz @ y_w)
+        self.geracao += 1
+        norma_ps = float(np.linalg.norm(self.ps))
+        hsig = norma_ps / math.sqrt(1 - (1 - self.cs) ** (2 * self.geracao)) / self.chin < 1.4 + 2 / (n + 1)
+        self.pc = (1 - self.cc) * self.pc + (math.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_w if hsig else 0.0)
+
+        # covariância (rank-one + rank-mu) e passo
+        rank_mu = (passos.T * self.pesos) @ passos
+        corr = 0.0 if hsig else self.cc * (2 - self.cc)
+        self.C = ((1 - self.c1 - self.cmu) * self.C
+                  + self.c1 * (np.outer(self.pc, self.pc) + corr * self.C)
+                  + self.cmu * rank_mu)
+        self.sigma = min(1.0, self.sigma * math.exp((self.cs / self.damps) * (norma_ps / self.chin - 1)))
+        self._decompor()
+        self._amostras = None
+
+    def estado(self):
+        return {"media": self.media.tolist(), "sigma": self.sigma, "C": self.C.tolist(),
+                "pc": self.pc.tolist(), "ps": self.ps.tolist(), "geracao": self.geracao}
+
+    def restaurar(self, populacao, estado):
+        self.populacao = populacao
+        self.media = np.array(estado["media"])
+        self.sigma = estado["sigma"]
+        self.C = np.array(estado["C"])
+        self.pc = np.array(estado["pc"])
+        self.ps = np.array(estado["ps"])
+        self.geracao = estado["geracao"]
+        self._decompor()
@@ -1,124 +1,56 @@
 # genetico.py
+import time
+_T_INICIO = time.perf_counter()   # referência do --startup-timing (antes dos imports)
+
 import os
 import random
 import math
 import json
 import csv
 import argparse
-import pygame
-
-# ----------------- Ambiente (alinhado com main.py) -----------------
-LARGURA, ALTURA = 800, 600
-JOGADOR_W, JOGADOR_H = 48, 48
-RAIO_MOEDA = 10
-QTD_MOEDAS = 7
-OBS_W, OBS_H = 80, 20
-QTD_OBS_INICIAL = 4
-QTD_OBS_MAX = 10
-
-# Simulação headless (rápida)
-STEPS_POR_AVALIACAO = 600   # ~ 60s com dt=0.1
-DT = 0.1
-VEL_OBS_BASE = 4.0
+import contextlib
+import heapq
+import io
+import tempfile
+import multiprocessing
+import queue
+from collections import deque
+
+
+# ----------------- Ambiente (núcleo compartilhado com main.py, sem pygame) -----------------
+from simulacao import STEPS_POR_AVALIACAO, novo_estado, step, step_ambiente
+from agente import AgenteNeural
+
+_T_IMPORTADO = time.perf_counter()
 
 # Espaço de genes
 ALC_MIN, ALC_MAX = 60.0, 200.0
 PESO_MIN, PESO_MAX = 0.3, 3.0
 VEL_MIN, VEL_MAX = 4.0, 9.0
+LIMITES_GENES = {
+    "alcance_repulsao": (ALC_MIN, ALC_MAX),
+    "peso_repulsao": (PESO_MIN, PESO_MAX),
+    "vel_jogador": (VEL_MIN, VEL_MAX),
+}
+
+# Hiperparâmetros do AG (padrões; ajustáveis pela CLI e pelo varredura.py)
+ELITISMO_FRAC = 0.2
+TAXA_MUTACAO = 0.3      # probabilidade de mutar cada gene limitado
+SIGMA_MUTACAO = 0.12    # desvio da mutação, relativo à faixa do gene
+
+# Tipos de agente: paramétrico (3 genes acima) ou neural (vel_jogador + pesos da MLP)
+AGENTES = ("parametrico", "neural")
 
 ARQ_MELHOR = "melhor_agente.json"
 ARQ_EVOLUCAO = "evolucao.csv"
+ARQ_CHECKPOINT = "checkpoint_treino.json"
+CABECALHO_CSV = ["geracao", "melhor_fitness", "media_fitness",
+                 "desvio_melhor", "desvio_medio", "avaliacoes"]
 
 # ----------------- Utils numéricos -----------------
-def _norm(vx, vy):
-    m = math.hypot(vx, vy)
-    if m == 0.0:
-        return 0.0, 0.0
-    return vx / m, vy / m
-
 def _clamp(v, lo, hi):
     return max(lo, min(hi, v))
 
-def _moeda_alvo(px, py, moedas):
-    if not moedas:
-        return None
-    return min(moedas, key=lambda m: math.hypot(px - (m.x + RAIO_MOEDA), py - (m.y + RAIO_MOEDA)))
-
-def criar_moedas(rng):
-    moedas = []
-    for _ in range(QTD_MOEDAS):
-        x = rng.randint(RAIO_MOEDA + 10, LARGURA - RAIO_MOEDA - 10) - RAIO_MOEDA
-        y = rng.randint(RAIO_MOEDA + 10, ALTURA - RAIO_MOEDA - 10) - RAIO_MOEDA
-        moedas.append(pygame.Rect(x, y, RAIO_MOEDA*2, RAIO_MOEDA*2))
-    return moedas
-
-def criar_obstaculos(qtd, vel_base, rng):
-    obs = []
-    for i in range(qtd):
-        x = rng.randint(0, LARGURA - OBS_W)
-        y = rng.randint(60, ALTURA - 60)
-        rect = pygame.Rect(x, y, OBS_W, OBS_H)
-        velx = vel_base if (i % 2 == 0) else -vel_base
-        obs.append({"rect": rect, "velx": velx})
-    return obs
-
-def step_ambiente(jx, jy, vel_jogador, moedas, obstaculos, alc, peso, rng):
-    # direção para moeda
-    px, py = jx + JOGADOR_W / 2, jy + JOGADOR_H / 2
-    alvo = _moeda_alvo(px, py, moedas)
-    if alvo:
-        tx, ty = (alvo.x + RAIO_MOEDA) - px, (alvo.y + RAIO_MOEDA) - py
-        ax, ay = _norm(tx, ty)
-    else:
-        ax, ay = 0.0, 0.0
-
-    # repulsão de obstáculos
-    rx, ry = 0.0, 0.0
-    for o in obstaculos:
-        rect = o["rect"]
-        qx = _clamp(px, rect.left, rect.right)
-        qy = _clamp(py, rect.top, rect.bottom)
-        d = math.hypot(px - qx, py - qy)
-        if 0.0 < d < alc:
-            f = (alc - d) / alc
-            nx, ny = _norm(px - qx, py - qy)
-            rx += nx * f
-            ry += ny * f
-    mag = math.hypot(rx, ry)
-    if mag > 1.0:
-        rx, ry = rx / mag, ry / mag
-
-    vx, vy = ax + rx * peso, ay + ry * peso
-    vx, vy = _norm(vx, vy)
-    if vx == 0.0 and vy == 0.0:
-        vx = 1.0  # fallback
-
-    # move jogador
-    jx += vx * vel_jogador
-    jy += vy * vel_jogador
-    jx = _clamp(jx, 0.0, LARGURA - JOGADOR_W)
-    jy = _clamp(jy, 0.0, ALTURA - JOGADOR_H)
-    jrect = pygame.Rect(int(jx), int(jy), JOGADOR_W, JOGADOR_H)
-
-    # move obstáculos
-    for o in obstaculos:
-        o["rect"].x += o["velx"]
-        if o["rect"].left <= 0 or o["rect"].right >= LARGURA:
-            o["velx"] *= -1
-
-    # recompensa
-    reward = 0
-    for m in moedas:
-        if jrect.colliderect(m):
-            reward += 1
-            m.x = rng.randint(RAIO_MOEDA + 10, LARGURA - RAIO_MOEDA - 10) - RAIO_MOEDA
-            m.y = rng.randint(RAIO_MOEDA + 10, ALTURA - RAIO_MOEDA - 10) - RAIO_MOEDA
-    for o in obstaculos:
-        if jrect.colliderect(o["rect"]):
-            reward -= 2
-
-    return jx, jy, moedas, obstaculos, reward
-
 # ----------------- AG -----------------
 def cromossomo_aleatorio(rng):
     return {
@@ -134,37 +66,21 @@ def limitar_genes(g):
     return g
 
 def fitness_do_cromossomo(g, seed_base=0):
-    rng = random.Random(seed_base)
-    jx = LARGURA/2 - JOGADOR_W/2
-    jy = ALTURA/2 - JOGADOR_H/2
-    moedas = criar_moedas(rng)
-    obstaculos = criar_obstaculos(QTD_OBS_INICIAL, VEL_OBS_BASE, rng)
-    vel_obs = VEL_OBS_BASE
-    proximo_marco = 10.0
-    tempo = 0.0
-    pontuacao = 0
-
+    estado = novo_estado(seed_base, vel_jogador=g["vel_jogador"])
+    if "pesos" in g:
+        agente = AgenteNeural(g["pesos"])
+        for _ in range(STEPS_POR_AVALIACAO):
+            step(estado, agente.acao(estado))
+        return estado.pontuacao
+    alc, peso = g["alcance_repulsao"], g["peso_repulsao"]
     for _ in range(STEPS_POR_AVALIACAO):
-        jx, jy, moedas, obstaculos, reward = step_ambiente(
-            jx, jy, g["vel_jogador"], moedas, obstaculos,
-            g["alcance_repulsao"], g["peso_repulsao"], rng
-        )
-        pontuacao += reward
-        tempo += DT
-        if tempo >= proximo_marco:
-            proximo_marco += 10.0
-            vel_obs += 0.8
-            for o in obstaculos:
-                o["velx"] = (vel_obs if o["velx"] > 0 else -vel_obs)
-            if len(obstaculos) < QTD_OBS_MAX:
-                obstaculos += criar_obstaculos(1, vel_obs, rng)
-
-    return pontuacao
+        step_ambiente(estado, alc, peso)
+    return estado.pontuacao
 
 def selecao(pop, k_elite):
-    pop_ordenada = sorted(pop, key=lambda x: x[1], reverse=True)
-    elite = pop_ordenada[:k_elite]
-    return elite, pop_ordenada[0]
+    # nlargest == sorted(..., reverse=True)[:k] (mesma ordem nos empates), sem ordenar tudo
+    elite = heapq.nlargest(k_elite, pop, key=lambda x: x[1])
+    return elite, elite[0]
 
 def cruzar(g1, g2, rng):
     a = rng.random()
@@ -174,7 +90,7 @@ def cruzar(g1, g2, rng):
         "vel_jogador": a * g1["vel_jogador"] + (1-a) * g2["vel_jogador"],
     }
 
-def mutar(g, rng, taxa=0.3, sigma_rel=0.12):
+def mutar(g, rng, taxa=TAXA_MUTACAO, sigma_rel=SIGMA_MUTACAO):
     if rng.random() < taxa:
         g["alcance_repulsao"] += rng.gauss(0, (ALC_MAX-ALC_MIN) * sigma_rel)
     if rng.random() < taxa:
@@ -183,35 +99,164 @@ def mutar(g, rng, taxa=0.3, sigma_rel=0.12):
         g["vel_jogador"] += rng.gauss(0, (VEL_MAX-VEL_MIN) * sigma_rel)
     return limitar_genes(g)
 
+# ----------------- Genoma neural (pesos da MLP de politica_neural.py) -----------------
+def cromossomo_neural_aleatorio(rng):
+    # import tardio: NumPy só é necessário para o agente neural
+    from politica_neural import pesos_aleatorios
+    return {"vel_jogador": rng.uniform(VEL_MIN, VEL_MAX), "pesos": pesos_aleatorios(rng)}
+
+def limitar_neural(g):
+    from politica_neural import PESO_LIM
+    g["vel_jogador"] = _clamp(g["vel_jogador"], VEL_MIN, VEL_MAX)
+    g["pesos"] = [_clamp(w, -PESO_LIM, PESO_LIM) for w in g["pesos"]]
+    return g
+
+def cruzar_neural(g1, g2, rng):
+    a = rng.random()
+    return {
+        "vel_jogador": a * g1["vel_jogador"] + (1-a) * g2["vel_jogador"],
+        "pesos": [a * w1 + (1-a) * w2 for w1, w2 in zip(g1["pesos"], g2["pesos"])],
+    }
+
+def mutar_neural(g, rng, taxa=0.1, sigma=0.15, taxa_vel=TAXA_MUTACAO, sigma_rel=SIGMA_MUTACAO):
+    pesos = g["pesos"]
+    for i in range(len(pesos)):
+        if rng.random() < taxa:
+            pesos[i] += rng.gauss(0, sigma)
+    if rng.random() < taxa_vel:
+        g["vel_jogador"] += rng.gauss(0, (VEL_MAX-VEL_MIN) * sigma_rel)
+    return limitar_neural(g)
+
+def populacao_inicial(pop_size, rng, agente="parametrico"):
+    if agente not in AGENTES:
+        raise ValueError(f"agente desconhecido: {agente!r} (opções: {', '.join(AGENTES)})")
+    novo = cromossomo_neural_aleatorio if agente == "neural" else cromossomo_aleatorio
+    return [novo(rng) for _ in range(pop_size)]
+
+def descrever(g):
+    """Genes para os logs (o genoma neural é resumido)."""
+    if "pesos" in g:
+        return f"{{'vel_jogador': {g['vel_jogador']}, 'pesos': <{len(g['pesos'])} pesos>}}"
+    return str(g)
+
+def reproduzir(elite, aval, pop_size, rng, taxa=TAXA_MUTACAO, sigma_rel=SIGMA_MUTACAO):
+    """
+    Próxima geração: a elite passa direto, o resto vem de cruzamento + mutação
+    (`taxa`/`sigma_rel` valem para os genes limitados; no neural, só a velocidade).
+    """
+    nova_pop = [e[0] for e in elite]  # elitismo
+    neural = "pesos" in nova_pop[0]
+    while len(nova_pop) < pop_size:
+        p1 = rng.choice(elite)[0]
+        p2 = rng.choice(aval)[0]
+        if neural:
+            nova_pop.append(mutar_neural(cruzar_neural(p1, p2, rng), rng, taxa_vel=taxa, sigma_rel=sigma_rel))
+            continue
+        filho = cruzar(p1, p2, rng)
+        filho = mutar(filho, rng, taxa=taxa, sigma_rel=sigma_rel)
+        nova_pop.append(limitar_genes(filho))
+    return nova_pop
+
+# ----------------- Otimizadores (interface ask/tell) -----------------
+# ask() -> genomas a avaliar; tell(genomas, fitness) atualiza a busca;
+# `populacao` = genomas atuais (melhores primeiro); estado()/restaurar() para checkpoint.
+OTIMIZADORES = ("ag", "cmaes")
+
+class OtimizadorAG:
+    """O AG clássico do projeto: elitismo + cruzamento por mistura + mutação gaussiana."""
+    def __init__(self, pop_size, rng, elitismo_frac=ELITISMO_FRAC, agente="parametrico",
+                 taxa_mutacao=TAXA_MUTACAO, sigma_mutacao=SIGMA_MUTACAO):
+        self.pop_size = pop_size
+        self.rng = rng
+        self.k_elite = max(1, int(pop_size * elitismo_frac))
+        self.taxa_mutacao = taxa_mutacao
+        self.sigma_mutacao = sigma_mutacao
+        self.populacao = populacao_inicial(pop_size, rng, agente)
+
+    def ask(self):
+        return self.populacao
+
+    def tell(self, genomas, fitness):
+        aval = list(zip(genomas, fitness))
+        elite, _ = selecao(aval, self.k_elite)
+        self.populacao = reproduzir(elite, aval, self.pop_size, self.rng,
+                                    self.taxa_mutacao, self.sigma_mutacao)
+
+    def estado(self):
+        return {}  # a população já vai no checkpoint
+
+    def restaurar(self, populacao, estado):
+        self.populacao = populacao
+
+def criar_otimizador(nome, pop_size, rng, elitismo_frac=ELITISMO_FRAC, agente="parametrico",
+                     taxa_mutacao=TAXA_MUTACAO, sigma_mutacao=SIGMA_MUTACAO):
+    if nome == "cmaes":
+        if agente != "parametrico":
+            raise ValueError("o CMA-ES otimiza só os genes do agente paramétrico")
+        # import tardio: NumPy só é necessário para o CMA-ES
+        from cmaes import CMAES
+        return CMAES(pop_size, rng, LIMITES_GENES)
+    if nome != "ag":
+        raise ValueError(f"otimizador desconhecido: {nome!r} (opções: {', '.join(OTIMIZADORES)})")
+    return OtimizadorAG(pop_size, rng, elitismo_frac, agente, taxa_mutacao, sigma_mutacao)
+
 # ----------------- Plot helpers (interativo, suave e animação) -----------------
+class MediaMovel:
+    """Média móvel de janela `k` com atualização O(1) por ponto."""
+    __slots__ = ("k", "janela", "soma")
+
+    def __init__(self, k):
+        self.k = max(1, k)
+        self.janela = deque()
+        self.soma = 0.0
+
+    def adicionar(self, v):
+        self.janela.append(v)
+        self.soma += v
+        if len(self.janela) > self.k:
+            self.soma -= self.janela.popleft()
+        return self.soma / len(self.janela)
+
 def _moving_average(vals, k):
     if k <= 1 or not vals:
         return vals[:]
-    out = []
-    s = 0.0
-    q = []
-    for v in vals:
-        q.append(v)
-        s += v
-        if len(q) > k:
-            s -= q.pop(0)
-        out.append(s / len(q))
-    return out
-
-def _plotar_estatico(csv_path, smooth=0):
+    mm = MediaMovel(k)
+    return [mm.adicionar(v) for v in vals]
+
+# backends com janela, em ordem de preferência, e os toolkits de que dependem
+_BACKENDS_INTERATIVOS = (
+    ("TkAgg", ("tkinter",)),
+    ("Qt5Agg", ("PyQt5", "PySide2")),
+    ("QtAgg", ("PyQt6", "PySide6", "PyQt5", "PySide2")),
+    ("WXAgg", ("wx",)),
+    ("GTK3Agg", ("gi",)),
+)
+
+def _pyplot_interativo():
+    """Importa pyplot trocando backends não interativos por um com janela (ou None)."""
     try:
+        import importlib.util
         import matplotlib
         backend = matplotlib.get_backend().lower()
         if any(b in backend for b in ["agg", "pdf", "svg", "ps", "cairo"]):
-            for bk in ["TkAgg", "Qt5Agg", "QtAgg", "WXAgg", "GTK3Agg"]:
+            for bk, toolkits in _BACKENDS_INTERATIVOS:
+                # find_spec só procura o módulo: não importa toolkits ausentes
+                if not any(importlib.util.find_spec(t) for t in toolkits):
+                    continue
                 try:
                     matplotlib.use(bk, force=True)
                     break
                 except Exception:
                     continue
         import matplotlib.pyplot as plt
+        return plt
     except Exception as e:
         print(f"[AVISO] matplotlib interativo indisponível: {e}")
+        return None
+
+def _plotar_estatico(csv_path, smooth=0):
+    plt = _pyplot_interativo()
+    if plt is None:
         print("Instale um backend (tkinter/pyqt5/wxPython).")
         return
 
@@ -237,7 +282,6 @@ def _plotar_estatico(csv_path, smooth=0):
     bests_s = _moving_average(bests, smooth)
     meds_s  = _moving_average(meds, smooth)
 
-    import matplotlib.pyplot as plt
     plt.figure(figsize=(9,5))
     plt.plot(ger, bests, label="Melhor Fitness", alpha=0.35)
     plt.plot(ger, meds,  label="Média Fitness",  alpha=0.35)
@@ -254,21 +298,10 @@ def _plotar_estatico(csv_path, smooth=0):
     plt.show()
 
 def _plotar_animado(csv_path, smooth=0, interval_ms=200):
-    try:
-        import matplotlib
-        backend = matplotlib.get_backend().lower()
-        if any(b in backend for b in ["agg", "pdf", "svg", "ps", "cairo"]):
-            for bk in ["TkAgg", "Qt5Agg", "QtAgg", "WXAgg", "GTK3Agg"]:
-                try:
-                    matplotlib.use(bk, force=True)
-                    break
-                except Exception:
-                    continue
-        import matplotlib.pyplot as plt
-        from matplotlib.animation import FuncAnimation
-    except Exception as e:
-        print(f"[AVISO] matplotlib interativo indisponível: {e}")
+    plt = _pyplot_interativo()
+    if plt is None:
         return
+    from matplotlib.animation import FuncAnimation
 
     if not os.path.exists(csv_path):
         print(f"[AVISO] '{csv_path}' não encontrado.")
@@ -310,6 +343,10 @@ def _plotar_animado(csv_path, smooth=0, interval_ms=200):
     pad = max(5, (y_max - y_min) * 0.1)
     ax.set_ylim(y_min - pad, y_max + pad)
 
+    # suavização calculada uma vez; cada quadro só recorta o prefixo
+    bests_s = _moving_average(bests, smooth)
+    meds_s = _moving_average(meds, smooth)
+
     def update(frame):
         g = ger[:frame+1]
         b = bests[:frame+1]
@@ -317,10 +354,8 @@ def _plotar_animado(csv_path, smooth=0, interval_ms=200):
         ln_best.set_data(g, b)
         ln_mean.set_data(g, m)
         if ln_best_s is not None:
-            bs = _moving_average(b, smooth)
-            ms = _moving_average(m, smooth)
-            ln_best_s.set_data(g, bs)
-            ln_mean_s.set_data(g, ms)
+            ln_best_s.set_data(g, bests_s[:frame+1])
+            ln_mean_s.set_data(g, meds_s[:frame+1])
         return [ln_best, ln_mean] + ([ln_best_s, ln_mean_s] if ln_best_s else [])
 
     anim = FuncAnimation(fig, update, frames=len(ger), interval=interval_ms, blit=False, repeat=False)
@@ -328,71 +363,562 @@ def _plotar_animado(csv_path, smooth=0, interval_ms=200):
     plt.tight_layout()
     plt.show()
 
-# ----------------- Evolução -----------------
-def evoluir(geracoes=15, pop_size=40, seed=42, elitismo_frac=0.2, log_csv=ARQ_EVOLUCAO,
-            smooth=0, animate=False):
-    # modo headless para pygame
-    os.environ["SDL_VIDEODRIVER"] = "dummy"
-    pygame.init()
-
-    rng = random.Random(seed)
-    k_elite = max(1, int(pop_size * elitismo_frac))
+def _grafico_ao_vivo(fila, smooth=0, fps_max=4.0):
+    """
+    Processo de gráfico: consome (geracao, melhor, media) da `fila` enquanto o
+    treino roda e redesenha no máximo `fps_max` vezes por segundo. `None` na
+    fila marca o fim do treino; a janela fica aberta até ser fechada.
+    """
+    plt = _pyplot_interativo()
+    if plt is None:
+        return
+    try:
+        fig, ax = plt.subplots(figsize=(9,5))
+    except Exception as e:
+        print(f"[AVISO] gráfico ao vivo indisponível: {e}")
+        return
+    ax.set_title("Evolução do Fitness por Geração (ao vivo)")
+    ax.set_xlabel("Geração")
+    ax.set_ylabel("Fitness")
+    ax.grid(True, alpha=0.3)
+    (ln_best,) = ax.plot([], [], label="Melhor Fitness", alpha=0.35 if smooth > 1 else 1.0)
+    (ln_mean,) = ax.plot([], [], label="Média Fitness", alpha=0.35 if smooth > 1 else 1.0)
+    linhas = [(ln_best, [], None), (ln_mean, [], None)]
+    if smooth > 1:
+        (ln_best_s,) = ax.plot([], [], label=f"Melhor (média móvel k={smooth})")
+        (ln_mean_s,) = ax.plot([], [], label=f"Média (média móvel k={smooth})")
+        linhas += [(ln_best_s, [], MediaMovel(smooth)), (ln_mean_s, [], MediaMovel(smooth))]
+    ax.legend()
+    plt.tight_layout()
+    plt.show(block=False)
+
+    ger = []
+    intervalo = 1.0 / fps_max
+    ultimo_desenho = 0.0
+    pendente = False
+    fim = False
+    while not fim:
+        if not plt.fignum_exists(fig.number):
+            return  # janela fechada durante o treino
+        itens = []
+        try:
+            itens.append(fila.get(timeout=0.05))
+            while True:
+                itens.append(fila.get_nowait())
+        except queue.Empty:
+            pass
+        for item in itens:
+            if item is None:
+                fim = True
+                break
+            gen, melhor, media = item
+            ger.append(gen)
+            for (_, ys, mm), v in zip(linhas, (melhor, media, melhor, media)):
+                ys.append(mm.adicionar(v) if mm is not None else v)
+            pendente = True
+
+        agora = time.perf_counter()
+        if pendente and (fim or agora - ultimo_desenho >= intervalo):
+            for ln, ys, _ in linhas:
+                ln.set_data(ger, ys)
+            ax.relim()
+            ax.autoscale_view()
+            fig.canvas.draw_idle()
+            ultimo_desenho = agora
+            pendente = False
+        fig.canvas.flush_events()
+
+    print("[GRÁFICO] Treino concluído (feche a janela para continuar)...")
+    plt.show()
 
-    # Reinicia CSV a cada treino (para gráfico apenas do treino atual)
+# ----------------- Avaliação (serial ou em processos) -----------------
+def _avaliar_lote(lote, seed_base, vetorizado=False):
+    if vetorizado:
+        # import tardio: NumPy só é necessário no modo vetorizado
+        from simulacao_vetorizada import fitness_populacao
+        return fitness_populacao(lote, seed_base=seed_base)
+    return [fitness_do_cromossomo(g, seed_base=seed_base) for g in lote]
+
+def _tamanho_lote(n, workers, vetorizado=False):
+    if vetorizado:
+        # no modo vetorizado, lotes grandes amortizam o custo por tick
+        return max(1, math.ceil(n / workers))
+    # ~4 lotes por worker: equilibra a carga sem excesso de IPC
+    return max(1, math.ceil(n / (workers * 4)))
+
+def avaliar_populacao(populacao, seed_base, pool=None, workers=1, vetorizado=False, cache=None):
+    """
+    Devolve o fitness de cada cromossomo, na ordem da população.
+    Com `pool`, os cromossomos vão aos processos em lotes; como cada avaliação
+    depende só dos genes e da seed, o resultado independe do número de workers.
+    Com `cache` (CacheFitness), só os pares (genes, seed) inéditos são simulados.
+    """
+    if cache is not None:
+        fits = [cache.obter(g, seed_base) for g in populacao]
+        faltam = [i for i, f in enumerate(fits) if f is None]
+        if faltam:
+            novos = avaliar_populacao([populacao[i] for i in faltam], seed_base, pool=pool,
+                                      workers=workers, vetorizado=vetorizado)
+            for i, f in zip(faltam, novos):
+                fits[i] = f
+                cache.guardar(populacao[i], seed_base, f)
+        return fits
+    if pool is None:
+        return _avaliar_lote(populacao, seed_base, vetorizado)
+    tam = _tamanho_lote(len(populacao), workers, vetorizado)
+    lotes = [populacao[i:i+tam] for i in range(0, len(populacao), tam)]
+    fits = []
+    for r in pool.starmap(_avaliar_lote, [(lote, seed_base, vetorizado) for lote in lotes]):
+        fits.extend(r)
+    return fits
+
+# ----------------- Multi-seed (números aleatórios comuns) e corrida -----------------
+def seeds_da_geracao(gen, k=1):
+    """Seeds compartilhadas por todos os cromossomos da geração (a 1ª é a seed histórica)."""
+    return [1000 + gen + 10007 * j for j in range(k)]
+
+def _media_variancia(vals):
+    n = len(vals)
+    media = sum(vals) / n
+    var = sum((v - media) ** 2 for v in vals) / (n - 1) if n > 1 else 0.0
+    return media, var
+
+def avaliar_multi_seed(populacao, seeds, pool=None, workers=1, vetorizado=False,
+                       corrida=False, k_elite=1, min_seeds=3, z=1.96, cache=None):
+    """
+    Avalia a população nas mesmas `seeds` e devolve, por cromossomo,
+    (média, variância, nº de avaliações).
+    Com `corrida`, a partir de `min_seeds` um candidato deixa de ser avaliado
+    quando sua média fica abaixo do corte da elite por mais de `z` erros-padrão
+    da diferença.
+    """
+    resultados = [[] for _ in populacao]
+    vivos = list(range(len(populacao)))
+    for j, s in enumerate(seeds):
+        fits = avaliar_populacao([populacao[i] for i in vivos], s, pool=pool,
+                                 workers=workers, vetorizado=vetorizado, cache=cache)
+        for i, f in zip(vivos, fits):
+            resultados[i].append(f)
+
+        n = j + 1
+        if corrida and min_seeds <= n < len(seeds) and len(vivos) > k_elite:
+            stats = {i: _media_variancia(resultados[i]) for i in vivos}
+            ordem = sorted(vivos, key=lambda i: stats[i][0], reverse=True)
+            m_corte, v_corte = stats[ordem[k_elite - 1]]
+            vivos = [i for i in vivos
+                     if m_corte - stats[i][0] <= z * math.sqrt((stats[i][1] + v_corte) / n)]
+
+    return [_media_variancia(r) + (len(r),) for r in resultados]
+
+# ----------------- Checkpoint / retomada -----------------
+# parâmetros que mudam a trajetória do treino: a retomada usa os do checkpoint
+_PARAMS_CHECKPOINT = ("pop_size", "elitismo_frac", "seeds_por_avaliacao", "corrida", "otimizador", "agente",
+                      "taxa_mutacao", "sigma_mutacao")
+
+def _gravar_atomico(caminho, dados, indent=None):
+    tmp = caminho + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, caminho)
+
+def salvar_checkpoint(caminho, proxima_geracao, populacao, estado_otimizador, melhor_global,
+                      estado_rng, params):
+    """
+    Grava o estado entre duas gerações: população, estado do otimizador, melhor
+    global e o estado do random.Random. A troca é atômica (arquivo temporário + os.replace), então
+    uma queda no meio da escrita mantém o checkpoint anterior.
+    """
+    versao, interno, gauss = estado_rng
+    _gravar_atomico(caminho, {
+        "proxima_geracao": proxima_geracao,
+        "params": params,
+        "populacao": populacao,
+        "estado_otimizador": estado_otimizador,
+        "melhor_global": None if melhor_global is None
+                         else {"genes": melhor_global[0], "fitness": melhor_global[1]},
+        "rng": [versao, list(interno), gauss],
+    })
+
+def carregar_checkpoint(caminho):
+    """Devolve (proxima_geracao, populacao, estado_otimizador, melhor_global, estado_rng, params)."""
+    with open(caminho, "r", encoding="utf-8") as f:
+        d = json.load(f)
+    mg = d["melhor_global"]
+    melhor_global = None if mg is None else (mg["genes"], mg["fitness"])
+    versao, interno, gauss = d["rng"]
+    params = d["params"]
+    params.setdefault("otimizador", "ag")  # checkpoints anteriores ao ask/tell
+    params.setdefault("agente", "parametrico")  # checkpoints anteriores ao agente neural
+    params.setdefault("taxa_mutacao", TAXA_MUTACAO)   # anteriores à mutação configurável
+    params.setdefault("sigma_mutacao", SIGMA_MUTACAO)
+    return (d["proxima_geracao"], d["populacao"], d.get("estado_otimizador", {}), melhor_global,
+            (versao, tuple(interno), gauss), params)
+
+def _truncar_log(log_csv, ate_geracao):
+    """Mantém no CSV só as gerações < `ate_geracao` (as seguintes serão refeitas)."""
+    linhas = []
+    if ate_geracao > 0 and os.path.exists(log_csv):
+        with open(log_csv, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                try:
+                    if int(row["geracao"]) < ate_geracao:
+                        linhas.append([row[c] for c in CABECALHO_CSV])
+                except (KeyError, TypeError, ValueError):
+                    pass
     with open(log_csv, "w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
-        w.writerow(["geracao", "melhor_fitness", "media_fitness"])
+        w.writerow(CABECALHO_CSV)
+        w.writerows(linhas)
+    return linhas
+
+def salvar_melhor(melhor_global, arq_melhor=ARQ_MELHOR):
+    genes, _ = melhor_global
+    if "pesos" in genes:
+        from politica_neural import K_OBS, OCULTOS
+        _gravar_atomico(arq_melhor, {
+            "tipo": "neural",
+            "k_obs": K_OBS,
+            "ocultos": OCULTOS,
+            "vel_jogador": genes["vel_jogador"],
+            "pesos": genes["pesos"]
+        }, indent=2)
+        return
+    _gravar_atomico(arq_melhor, {
+        "alcance_repulsao": genes["alcance_repulsao"],
+        "peso_repulsao": genes["peso_repulsao"],
+        "vel_jogador": genes["vel_jogador"]
+    }, indent=2)
 
-    # População inicial
-    populacao = [cromossomo_aleatorio(rng) for _ in range(pop_size)]
-    melhor_global = None  # (genes, fitness)
+# ----------------- Evolução -----------------
+def evoluir(geracoes=15, pop_size=40, seed=42, elitismo_frac=ELITISMO_FRAC, log_csv=ARQ_EVOLUCAO,
+            smooth=0, animate=False, vetorizado=False, workers=1,
+            seeds_por_avaliacao=1, corrida=False, arq_cache=None,
+            arq_melhor=ARQ_MELHOR, plotar=True,
+            arq_checkpoint=ARQ_CHECKPOINT, checkpoint_cada=10, retomar=False,
+            ao_vivo=False, otimizador="ag", alvo=None, dir_replays=None, agente="parametrico",
+            startup_timing=False, taxa_mutacao=TAXA_MUTACAO, sigma_mutacao=SIGMA_MUTACAO):
+    t_entrada = time.perf_counter()
+    inicio = 0
+    if retomar and os.path.exists(arq_checkpoint):
+        inicio, populacao, estado_otim, melhor_global, estado_rng, params = carregar_checkpoint(arq_checkpoint)
+        atuais = {"pop_size": pop_size, "elitismo_frac": elitismo_frac,
+                  "seeds_por_avaliacao": seeds_por_avaliacao, "corrida": corrida,
+                  "otimizador": otimizador, "agente": agente,
+                  "taxa_mutacao": taxa_mutacao, "sigma_mutacao": sigma_mutacao}
+        diferentes = [k for k in _PARAMS_CHECKPOINT if params[k] != atuais[k]]
+        if diferentes:
+            print("[AVISO] usando do checkpoint: " + ", ".join(f"{k}={params[k]}" for k in diferentes))
+        pop_size, elitismo_frac = params["pop_size"], params["elitismo_frac"]
+        seeds_por_avaliacao, corrida = params["seeds_por_avaliacao"], params["corrida"]
+        otimizador, agente = params["otimizador"], params["agente"]
+        taxa_mutacao, sigma_mutacao = params["taxa_mutacao"], params["sigma_mutacao"]
+        rng = random.Random()
+        otim = criar_otimizador(otimizador, pop_size, rng, elitismo_frac, agente, taxa_mutacao, sigma_mutacao)
+        otim.restaurar(populacao, estado_otim)
+        rng.setstate(estado_rng)
+        print(f"[RETOMADA] {arq_checkpoint} | continuando da geração {inicio}")
+    else:
+        if retomar:
+            print(f"[AVISO] '{arq_checkpoint}' não encontrado; iniciando treino novo.")
+        rng = random.Random(seed)
+        # população inicial (AG) / distribuição inicial (CMA-ES)
+        otim = criar_otimizador(otimizador, pop_size, rng, elitismo_frac, agente, taxa_mutacao, sigma_mutacao)
+        melhor_global = None  # (genes, fitness)
+    params = {"pop_size": pop_size, "elitismo_frac": elitismo_frac,
+              "seeds_por_avaliacao": seeds_por_avaliacao, "corrida": corrida,
+              "otimizador": otimizador, "agente": agente,
+              "taxa_mutacao": taxa_mutacao, "sigma_mutacao": sigma_mutacao}
+    k_elite = max(1, int(pop_size * elitismo_frac))
 
-    for gen in range(geracoes):
-        aval = []
-        seed_base = 1000 + gen
-        for g in populacao:
-            fit = fitness_do_cromossomo(g, seed_base=seed_base)
-            aval.append((g, fit))
+    # Treino novo reinicia o CSV (gráfico apenas do treino atual); a retomada
+    # descarta as gerações posteriores ao checkpoint, que serão refeitas
+    anteriores = _truncar_log(log_csv, inicio)
+
+    # gráfico ao vivo em outro processo: o treino só faz put_nowait por geração
+    fila_grafico = proc_grafico = None
+    if ao_vivo:
+        fila_grafico = multiprocessing.Queue()
+        proc_grafico = multiprocessing.Process(target=_grafico_ao_vivo, args=(fila_grafico, smooth),
+                                               daemon=True)
+        proc_grafico.start()
+        for row in anteriores:
+            fila_grafico.put_nowait((int(row[0]), float(row[1]), float(row[2])))
+
+    def checkpoint(ultimo):
+        log.flush()
+        os.fsync(log.fileno())
+        salvar_checkpoint(arq_checkpoint, *ultimo, params)
+        if ultimo[3] is not None:
+            salvar_melhor(ultimo[3], arq_melhor)
+
+    pool = multiprocessing.Pool(processes=workers) if workers > 1 else None
+    cache = None
+    if arq_cache:
+        from cache_fitness import CacheFitness
+        cache = CacheFitness(arq_cache)
+
+    # estado consistente ao fim da última geração completa (para Ctrl-C)
+    ultimo = (inicio, otim.populacao, otim.estado(), melhor_global, rng.getstate())
+    # o log fica aberto (com buffer) durante todo o treino e é descarregado nos checkpoints
+    log = open(log_csv, "a", newline="", encoding="utf-8")
+    log_w = csv.writer(log)
+    t_preparado = time.perf_counter()
+    try:
+        for gen in range(inicio, geracoes):
+            populacao = otim.ask()
+            seeds = seeds_da_geracao(gen, seeds_por_avaliacao)
+            stats = avaliar_multi_seed(populacao, seeds, pool=pool, workers=workers,
+                                       vetorizado=vetorizado, corrida=corrida, k_elite=k_elite,
+                                       cache=cache)
+            aval = [(g, st[0]) for g, st in zip(populacao, stats)]
+
+            media = sum(f for _, f in aval) / len(aval)
+            i_best = max(range(len(aval)), key=lambda i: aval[i][1])
+            best = aval[i_best]
+            desvio_best = math.sqrt(stats[i_best][1])
+            desvio_medio = sum(math.sqrt(st[1]) for st in stats) / len(stats)
+            n_aval = sum(st[2] for st in stats)
+
+            log_w.writerow([gen, best[1], media, desvio_best, desvio_medio, n_aval])
+            if fila_grafico is not None:
+                fila_grafico.put_nowait((gen, best[1], media))
+
+            if (melhor_global is None) or (best[1] > melhor_global[1]):
+                melhor_global = best
+            if dir_replays:
+                # re-simula só o melhor da geração (na 1ª seed) gravando cada tick
+                from replay import EXTENSAO, gravar_episodio
+                os.makedirs(dir_replays, exist_ok=True)
+                gravar_episodio(os.path.join(dir_replays, f"geracao_{gen:04d}{EXTENSAO}"), best[0], seeds[0])
+
+            otim.tell(populacao, [f for _, f in aval])
+            ultimo = (gen + 1, otim.populacao, otim.estado(), melhor_global, rng.getstate())
+
+            print(f"[GERAÇÃO {gen:02d}] melhor={best[1]:.2f}±{desvio_best:.2f} média={media:.2f} "
+                  f"avaliações={n_aval} genes={descrever(best[0])}")
+            if startup_timing and gen == inicio:
+                agora = time.perf_counter()
+                print(f"[STARTUP] importações={1000 * (_T_IMPORTADO - _T_INICIO):.0f} ms | "
+                      f"preparação={1000 * (t_preparado - t_entrada):.0f} ms | "
+                      f"1ª geração={1000 * (agora - t_preparado):.0f} ms | "
+                      f"até a 1ª geração={1000 * (agora - _T_INICIO):.0f} ms")
+            if cache is not None:
+                cache.persistir()
+                hm, hd, ms = cache.contadores(zerar=True)
+                print(f"[CACHE] hits_memoria={hm} hits_disco={hd} misses={ms}")
+            if checkpoint_cada > 0 and (gen + 1) % checkpoint_cada == 0 and gen + 1 < geracoes:
+                checkpoint(ultimo)
+        if ultimo[0] > inicio:
+            checkpoint(ultimo)
+    except KeyboardInterrupt:
+        checkpoint(ultimo)
+        print(f"[INTERROMPIDO] checkpoint da geração {ultimo[0]} salvo em {arq_checkpoint} "
+              f"(continue com --resume)")
+        raise
+    finally:
+        log.close()
+        if fila_grafico is not None:
+            fila_grafico.put_nowait(None)
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if cache is not None:
+            cache.fechar()
 
+    # salva melhor global
+    if melhor_global:
+        genes, fit = melhor_global
+        salvar_melhor(melhor_global, arq_melhor)
+        print(f"[SALVO] {arq_melhor} | melhor_fitness={fit:.2f} | genes={descrever(genes)}")
+    if alvo is not None:
+        ger_alvo, n_aval = avaliacoes_ate_alvo(log_csv, alvo)
+        if ger_alvo is None:
+            print(f"[ALVO] fitness >= {alvo} não atingido ({n_aval} avaliações)")
+        else:
+            print(f"[ALVO] fitness >= {alvo} na geração {ger_alvo} após {n_aval} avaliações")
+
+    # Gráfico pós-treino (estático ou animado); o ao vivo já mostra tudo
+    if proc_grafico is not None:
+        proc_grafico.join()
+        return melhor_global
+    if not plotar:
+        return melhor_global
+    if animate:
+        _plotar_animado(csv_path=log_csv, smooth=smooth, interval_ms=220)
+    else:
+        _plotar_estatico(csv_path=log_csv, smooth=smooth)
+    return melhor_global
+
+# ----------------- Modelo de ilhas -----------------
+TOPOLOGIAS = ("anel", "todos")
+
+def _destinos(i, ilhas, topologia):
+    if topologia == "anel":
+        return [(i + 1) % ilhas]
+    return [j for j in range(ilhas) if j != i]
+
+def _ilha(i, ilhas, geracoes, pop_size, seed, elitismo_frac, seeds_por_avaliacao, corrida,
+          vetorizado, intervalo, migrantes, topologia, caixas, saida, agente="parametrico",
+          taxa_mutacao=TAXA_MUTACAO, sigma_mutacao=SIGMA_MUTACAO):
+    """
+    Processo de uma ilha: evolui a própria subpopulação (com elitismo próprio) e,
+    a cada `intervalo` gerações, envia seus `migrantes` melhores aos vizinhos da
+    topologia; os que chegam substituem os últimos filhos da próxima geração.
+    """
+    rng = random.Random(seed + 7919 * i)
+    k_elite = max(1, int(pop_size * elitismo_frac))
+    origens = [j for j in range(ilhas) if i in _destinos(j, ilhas, topologia)]
+    populacao = populacao_inicial(pop_size, rng, agente)
+    melhor_global = None
+    pendentes = {}  # evento de migração -> [(origem, genes)]; vizinhos podem adiantar-se
+    for gen in range(geracoes):
+        seeds = seeds_da_geracao(gen, seeds_por_avaliacao)
+        stats = avaliar_multi_seed(populacao, seeds, vetorizado=vetorizado, corrida=corrida,
+                                   k_elite=k_elite)
+        aval = [(g, st[0]) for g, st in zip(populacao, stats)]
         elite, best = selecao(aval, k_elite)
-        media = sum(f for _, f in aval) / len(aval)
-
-        with open(log_csv, "a", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow([gen, best[1], media])
-
         if (melhor_global is None) or (best[1] > melhor_global[1]):
             melhor_global = best
-
-        # próxima geração
-        nova_pop = [e[0] for e in elite]  # elitismo
-        while len(nova_pop) < pop_size:
-            p1 = rng.choice(elite)[0]
-            p2 = rng.choice(aval)[0]
-            filho = cruzar(p1, p2, rng)
-            filho = mutar(filho, rng, taxa=0.3, sigma_rel=0.12)
-            nova_pop.append(limitar_genes(filho))
-        populacao = nova_pop
-
-        print(f"[GERAÇÃO {gen:02d}] melhor={best[1]:.2f} média={media:.2f} genes={best[0]}")
-
-    # salva melhor global
+        i_best = max(range(len(aval)), key=lambda k: aval[k][1])
+        saida.put((i, gen, best, sum(f for _, f in aval) / len(aval), math.sqrt(stats[i_best][1]),
+                   sum(math.sqrt(st[1]) for st in stats) / len(stats), sum(st[2] for st in stats)))
+
+        populacao = reproduzir(elite, aval, pop_size, rng, taxa_mutacao, sigma_mutacao)
+        if ilhas > 1 and migrantes > 0 and (gen + 1) % intervalo == 0 and gen + 1 < geracoes:
+            emigrantes = [g for g, _ in selecao(aval, migrantes)[0]]
+            for j in _destinos(i, ilhas, topologia):
+                caixas[j].put((gen, i, emigrantes))
+            while len(pendentes.get(gen, ())) < len(origens):
+                ev, j, genes = caixas[i].get()
+                pendentes.setdefault(ev, []).append((j, genes))
+            # ordem fixa por ilha de origem: a execução não depende do escalonamento
+            imigrantes = [g for _, gs in sorted(pendentes.pop(gen), key=lambda c: c[0]) for g in gs]
+            imigrantes = imigrantes[:pop_size - k_elite]
+            if imigrantes:
+                populacao[-len(imigrantes):] = imigrantes
+    saida.put((i, None, melhor_global))
+
+def evoluir_ilhas(ilhas=4, geracoes=15, pop_size=40, seed=42, elitismo_frac=ELITISMO_FRAC,
+                  log_csv=ARQ_EVOLUCAO, smooth=0, animate=False, vetorizado=False,
+                  seeds_por_avaliacao=1, corrida=False, intervalo_migracao=5, migrantes=2,
+                  topologia="anel", arq_melhor=ARQ_MELHOR, plotar=True, agente="parametrico",
+                  taxa_mutacao=TAXA_MUTACAO, sigma_mutacao=SIGMA_MUTACAO):
+    """
+    AG em `ilhas` subpopulações de `pop_size // ilhas` indivíduos, cada uma em um
+    processo. O CSV traz, por geração, as estatísticas combinadas de todas as ilhas
+    (mesmas colunas do `evoluir`) e o melhor fitness de cada ilha.
+    """
+    if intervalo_migracao < 1:
+        raise ValueError(f"intervalo_migracao deve ser >= 1 (recebeu {intervalo_migracao})")
+    pop_ilha = max(2, pop_size // ilhas)
+    caixas = [multiprocessing.Queue() for _ in range(ilhas)]
+    saida = multiprocessing.Queue()
+    procs = [multiprocessing.Process(
+                target=_ilha,
+                args=(i, ilhas, geracoes, pop_ilha, seed, elitismo_frac, seeds_por_avaliacao, corrida,
+                      vetorizado, intervalo_migracao, migrantes, topologia, caixas, saida, agente,
+                      taxa_mutacao, sigma_mutacao),
+                daemon=True)
+             for i in range(ilhas)]
+    print(f"[ILHAS] {ilhas} ilhas x {pop_ilha} indivíduos | migração: {migrantes} a cada "
+          f"{intervalo_migracao} gerações ({topologia})")
+    for p in procs:
+        p.start()
+
+    por_geracao = {}  # geracao -> {ilha: estatísticas}
+    finais = {}
+    proxima = 0
+    log = open(log_csv, "w", newline="", encoding="utf-8")
+    log_w = csv.writer(log)
+    log_w.writerow(CABECALHO_CSV + [f"melhor_ilha_{i}" for i in range(ilhas)])
+    try:
+        while len(finais) < ilhas:
+            try:
+                i, gen, *dados = saida.get(timeout=1.0)
+            except queue.Empty:
+                falhas = [p.exitcode for p in procs if p.exitcode not in (None, 0)]
+                if falhas:
+                    raise RuntimeError(f"uma ilha terminou com erro (exitcode={falhas[0]})")
+                continue
+            if gen is None:
+                finais[i] = dados[0]
+                continue
+            por_geracao.setdefault(gen, {})[i] = dados
+            # grava as gerações completas, em ordem
+            while len(por_geracao.get(proxima, ())) == ilhas:
+                linha = por_geracao.pop(proxima)
+                melhores = [linha[k][0][1] for k in range(ilhas)]
+                k_best = max(range(ilhas), key=lambda k: melhores[k])
+                best, _, desvio_best, _, _ = linha[k_best]
+                media = sum(linha[k][1] for k in range(ilhas)) / ilhas
+                desvio_medio = sum(linha[k][3] for k in range(ilhas)) / ilhas
+                n_aval = sum(linha[k][4] for k in range(ilhas))
+                log_w.writerow([proxima, best[1], media, desvio_best, desvio_medio, n_aval] + melhores)
+                print(f"[GERAÇÃO {proxima:02d}] melhor={best[1]:.2f}±{desvio_best:.2f} (ilha {k_best}) "
+                      f"média={media:.2f} avaliações={n_aval} genes={descrever(best[0])}")
+                proxima += 1
+    finally:
+        log.close()
+        for p in procs:
+            if p.is_alive() and len(finais) < ilhas:
+                p.terminate()
+            p.join()
+
+    melhor_global = max((finais[i] for i in range(ilhas) if finais[i] is not None),
+                        key=lambda b: b[1], default=None)
     if melhor_global:
         genes, fit = melhor_global
-        with open(ARQ_MELHOR, "w", encoding="utf-8") as f:
-            json.dump({
-                "alcance_repulsao": genes["alcance_repulsao"],
-                "peso_repulsao": genes["peso_repulsao"],
-                "vel_jogador": genes["vel_jogador"]
-            }, f, ensure_ascii=False, indent=2)
-        print(f"[SALVO] {ARQ_MELHOR} | melhor_fitness={fit:.2f} | genes={genes}")
-
-    pygame.quit()
+        salvar_melhor(melhor_global, arq_melhor)
+        print(f"[SALVO] {arq_melhor} | melhor_fitness={fit:.2f} | genes={descrever(genes)}")
 
-    # Gráfico pós-treino (estático ou animado)
+    if not plotar:
+        return melhor_global
     if animate:
         _plotar_animado(csv_path=log_csv, smooth=smooth, interval_ms=220)
     else:
         _plotar_estatico(csv_path=log_csv, smooth=smooth)
+    return melhor_global
+
+# ----------------- Avaliações até o alvo / comparação de otimizadores -----------------
+def avaliacoes_ate_alvo(csv_path, alvo):
+    """
+    (geração, avaliações acumuladas) em que `melhor_fitness` chegou a `alvo`
+    pela primeira vez no log; (None, total de avaliações) se não chegou.
+    """
+    total = 0
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            total += int(row["avaliacoes"])
+            if float(row["melhor_fitness"]) >= alvo:
+                return int(row["geracao"]), total
+    return None, total
+
+def comparar_otimizadores(alvo, seeds=(42, 43, 44), otimizadores=OTIMIZADORES, **kw_evoluir):
+    """Roda cada otimizador com cada seed e resume as avaliações necessárias para o alvo."""
+    resumo = {}
+    with tempfile.TemporaryDirectory() as d:
+        for nome in otimizadores:
+            resumo[nome] = []
+            for sd in seeds:
+                log = os.path.join(d, f"{nome}_{sd}.csv")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    melhor = evoluir(seed=sd, otimizador=nome, log_csv=log, plotar=False,
+                                     arq_melhor=os.path.join(d, "melhor.json"),
+                                     arq_checkpoint=os.path.join(d, "checkpoint.json"), **kw_evoluir)
+                ger, n_aval = avaliacoes_ate_alvo(log, alvo)
+                resumo[nome].append((ger, n_aval, melhor[1] if melhor else float("nan")))
+                status = f"geração {ger}, {n_aval} avaliações" if ger is not None else f"não atingiu ({n_aval} avaliações)"
+                print(f"[ALVO] {nome:<6} seed={sd}: {status} | melhor={resumo[nome][-1][2]:.2f}")
+
+    print(f"\n{'otimizador':<11}{'atingiu':>9}{'aval. até alvo (mediana)':>27}{'melhor médio':>15}")
+    for nome, runs in resumo.items():
+        ate = sorted(n for g, n, _ in runs if g is not None)
+        mediana = f"{ate[len(ate) // 2]}" if ate else "-"
+        melhor_medio = sum(m for _, _, m in runs) / len(runs)
+        print(f"{nome:<11}{len(ate):>5}/{len(runs):<3}{mediana:>27}{melhor_medio:>15.2f}")
+    return resumo
 
 # ----------------- CLI -----------------
 if __name__ == "__main__":
@@ -400,14 +926,98 @@ if __name__ == "__main__":
     parser.add_argument("--geracoes", type=int, default=15, help="Número de gerações")
     parser.add_argument("--pop", type=int, default=40, help="Tamanho da população")
     parser.add_argument("--seed", type=int, default=42, help="Seed para reprodutibilidade")
+    parser.add_argument("--elitismo", type=float, default=ELITISMO_FRAC, help="Fração da população mantida como elite")
+    parser.add_argument("--taxa-mutacao", type=float, default=TAXA_MUTACAO, help="Probabilidade de mutar cada gene")
+    parser.add_argument("--sigma-mutacao", type=float, default=SIGMA_MUTACAO,
+                        help="Desvio da mutação, relativo à faixa do gene")
     parser.add_argument("--smooth", type=int, default=0, help="Janela da média móvel (0 = sem suavizar)")
     parser.add_argument("--animate", action="store_true", help="Mostra animação da evolução ao invés de gráfico estático")
+    parser.add_argument("--live", action="store_true", help="Gráfico ao vivo durante o treino (processo separado)")
+    parser.add_argument("--vetorizado", action="store_true", help="Avalia a população inteira em lockstep com NumPy")
+    parser.add_argument("--workers", type=int, default=1, help="Processos para avaliar o fitness em paralelo (1 = serial)")
+    parser.add_argument("--seeds", type=int, default=1, help="Seeds por avaliação (comuns a todos os cromossomos)")
+    parser.add_argument("--cache", nargs="?", const="fitness_cache.sqlite3", default=None,
+                        help="Memoiza o fitness em memória e no SQLite indicado (padrão: fitness_cache.sqlite3)")
+    parser.add_argument("--corrida", action="store_true", help="Interrompe candidatos estatisticamente piores que o corte da elite")
+    parser.add_argument("--resume", action="store_true", help="Continua o treino a partir do checkpoint")
+    parser.add_argument("--checkpoint", type=str, default=ARQ_CHECKPOINT, help="Arquivo de checkpoint do treino")
+    parser.add_argument("--checkpoint-cada", type=int, default=10, help="Gerações entre checkpoints (0 = só no fim)")
+    parser.add_argument("--otimizador", choices=OTIMIZADORES, default="ag",
+                        help="Estratégia de busca: ag (genético) ou cmaes (CMA-ES, requer NumPy)")
+    parser.add_argument("--agente", choices=AGENTES, default="parametrico",
+                        help="parametrico (3 genes) ou neural (pesos de uma MLP, requer NumPy)")
+    parser.add_argument("--alvo", type=float, default=None, help="Fitness alvo: informa quantas avaliações foram necessárias")
+    parser.add_argument("--comparar-otimizadores", type=int, default=0, metavar="N",
+                        help="Roda AG e CMA-ES com N seeds e compara as avaliações até --alvo")
+    parser.add_argument("--gravar-replays", type=str, default=None, metavar="DIR",
+                        help="Grava o replay (.bcr) do melhor de cada geração neste diretório")
+    parser.add_argument("--ilhas", type=int, default=1, help="Subpopulações em processos separados (1 = população única)")
+    parser.add_argument("--migracao-intervalo", type=int, default=5, help="Gerações entre migrações (modo ilhas)")
+    parser.add_argument("--migrantes", type=int, default=2, help="Melhores enviados por ilha a cada migração")
+    parser.add_argument("--topologia", choices=TOPOLOGIAS, default="anel", help="Para onde os migrantes vão")
+    parser.add_argument("--startup-timing", action="store_true",
+                        help="Mostra o tempo de importações, preparação e 1ª geração")
     args = parser.parse_args()
 
+    if args.agente == "neural" and (args.otimizador == "cmaes" or args.comparar_otimizadores):
+        parser.error("o agente neural é evoluído só pelo AG (--otimizador ag)")
+    if args.comparar_otimizadores:
+        if args.alvo is None:
+            parser.error("--comparar-otimizadores requer --alvo")
+        comparar_otimizadores(args.alvo, seeds=[args.seed + i for i in range(args.comparar_otimizadores)],
+                              geracoes=args.geracoes, pop_size=args.pop, vetorizado=args.vetorizado,
+                              workers=args.workers, seeds_por_avaliacao=args.seeds, corrida=args.corrida,
+                              elitismo_frac=args.elitismo, taxa_mutacao=args.taxa_mutacao,
+                              sigma_mutacao=args.sigma_mutacao)
+        raise SystemExit
+
+    if args.ilhas > 1:
+        if args.migracao_intervalo < 1:
+            parser.error("--migracao-intervalo deve ser >= 1 (use --migrantes 0 para ilhas sem migração)")
+        if args.resume or args.cache or args.live or args.workers > 1 or args.startup_timing:
+            print("[AVISO] --resume/--cache/--live/--workers/--startup-timing não se aplicam ao modo ilhas "
+                  "(cada ilha é um processo).")
+        evoluir_ilhas(
+            ilhas=args.ilhas,
+            geracoes=args.geracoes,
+            pop_size=args.pop,
+            seed=args.seed,
+            smooth=args.smooth,
+            animate=args.animate,
+            vetorizado=args.vetorizado,
+            seeds_por_avaliacao=args.seeds,
+            corrida=args.corrida,
+            intervalo_migracao=args.migracao_intervalo,
+            migrantes=args.migrantes,
+            topologia=args.topologia,
+            agente=args.agente,
+            elitismo_frac=args.elitismo,
+            taxa_mutacao=args.taxa_mutacao,
+            sigma_mutacao=args.sigma_mutacao
+        )
+        raise SystemExit
+
     evoluir(
         geracoes=args.geracoes,
         pop_size=args.pop,
         seed=args.seed,
         smooth=args.smooth,
-        animate=args.animate
+        animate=args.animate,
+        vetorizado=args.vetorizado,
+        workers=args.workers,
+        seeds_por_avaliacao=args.seeds,
+        corrida=args.corrida,
+        arq_cache=args.cache,
+        arq_checkpoint=args.checkpoint,
+        checkpoint_cada=args.checkpoint_cada,
+        retomar=args.resume,
+        ao_vivo=args.live,
+        otimizador=args.otimizador,
+        alvo=args.alvo,
+        dir_replays=args.gravar_replays,
+        agente=args.agente,
+        startup_timing=args.startup_timing,
+        elitismo_frac=args.elitismo,
+        taxa_mutacao=args.taxa_mutacao,
+        sigma_mutacao=args.sigma_mutacao
     )
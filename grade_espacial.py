@@ -0,0 +1,128 @@
+# grade_espacial.py
+"""
+Índice espacial por grade uniforme (spatial hash).
+
+Cada entidade é registrada em todas as células que seu retângulo toca e só é
+re-registrada quando muda de células (atualização incremental). Consultas por
+região e "mais próximo" olham apenas as células vizinhas, então o custo não
+cresce com o total de entidades na arena.
+"""
+import math
+
+class GradeEspacial:
+    __slots__ = ("celula", "cols", "lins", "celulas", "faixas")
+
+    def __init__(self, largura, altura, celula):
+        self.celula = float(celula)
+        self.cols = max(1, int(math.ceil(largura / celula)))
+        self.lins = max(1, int(math.ceil(altura / celula)))
+        self.celulas = {}   # lin * cols + col -> set de índices
+        self.faixas = {}    # índice -> (col0, lin0, col1, lin1)
+
+    def __len__(self):
+        return len(self.faixas)
+
+    def _faixa(self, x0, y0, x1, y1):
+        cel = self.celula
+        cm, lm = self.cols - 1, self.lins - 1
+        c0 = int(x0 // cel)
+        l0 = int(y0 // cel)
+        c1 = int(x1 // cel)
+        l1 = int(y1 // cel)
+        c0 = 0 if c0 < 0 else (cm if c0 > cm else c0)
+        c1 = 0 if c1 < 0 else (cm if c1 > cm else c1)
+        l0 = 0 if l0 < 0 else (lm if l0 > lm else l0)
+        l1 = 0 if l1 < 0 else (lm if l1 > lm else l1)
+        return c0, l0, c1, l1
+
+    def _por(self, i, faixa):
+        c0, l0, c1, l1 = faixa
+        celulas = self.celulas
+        for lin in range(l0, l1 + 1):
+            base = lin * self.cols
+            for col in range(c0, c1 + 1):
+                s = celulas.get(base + col)
+                if s is None:
+                    celulas[base + col] = {i}
+                else:
+                    s.add(i)
+        self.faixas[i] = faixa
+
+    def _tirar(self, i, faixa):
+        c0, l0, c1, l1 = faixa
+        celulas = self.celulas
+        for lin in range(l0, l1 + 1):
+            base = lin * self.cols
+            for col in range(c0, c1 + 1):
+                s = celulas[base + col]
+                s.discard(i)
+                if not s:
+                    del celulas[base + col]
+
+    def inserir(self, i, x0, y0, x1, y1):
+        """Registra a entidade `i` com retângulo [x0, x1] x [y0, y1]."""
+        self._por(i, self._faixa(x0, y0, x1, y1))
+
+    def mover(self, i, x0, y0, x1, y1):
+        """Atualiza a posição de `i`; não faz nada se continuar nas mesmas células."""
+        faixa = self._faixa(x0, y0, x1, y1)
+        antiga = self.faixas.get(i)
+        if faixa == antiga:
+            return
+        if antiga is not None:
+            self._tirar(i, antiga)
+        self._por(i, faixa)
+
+    def remover(self, i):
+        antiga = self.faixas.pop(i, None)
+        if antiga is not None:
+            self._tirar(i, antiga)
+
+    def consultar(self, x0, y0, x1, y1):
+        """Índices (ordenados) das entidades cujas células tocam a região."""
+        c0, l0, c1, l1 = self._faixa(x0, y0, x1, y1)
+        celulas = self.celulas
+        if c0 == c1 and l0 == l1:
+            s = celulas.get(l0 * self.cols + c0)
+            return sorted(s) if s else []
+        achados = set()
+        for lin in range(l0, l1 + 1):
+            base = lin * self.cols
+            for col in range(c0, c1 + 1):
+                s = celulas.get(base + col)
+                if s:
+                    achados.update(s)
+        return sorted(achados)
+
+    def mais_proximo(self, px, py, xs, ys, desloc=0.0):
+        """
+        Índice do ponto (xs[k] + desloc, ys[k] + desloc) mais próximo de (px, py),
+        ou -1 se a grade estiver vazia. Empates ficam com o menor índice, como
+        numa varredura linear.
+        """
+        if not self.faixas:
+            return -1
+        hypot = math.hypot
+        celulas = self.celulas
+        cols, lins = self.cols, self.lins
+        cc, lc, _, _ = self._faixa(px, py, px, py)
+        melhor, dmin = -1, 0.0
+        for r in range(max(cols, lins) + 1):
+            c0, c1, l0, l1 = cc - r, cc + r, lc - r, lc + r
+            for lin in range(max(l0, 0), min(l1, lins - 1) + 1):
+                borda = lin == l0 or lin == l1
+                passo = 1 if borda else (c1 - c0 if r > 0 else 1)
+                for col in range(c0, c1 + 1, passo):
+                    if col < 0 or col >= cols:
+                        continue
+                    s = celulas.get(lin * cols + col)
+                    if not s:
+                        continue
+                    for k in s:
+                        d = hypot(px - (xs[k] + desloc), py - (ys[k] + desloc))
+                        if melhor < 0 or d < dmin or (d == dmin and k < melhor):
+                            melhor, dmin = k, d
+            # células do próximo anel ficam a pelo menos r * celula de distância
+            if melhor >= 0 and dmin < r * self.celula:
+                break
+        return melhor
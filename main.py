@@ -1,19 +1,30 @@
+from time import perf_counter
+_T_INICIO = perf_counter()   # referência do --startup-timing (antes dos imports)
+
 import pygame
-import random
 import sys
 import os
 import math
 import argparse
-import csv
+import random
+import statistics
 from datetime import datetime
 
-from agente import carregar_melhor_agente  # usa melhor_agente.json quando --play-best
+import cache_assets
+import simulacao as sim  # física compartilhada com o treino (passo fixo)
+from placar import EscritorPlacar, ARQ_PLACAR
+from simulacao import (
+    LARGURA, ALTURA, JOGADOR_W, JOGADOR_H, RAIO_MOEDA, OBS_W, OBS_H,
+    TEMPO_MAX_SEG, VEL_JOGADOR_BASE,
+)
+
+_T_IMPORTADO = perf_counter()
 
 # =============================
 # CONFIGURAÇÕES
 # =============================
-LARGURA, ALTURA = 800, 600
-FPS = 60
+FPS = 60                # FPS de renderização (a física roda a sim.SIM_HZ)
+MAX_PASSOS_POR_FRAME = 8  # evita "espiral da morte" se um frame demorar muito
 
 # Cores (fallback quando não houver sprites)
 BG_COR = (18, 22, 28)
@@ -23,32 +34,23 @@ MOEDA_COR = (255, 215, 0)
 OBS_COR = (255, 80, 80)
 SOMBRA = (0, 0, 0)
 
-# Jogador
-JOGADOR_W, JOGADOR_H = 48, 48
-VEL_JOGADOR_BASE = 6.0  # pode ser sobrescrito quando --play-best (pelo JSON)
+# Jogador: VEL_JOGADOR_BASE pode ser sobrescrito quando --play-best (pelo JSON)
 
 # Moedas (retângulo de colisão continua igual; só aumentamos o desenho)
-RAIO_MOEDA = 10                  # colisão
-QTD_MOEDAS = 7
 COIN_BASE_SIZE = 25              # tamanho base da sprite carregada
 COIN_ROT_SPEED = 180.0           # graus/seg
 COIN_PULSE_SPEED = 4.0           # Hz ~ “batimento”
 COIN_PULSE_MIN_SCALE = 1.25      # escala base maior (moeda “aumentada”)
 COIN_PULSE_AMP = 0.12            # amplitude do pulso (+-)
+COIN_ATLAS_ANGULOS = 48          # quadros de rotação pré-calculados (7,5° cada)
+COIN_ATLAS_PULSOS = 12           # quadros por ciclo do pulso
 
-# Obstáculos
-OBS_W, OBS_H = 80, 40
-QTD_OBS_INICIAL = 4
-VEL_OBS_BASE = 4
-QTD_OBS_MAX = 10
-
-# Tempo
-TEMPO_MAX_SEG = 60
-
-# Persistência
-ARQUIVO_SCORE = "score.txt"
-ARQUIVO_CSV = "placar.csv"   # placar por partida
+# Persistência (placar.csv/score.txt antigos são importados uma vez pelo Placar)
+TOP_GAMEOVER = 5   # linhas do placar na tela de fim de jogo
 ARQ_MELHOR = "melhor_agente.json"  # usado para ajustar vel_jogador no modo play-best
+ARQ_PERFIL = "perfil_frames.csv"   # amostras por frame do --profile
+PARTIDAS_SEM_RENDER = 20           # partidas do --no-render quando --partidas não é dado
+ORCAMENTO_TURBO_S = 1.0 / 30       # --turbo sem N: um frame desenhado a cada 1/30 s de relógio
 
 # Caminhos de assets (opcionais)
 ASSETS_DIR = "assets"
@@ -63,87 +65,128 @@ ESTADO_JOGANDO = "jogando"
 ESTADO_PAUSA = "pausa"
 ESTADO_GAMEOVER = "gameover"
 
-# =============================
-# CSV / Placar
-# =============================
-def init_csv(caminho=ARQUIVO_CSV):
-    if not os.path.exists(caminho):
-        with open(caminho, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["nome", "pontos", "data_hora"])
-
-def registrar_placar(nome, pontos, caminho=ARQUIVO_CSV):
-    init_csv(caminho)
-    agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(caminho, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow([nome, int(pontos), agora])
-    print(f"[PLACAR] nome={nome} pontos={pontos} data_hora={agora}")
-
 # =============================
 # HELPERS
 # =============================
+_FONTES = {}   # (tam, negrito) -> Font
+_TEXTOS = {}   # (tam, cor, x, y, centro) -> (txt, Surface, Rect)
+
 def fonte(tam, negrito=True):
-    return pygame.font.SysFont(None, tam, bold=negrito)
+    # SysFont é caro (procura a fonte no sistema): cria uma vez por tamanho
+    chave = (tam, negrito)
+    f = _FONTES.get(chave)
+    if f is None:
+        f = _FONTES[chave] = pygame.font.SysFont(None, tam, bold=negrito)
+    return f
 
 def desenhar_texto(surface, txt, tam, cor, x, y, centro=False):
-    f = fonte(tam)
-    img = f.render(txt, True, cor)
-    r = img.get_rect()
-    if centro:
-        r.center = (x, y)
-    else:
-        r.topleft = (x, y)
-    surface.blit(img, r)
+    # cada "slot" de texto reaproveita a superfície até o texto mudar
+    chave = (tam, cor, x, y, centro)
+    cache = _TEXTOS.get(chave)
+    if cache is None or cache[0] != txt:
+        img = fonte(tam).render(txt, True, cor)
+        r = img.get_rect()
+        if centro:
+            r.center = (x, y)
+        else:
+            r.topleft = (x, y)
+        cache = _TEXTOS[chave] = (txt, img, r)
+    return surface.blit(cache[1], cache[2])
 
 def sombra_texto(surface, txt, tam, x, y, cor=HUD, dx=2, dy=2, centro=False):
-    desenhar_texto(surface, txt, tam, SOMBRA, x+dx, y+dy, centro)
-    desenhar_texto(surface, txt, tam, cor, x, y, centro)
-
-def criar_moedas():
-    moedas = []
-    for _ in range(QTD_MOEDAS):
-        x = random.randint(RAIO_MOEDA + 10, LARGURA - RAIO_MOEDA - 10) - RAIO_MOEDA
-        y = random.randint(RAIO_MOEDA + 10, ALTURA - RAIO_MOEDA - 10) - RAIO_MOEDA
-        moedas.append(pygame.Rect(x, y, RAIO_MOEDA*2, RAIO_MOEDA*2))
-    return moedas
-
-def criar_obstaculos(qtd, vel_base):
-    obs = []
-    for i in range(qtd):
-        x = random.randint(0, LARGURA - OBS_W)
-        y = random.randint(60, ALTURA - 60)
-        rect = pygame.Rect(x, y, OBS_W, OBS_H)
-        velx = vel_base if i % 2 == 0 else -vel_base
-        obs.append({"rect": rect, "velx": velx})
-    return obs
+    r = desenhar_texto(surface, txt, tam, SOMBRA, x+dx, y+dy, centro)
+    return r.union(desenhar_texto(surface, txt, tam, cor, x, y, centro))
+
+def restaurar_fundo(surface, bg_img, rect):
+    """Repinta só a região `rect` com o fundo (modo dirty-rects)."""
+    if bg_img:
+        surface.blit(bg_img, rect, rect)
+    else:
+        surface.fill(BG_COR, rect)
+
+def criar_atlas_moeda(coin_base_img, n_angulos=COIN_ATLAS_ANGULOS, n_pulsos=COIN_ATLAS_PULSOS):
+    """
+    Pré-calcula os quadros da moeda: atlas[i_pulso][i_angulo] = (Surface, meio_w, meio_h).
+    Substitui o rotozoom por moeda a cada frame por uma consulta à tabela.
+    """
+    atlas = []
+    for ip in range(n_pulsos):
+        scale = COIN_PULSE_MIN_SCALE + COIN_PULSE_AMP * math.sin(2 * math.pi * ip / n_pulsos)
+        linha = []
+        for ia in range(n_angulos):
+            img = pygame.transform.rotozoom(coin_base_img, 360.0 * ia / n_angulos, scale)
+            linha.append((img, img.get_width() // 2, img.get_height() // 2))
+        atlas.append(linha)
+    return atlas
+
+def quadro_moeda(atlas, coin_angle, coin_pulse_t):
+    fase = (coin_pulse_t * COIN_PULSE_SPEED) / (2 * math.pi)
+    linha = atlas[int((fase % 1.0) * len(atlas)) % len(atlas)]
+    return linha[int(coin_angle / 360.0 * len(linha)) % len(linha)]
 
 def load_image(path, size=None):
+    # já redimensionada, do cache em .cache_assets/ (refeito se o PNG mudar)
     try:
         if not os.path.exists(path):
             return None
-        img = pygame.image.load(path).convert_alpha()
-        if size is not None:
-            img = pygame.transform.smoothscale(img, size)
-        return img
+        return cache_assets.carregar_imagem(path, size)
     except Exception:
         return None
 
-def carregar_recorde():
-    try:
-        if os.path.exists(ARQUIVO_SCORE):
-            with open(ARQUIVO_SCORE, "r", encoding="utf-8") as f:
-                return int(f.read().strip() or "0")
-    except Exception:
-        pass
-    return 0
-
-def salvar_recorde(valor):
+def carregar_atlas_moeda(path):
+    """criar_atlas_moeda da sprite da moeda, com os quadros vindos do cache de assets."""
+    if not os.path.exists(path):
+        return None
+    parametros = (f"atlas {COIN_BASE_SIZE} {COIN_ATLAS_ANGULOS}x{COIN_ATLAS_PULSOS} "
+                  f"{COIN_PULSE_MIN_SCALE} {COIN_PULSE_AMP}")
+    def construir():
+        base = load_image(path, (COIN_BASE_SIZE, COIN_BASE_SIZE))
+        return [img for linha in criar_atlas_moeda(base) for img, _, _ in linha]
     try:
-        with open(ARQUIVO_SCORE, "w", encoding="utf-8") as f:
-            f.write(str(int(valor)))
+        quadros = cache_assets.carregar_quadros(path, parametros, construir)
     except Exception:
-        pass
+        return None
+    n = COIN_ATLAS_ANGULOS
+    return [[(img, img.get_width() // 2, img.get_height() // 2) for img in quadros[i:i + n]]
+            for i in range(0, len(quadros), n)]
+
+def carregar_sprites(largura=LARGURA, altura=ALTURA):
+    """(fundo, jogador, atlas da moeda, obstáculo); None onde o asset faltar."""
+    return (load_image(PATH_BG, (largura, altura)),
+            load_image(PATH_PLAYER, (JOGADOR_W, JOGADOR_H)),
+            carregar_atlas_moeda(PATH_COIN),
+            load_image(PATH_OBS, (OBS_W, OBS_H)))
+
+def iniciar_pygame():
+    # só os subsistemas usados: pygame.init() também abriria áudio e joysticks
+    pygame.display.init()
+    pygame.font.init()
+
+def imprimir_startup(marcas):
+    """marcas: [(fase, perf_counter ao fim da fase)], a partir de _T_INICIO."""
+    partes, anterior = [], _T_INICIO
+    for fase, t in marcas:
+        partes.append(f"{fase}={1000 * (t - anterior):.1f} ms")
+        anterior = t
+    hits, misses = cache_assets.contadores()
+    print(f"[STARTUP] {' | '.join(partes)} | até o 1º frame={1000 * (anterior - _T_INICIO):.1f} ms "
+          f"(cache de assets: {hits} hits, {misses} misses)")
+
+def imprimir_resumo_turbo(partidas, segundos):
+    """partidas: [(pontos, coletas, colisões, segundos)] do modo --turbo."""
+    if not partidas:
+        return
+    pontos = [p[0] for p in partidas]
+    desvio = statistics.stdev(pontos) if len(pontos) > 1 else 0.0
+    print(f"[TURBO] {len(partidas)} partidas em {segundos:.1f} s ({60 * len(partidas) / segundos:.1f} partidas/min, "
+          f"{len(partidas) * TEMPO_MAX_SEG / segundos:.0f}x o tempo real) | pontos: média={statistics.fmean(pontos):.1f} "
+          f"desvio={desvio:.1f} min={min(pontos)} max={max(pontos)} | "
+          f"coletas/partida={statistics.fmean(p[1] for p in partidas):.1f} "
+          f"colisões/partida={statistics.fmean(p[2] for p in partidas):.1f}")
+
+def _carregar_agente():
+    from agente import carregar_melhor_agente  # só o --play-best precisa do agente
+    return carregar_melhor_agente()
 
 def _carregar_vel_playbest(default_vel):
     # Se existir JSON do melhor agente, use a velocidade evoluída
@@ -157,75 +200,123 @@ def _carregar_vel_playbest(default_vel):
         pass
     return default_vel
 
+def _novo_mundo(vel_jogador, dir_replay=None, agente=None):
+    """Mundo novo; com `dir_replay`, sorteia uma seed explícita e abre a gravação do replay."""
+    if not dir_replay:
+        return sim.novo_estado(vel_jogador=vel_jogador), None
+    from replay import EXTENSAO, ORIGEM_AGENTE, ORIGEM_MANUAL, GravadorReplay
+    seed = random.randrange(1 << 62)
+    mundo = sim.novo_estado(seed, vel_jogador=vel_jogador)
+    os.makedirs(dir_replay, exist_ok=True)
+    caminho = os.path.join(dir_replay, datetime.now().strftime("partida_%Y%m%d_%H%M%S_%f") + EXTENSAO)
+    if agente is not None:
+        gravador = GravadorReplay(caminho, seed, mundo, ORIGEM_AGENTE,
+                                  getattr(agente, "alc", math.nan), getattr(agente, "peso", math.nan))
+    else:
+        gravador = GravadorReplay(caminho, seed, mundo, ORIGEM_MANUAL)
+    print(f"[REPLAY] gravando {caminho}")
+    return mundo, gravador
+
 # =============================
 # JOGO
 # =============================
-def main(play_best=False, nome_jogador="Jogador"):
-    pygame.init()
+def main(play_best=False, nome_jogador="Jogador", dirty_rects=False, profile=False, arq_perfil=ARQ_PERFIL,
+         dir_replay=None, startup_timing=False, turbo=None, sem_render=False, partidas=None):
+    """
+    turbo: None = tempo real; N > 0 = simulação sem limite de FPS, desenhando a
+    cada N ticks; 0 = idem, desenhando a cada ORCAMENTO_TURBO_S de relógio.
+    sem_render: só a lógica (janela dummy, nada desenhado) e o resumo no console.
+    partidas: no turbo, encerra depois de tantas partidas (None = até fechar).
+    """
+    if sem_render:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        turbo = turbo or 0
+        partidas = partidas or PARTIDAS_SEM_RENDER
+    if turbo is not None:
+        play_best = True   # turbo é para assistir/triar o agente treinado
+    marcas = [("importações", _T_IMPORTADO)]   # fases até o 1º frame (--startup-timing)
+    iniciar_pygame()
     pygame.display.set_caption("Coleta & Desvio (AG)")
     tela = pygame.display.set_mode((LARGURA, ALTURA))
     clock = pygame.time.Clock()
+    marcas.append(("janela", perf_counter()))
 
-    bg_img = load_image(PATH_BG, (LARGURA, ALTURA))
-    player_img = load_image(PATH_PLAYER, (JOGADOR_W, JOGADOR_H))
-    # Carrega sprite base da moeda (vamos rotacionar e pulsar no desenho)
-    coin_base_img = load_image(PATH_COIN, (COIN_BASE_SIZE, COIN_BASE_SIZE))
-    obs_img = load_image(PATH_OBS, (OBS_W, OBS_H))
+    # sprites já redimensionadas e atlas da moeda (rotação + pulso) pelo cache
+    bg_img, player_img, coin_atlas, obs_img = carregar_sprites() if not sem_render else (None,) * 4
+    marcas.append(("assets", perf_counter()))
 
-    recorde = carregar_recorde()
+    # placar em SQLite, gravado por uma thread (ver placar.py): o loop só enfileira
+    # pedidos e lê as respostas (Future) quando ficam prontas
+    placar = EscritorPlacar(ARQ_PLACAR)
+    pedido_placar = placar.consultar()
+    recorde = 0
+    top_placar, posicao = [], None
+    erro_placar = None   # o último pedido falhou: o fim de jogo avisa em vez de esperar
+    marcas.append(("placar", perf_counter()))
 
     estado = ESTADO_JOGANDO if play_best else ESTADO_MENU
     pontuacao = 0
-    tempo = 0.0
 
-    jogador = pygame.Rect(LARGURA//2 - JOGADOR_W//2, ALTURA//2 - JOGADOR_H//2, JOGADOR_W, JOGADOR_H)
-    jx, jy = float(jogador.x), float(jogador.y)
     vel_jogador = VEL_JOGADOR_BASE
     if play_best:
         vel_jogador = _carregar_vel_playbest(vel_jogador)
 
-    moedas = criar_moedas()
-    vel_obs = VEL_OBS_BASE
-    obstaculos = criar_obstaculos(QTD_OBS_INICIAL, vel_obs)
+    # AGENTE (se play_best)
+    agente = _carregar_agente() if play_best else None
 
-    proximo_marco = 10
+    # no menu o mundo só aparece depois de ENTER/ESPAÇO: grava a partir daí
+    mundo, gravador = _novo_mundo(vel_jogador, dir_replay if play_best else None, agente)
+    acumulador = 0.0
+    marcas.append(("agente/mundo", perf_counter()))
 
     # --- animação de dano (flash) ---
     flash_t = 0.0
     FLASH_DUR = 0.15
+    flash_overlay = pygame.Surface((LARGURA, ALTURA)).convert()
+    flash_overlay.fill((255, 50, 50))
 
     # --- animação das moedas ---
     coin_angle = 0.0
     coin_pulse_t = 0.0
 
-    # AGENTE (se play_best)
-    agente = carregar_melhor_agente() if play_best else None
+    # --- dirty-rects: regiões desenhadas no frame anterior ---
+    sujos_anteriores = []
+    estado_desenhado = None
+    flash_desenhado = False
+
+    # --- profiler por fase (--profile; F3 mostra/esconde o overlay) ---
+    perf = None
+    overlay_perfil = []
+    if profile:
+        from perfil_frames import PerfilFrames
+        perf = PerfilFrames()
+    mostrar_perfil = profile
 
-    # CSV placar
-    init_csv()
+    # --- turbo: partidas seguidas, sem placar, com resumo no console ---
+    resultados_turbo = []
+    inicio_turbo = inicio_partida = perf_counter()
 
     rodando = True
     while rodando:
-        dt = clock.tick(FPS) / 1000.0
+        # turbo: sem limite só enquanto joga (pausa não gira a CPU à toa)
+        dt = clock.tick(0 if turbo is not None and estado == ESTADO_JOGANDO else FPS) / 1000.0
+        t0 = perf_counter()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 rodando = False
 
+            if perf and event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                mostrar_perfil = not mostrar_perfil
+
             if estado == ESTADO_MENU and event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_SPACE, pygame.K_RETURN):
                     estado = ESTADO_JOGANDO  # manual
                     pontuacao = 0
-                    tempo = 0.0
-                    proximo_marco = 10
-                    vel_obs = VEL_OBS_BASE
-                    jogador.topleft = (LARGURA//2 - JOGADOR_W//2, ALTURA//2 - JOGADOR_H//2)
-                    jx, jy = float(jogador.x), float(jogador.y)
-                    moedas = criar_moedas()
-                    obstaculos = criar_obstaculos(QTD_OBS_INICIAL, vel_obs)
                     agente = None
+                    mundo, gravador = _novo_mundo(VEL_JOGADOR_BASE, dir_replay)
+                    acumulador = 0.0
                     flash_t = 0.0
-                    vel_jogador = VEL_JOGADOR_BASE
                     # reset animação das moedas
                     coin_angle = 0.0
                     coin_pulse_t = 0.0
@@ -236,16 +327,11 @@ def main(play_best=False, nome_jogador="Jogador"):
                 if event.key == pygame.K_r:
                     estado = ESTADO_JOGANDO if play_best else ESTADO_MENU
                     pontuacao = 0
-                    tempo = 0.0
-                    proximo_marco = 10
-                    vel_obs = VEL_OBS_BASE
-                    jogador.topleft = (LARGURA//2 - JOGADOR_W//2, ALTURA//2 - JOGADOR_H//2)
-                    jx, jy = float(jogador.x), float(jogador.y)
-                    moedas = criar_moedas()
-                    obstaculos = criar_obstaculos(QTD_OBS_INICIAL, vel_obs)
-                    agente = carregar_melhor_agente() if play_best else None
-                    flash_t = 0.0
                     vel_jogador = _carregar_vel_playbest(VEL_JOGADOR_BASE) if play_best else VEL_JOGADOR_BASE
+                    agente = _carregar_agente() if play_best else None
+                    mundo, gravador = _novo_mundo(vel_jogador, dir_replay, agente)
+                    acumulador = 0.0
+                    flash_t = 0.0
                     # reset animação das moedas
                     coin_angle = 0.0
                     coin_pulse_t = 0.0
@@ -256,113 +342,178 @@ def main(play_best=False, nome_jogador="Jogador"):
                 estado = ESTADO_PAUSA
             elif estado == ESTADO_PAUSA and event.type == pygame.KEYDOWN and event.key == pygame.K_p:
                 estado = ESTADO_JOGANDO
+        if perf:
+            # em todos os estados: no menu/pausa/fim o laço de eventos não vira "física"
+            t1 = perf_counter()
+            perf.somar("eventos", t1 - t0)
+            t0 = t1
 
-        # ----------- LÓGICA -----------
+        # ----------- LÓGICA (passo fixo, desacoplado do FPS) -----------
         if estado == ESTADO_JOGANDO:
-            tempo += dt
-            if tempo >= TEMPO_MAX_SEG:
-                estado = ESTADO_GAMEOVER
-                if pontuacao > recorde:
-                    recorde = pontuacao
-                    salvar_recorde(recorde)
-                registrar_placar(nome_jogador, pontuacao)
-
-            if estado == ESTADO_JOGANDO:
-                if tempo >= proximo_marco:
-                    proximo_marco += 10
-                    vel_obs += 0.8
-                    for o in obstaculos:
-                        o["velx"] = (vel_obs if o["velx"] > 0 else -vel_obs)
-                    if len(obstaculos) < QTD_OBS_MAX:
-                        obstaculos += criar_obstaculos(1, vel_obs)
-
-                # movimento
-                if agente is not None:
-                    vx, vy = agente.decidir(jogador, moedas, [o["rect"] for o in obstaculos])
-                    if vx == 0.0 and vy == 0.0:
-                        vx = 1.0
-                    jx += vx * vel_jogador
-                    jy += vy * vel_jogador
+            acumulador = min(acumulador + dt, MAX_PASSOS_POR_FRAME * sim.DT)
+            passos_frame = 0
+            fim_orcamento = t0 + ORCAMENTO_TURBO_S
+
+            acao_manual = None
+            if agente is None:
+                teclas = pygame.key.get_pressed()
+                dx = dy = 0.0
+                if teclas[pygame.K_LEFT] or teclas[pygame.K_a]:   dx -= 1.0
+                if teclas[pygame.K_RIGHT] or teclas[pygame.K_d]:  dx += 1.0
+                if teclas[pygame.K_UP] or teclas[pygame.K_w]:     dy -= 1.0
+                if teclas[pygame.K_DOWN] or teclas[pygame.K_s]:   dy += 1.0
+                acao_manual = (dx, dy)
+            if perf:   # leitura do teclado também é entrada
+                t1 = perf_counter()
+                perf.somar("eventos", t1 - t0)
+                t0 = t1
+
+            while not mundo.fim:
+                if turbo is None:
+                    if acumulador < sim.DT:
+                        break
+                    acumulador -= sim.DT
+                elif passos_frame and (passos_frame >= turbo if turbo else perf_counter() >= fim_orcamento):
+                    break   # turbo: N ticks por frame desenhado (ou o orçamento de relógio)
+                passos_frame += 1
+                colisoes_antes = mundo.colisoes
+                acao = agente.acao(mundo) if agente is not None else acao_manual
+                if perf:
+                    t1 = perf_counter()
+                    perf.somar("decidir", t1 - t0)
+                    t0 = t1
+                reward = sim.step(mundo, acao)
+                pontuacao = max(0, pontuacao + reward)
+                if gravador is not None:
+                    gravador.registrar(mundo, pontuacao)  # a pontuação do HUD/placar
+                if perf:
+                    t1 = perf_counter()
+                    perf.somar("fisica", t1 - t0)
+                    t0 = t1
+                if mundo.colisoes > colisoes_antes:
+                    flash_t = FLASH_DUR
+
+            if mundo.fim:
+                if gravador is not None:
+                    gravador.fechar()
+                    gravador = None
+                if turbo is not None:
+                    # turbo: anota a partida (fora do placar) e começa outra na hora
+                    agora = perf_counter()
+                    resultados_turbo.append((pontuacao, mundo.coletas, mundo.colisoes, agora - inicio_partida))
+                    print(f"[TURBO] partida {len(resultados_turbo)} | pontos={pontuacao} coletas={mundo.coletas} "
+                          f"colisões={mundo.colisoes} | {agora - inicio_partida:.2f} s")
+                    recorde = max(recorde, pontuacao)
+                    if partidas and len(resultados_turbo) >= partidas:
+                        rodando = False
+                    else:
+                        pontuacao = 0
+                        mundo, gravador = _novo_mundo(vel_jogador, dir_replay, agente)
+                        flash_t = 0.0
+                        inicio_partida = agora
                 else:
-                    teclas = pygame.key.get_pressed()
-                    dx = dy = 0.0
-                    if teclas[pygame.K_LEFT] or teclas[pygame.K_a]:   dx -= vel_jogador
-                    if teclas[pygame.K_RIGHT] or teclas[pygame.K_d]:  dx += vel_jogador
-                    if teclas[pygame.K_UP] or teclas[pygame.K_w]:     dy -= vel_jogador
-                    if teclas[pygame.K_DOWN] or teclas[pygame.K_s]:   dy += vel_jogador
-                    jx += dx
-                    jy += dy
-
-                jx = max(0.0, min(LARGURA - JOGADOR_W, jx))
-                jy = max(0.0, min(ALTURA - JOGADOR_H, jy))
-                jogador.x = int(round(jx))
-                jogador.y = int(round(jy))
-
-                for o in obstaculos:
-                    o["rect"].x += o["velx"]
-                    if o["rect"].left <= 0 or o["rect"].right >= LARGURA:
-                        o["velx"] *= -1
-
-                # colisões
-                for o in obstaculos:
-                    if jogador.colliderect(o["rect"]):
-                        pontuacao = max(0, pontuacao - 2)
-                        flash_t = FLASH_DUR
-
-                for m in moedas:
-                    if jogador.colliderect(m):
-                        pontuacao += 1
-                        m.x = random.randint(RAIO_MOEDA + 10, LARGURA - RAIO_MOEDA - 10) - RAIO_MOEDA
-                        m.y = random.randint(RAIO_MOEDA + 10, ALTURA - RAIO_MOEDA - 10) - RAIO_MOEDA
-
-                if flash_t > 0.0:
-                    flash_t = max(0.0, flash_t - dt)
-
-                # animação das moedas
-                coin_angle = (coin_angle + COIN_ROT_SPEED * dt) % 360.0
-                coin_pulse_t += dt
+                    estado = ESTADO_GAMEOVER
+                    recorde = max(recorde, pontuacao)
+                    pedido_placar = placar.registrar(nome_jogador, pontuacao,
+                                                     origem="agente" if play_best else "manual",
+                                                     top_n=TOP_GAMEOVER)
+                    top_placar, posicao, erro_placar = [], None, None
+
+            if flash_t > 0.0:
+                flash_t = max(0.0, flash_t - dt)
+
+            # animação das moedas
+            coin_angle = (coin_angle + COIN_ROT_SPEED * dt) % 360.0
+            coin_pulse_t += dt
+        if perf:
+            # resto da lógica do frame (fim de jogo, animações) conta como física
+            t1 = perf_counter()
+            perf.somar("fisica", t1 - t0)
+            t0 = t1
+
+        # resposta da thread do placar: só olha se o Future terminou, nunca espera
+        if pedido_placar is not None and pedido_placar.done():
+            erro = pedido_placar.exception()
+            if erro is None:
+                top, pos, rec = pedido_placar.result()
+                recorde = max(recorde, rec)
+                if pos is not None:
+                    top_placar, posicao = top, pos
+            else:
+                print(f"[AVISO] placar indisponível ({erro!r}); a partida não foi salva")
+                erro_placar = erro
+            pedido_placar = None
+
+        if sem_render:
+            if perf:
+                perf.fechar_frame(dt)   # sem fases de desenho, mas o frame entra no CSV
+            continue   # --no-render: só a lógica do jogo, nada é desenhado
 
         # ----------- DESENHO -----------
-        if bg_img:
+        # No modo dirty-rects, fora das transições de estado e do flash, só as
+        # regiões ocupadas no frame anterior voltam ao fundo; o resto da tela
+        # já é fundo puro. Só essas regiões + as novas são enviadas ao display.
+        parcial = (dirty_rects and estado == ESTADO_JOGANDO and estado_desenhado == ESTADO_JOGANDO
+                   and flash_t == 0.0 and not flash_desenhado)
+        if parcial:
+            for r in sujos_anteriores:
+                restaurar_fundo(tela, bg_img, r)
+        elif bg_img:
             tela.blit(bg_img, (0, 0))
         else:
             tela.fill(BG_COR)
+        sujos = []
+        if perf:
+            t1 = perf_counter()
+            perf.somar("fundo", t1 - t0)
+            t0 = t1
 
         if estado in (ESTADO_JOGANDO, ESTADO_PAUSA, ESTADO_GAMEOVER):
+            mxs, mys = mundo.moedas.x, mundo.moedas.y
+            oxs, oys = mundo.obstaculos.x, mundo.obstaculos.y
+
             # desenhar moedas com rotação + pulso, centralizando no rect da colisão
-            for m in moedas:
-                if coin_base_img:
-                    scale = COIN_PULSE_MIN_SCALE + COIN_PULSE_AMP * math.sin(coin_pulse_t * COIN_PULSE_SPEED)
-                    coin_scaled = pygame.transform.rotozoom(coin_base_img, coin_angle, scale)
-                    rect_img = coin_scaled.get_rect(center=(m.centerx, m.centery))
-                    tela.blit(coin_scaled, rect_img.topleft)
+            if coin_atlas:
+                # todas as moedas compartilham o mesmo quadro neste frame
+                coin_img, meio_w, meio_h = quadro_moeda(coin_atlas, coin_angle, coin_pulse_t)
+            for k in range(len(mxs)):
+                cx, cy = int(mxs[k]) + RAIO_MOEDA, int(mys[k]) + RAIO_MOEDA
+                if coin_atlas:
+                    sujos.append(tela.blit(coin_img, (cx - meio_w, cy - meio_h)))
                 else:
-                    pygame.draw.circle(tela, MOEDA_COR, (m.centerx, m.centery), int(RAIO_MOEDA * 1.4))
+                    sujos.append(pygame.draw.circle(tela, MOEDA_COR, (cx, cy), int(RAIO_MOEDA * 1.4)))
+            if perf:
+                t1 = perf_counter()
+                perf.somar("moedas", t1 - t0)
+                t0 = t1
 
-            for o in obstaculos:
+            for k in range(len(oxs)):
                 if obs_img:
-                    tela.blit(obs_img, (o["rect"].x, o["rect"].y))
+                    sujos.append(tela.blit(obs_img, (int(oxs[k]), int(oys[k]))))
                 else:
-                    pygame.draw.rect(tela, OBS_COR, o["rect"])
+                    sujos.append(pygame.draw.rect(tela, OBS_COR, (int(oxs[k]), int(oys[k]), OBS_W, OBS_H)))
 
+            jogador = pygame.Rect(int(mundo.jx), int(mundo.jy), JOGADOR_W, JOGADOR_H)
             if player_img:
-                tela.blit(player_img, (jogador.x, jogador.y))
+                sujos.append(tela.blit(player_img, jogador.topleft))
             else:
-                pygame.draw.rect(tela, JOGADOR_COR, jogador)
+                sujos.append(pygame.draw.rect(tela, JOGADOR_COR, jogador))
 
             if (estado == ESTADO_JOGANDO) and (flash_t > 0.0):
-                overlay = pygame.Surface((LARGURA, ALTURA), pygame.SRCALPHA)
-                alpha = int(180 * (flash_t / FLASH_DUR))
-                overlay.fill((255, 50, 50, alpha))
-                tela.blit(overlay, (0, 0))
-
-            tempo_rest = 0 if estado == ESTADO_GAMEOVER else max(0, int(TEMPO_MAX_SEG - tempo))
-            sombra_texto(tela, f"Pontos: {pontuacao}", 28, 12, 10)
-            sombra_texto(tela, f"Tempo: {tempo_rest}s", 28, 12, 42)
-            sombra_texto(tela, f"Recorde: {recorde}", 28, LARGURA-12-160, 10)
+                flash_overlay.set_alpha(int(180 * (flash_t / FLASH_DUR)))
+                tela.blit(flash_overlay, (0, 0))
+            if perf:
+                t1 = perf_counter()
+                perf.somar("entidades", t1 - t0)
+                t0 = t1
+
+            tempo_rest = 0 if estado == ESTADO_GAMEOVER else max(0, int(TEMPO_MAX_SEG - mundo.tempo))
+            sujos.append(sombra_texto(tela, f"Pontos: {pontuacao}", 28, 12, 10))
+            sujos.append(sombra_texto(tela, f"Tempo: {tempo_rest}s", 28, 12, 42))
+            sujos.append(sombra_texto(tela, f"Recorde: {recorde}", 28, LARGURA-12-160, 10))
 
             if play_best and estado != ESTADO_MENU:
-                desenhar_texto(tela, "AGENTE: ON (--play-best)", 20, (200, 230, 255), 12, 74)
+                sujos.append(desenhar_texto(tela, "AGENTE: ON (--play-best)", 20, (200, 230, 255), 12, 74))
 
         if estado == ESTADO_MENU:
             sombra_texto(tela, "COLETA & DESVIO (AG)", 72, LARGURA//2, ALTURA//2 - 80, centro=True)
@@ -371,27 +522,308 @@ def main(play_best=False, nome_jogador="Jogador"):
             desenhar_texto(tela, "Dica: rode 'genetico.py' para evoluir e depois use --play-best", 20, (180, 220, 255), LARGURA//2, ALTURA//2 + 80, centro=True)
 
         elif estado == ESTADO_GAMEOVER:
-            sombra_texto(tela, "FIM DE JOGO!", 64, LARGURA//2, ALTURA//2 - 60, centro=True)
-            desenhar_texto(tela, f"Pontuação: {pontuacao}", 30, HUD, LARGURA//2, ALTURA//2 - 10, centro=True)
-            desenhar_texto(tela, "R para reiniciar | ESC para sair", 24, HUD, LARGURA//2, ALTURA//2 + 70, centro=True)
-            desenhar_texto(tela, "Placar salvo em 'placar.csv'", 20, (180, 220, 255), LARGURA//2, ALTURA//2 + 110, centro=True)
+            sombra_texto(tela, "FIM DE JOGO!", 64, LARGURA//2, ALTURA//2 - 160, centro=True)
+            colocacao = f"  ({posicao}º no placar)" if posicao is not None else ""
+            desenhar_texto(tela, f"Pontuação: {pontuacao}{colocacao}", 30, HUD, LARGURA//2, ALTURA//2 - 110, centro=True)
+            desenhar_texto(tela, f"TOP {TOP_GAMEOVER}", 24, (180, 220, 255), LARGURA//2, ALTURA//2 - 70, centro=True)
+            for i, (nome_top, pontos_top, data_top) in enumerate(top_placar):
+                desenhar_texto(tela, f"{i + 1}. {nome_top[:16]}  {pontos_top}  {data_top[:10]}", 22, HUD,
+                               LARGURA//2, ALTURA//2 - 40 + 26 * i, centro=True)
+            desenhar_texto(tela, "R para reiniciar | ESC para sair", 24, HUD, LARGURA//2, ALTURA//2 + 110, centro=True)
+            if erro_placar is not None:
+                aviso, cor_aviso = "Placar indisponível: partida não salva (ver console)", (255, 150, 150)
+            elif posicao is not None:
+                aviso, cor_aviso = f"Placar salvo em '{ARQ_PLACAR}'", (180, 220, 255)
+            else:
+                aviso, cor_aviso = "Salvando placar...", (180, 220, 255)
+            desenhar_texto(tela, aviso, 20, cor_aviso, LARGURA//2, ALTURA//2 + 150, centro=True)
+
+        if perf and mostrar_perfil:
+            # percentis recalculados a cada 30 frames (o texto fica em cache entre eles)
+            if perf.frames % 30 == 0 or not overlay_perfil:
+                overlay_perfil = perf.linhas_overlay()
+            for i, linha in enumerate(overlay_perfil):
+                sujos.append(desenhar_texto(tela, linha, 18, (255, 255, 160), LARGURA - 250, 44 + 16 * i))
+        if perf:
+            t1 = perf_counter()
+            perf.somar("hud", t1 - t0)
+            t0 = t1
+
+        if parcial:
+            pygame.display.update(sujos_anteriores + sujos)
+        else:
+            pygame.display.flip()
+        if perf:
+            perf.somar("apresentar", perf_counter() - t0)
+            perf.fechar_frame(dt)
+        if marcas is not None:
+            marcas.append(("1º frame", perf_counter()))
+            if startup_timing:
+                imprimir_startup(marcas)
+            marcas = None
+        sujos_anteriores = sujos
+        estado_desenhado = estado
+        flash_desenhado = (estado == ESTADO_JOGANDO) and (flash_t > 0.0)
+
+    if gravador is not None:
+        gravador.fechar()  # partida interrompida: o replay fica com os ticks jogados
+    placar.fechar()   # grava o que ainda estiver na fila antes de sair
+    if turbo is not None:
+        imprimir_resumo_turbo(resultados_turbo, perf_counter() - inicio_turbo)
+    if perf:
+        perf.salvar_csv(arq_perfil)
+    pygame.quit()
+    sys.exit()
+
+# =============================
+# ARENA MULTIAGENTE
+# =============================
+def main_multi(arq_genomas=ARQ_MELHOR, n_agentes=None, seed=None):
+    """N agentes evoluídos na mesma arena (decisões em lote com NumPy)."""
+    from arena_multi import ArenaMulti, carregar_genomas
+
+    genomas = carregar_genomas(arq_genomas)
+    iniciar_pygame()
+    pygame.display.set_caption("Coleta & Desvio (AG) - Arena multiagente")
+    tela = pygame.display.set_mode((LARGURA, ALTURA))
+    clock = pygame.time.Clock()
+
+    bg_img, player_img, coin_atlas, obs_img = carregar_sprites()
+    # sprite avermelhada para quem colidiu no último passo
+    player_hit = None
+    if player_img:
+        player_hit = player_img.copy()
+        player_hit.fill(OBS_COR, special_flags=pygame.BLEND_RGB_MULT)
+
+    arena = ArenaMulti(genomas, n_agentes, seed)
+    print(f"[ARENA] {len(arena)} agentes | {len(genomas)} genoma(s) de '{arq_genomas}'")
+    acumulador = 0.0
+    coin_angle = 0.0
+    coin_pulse_t = 0.0
+    estado = ESTADO_JOGANDO
+    ranking = []
+
+    rodando = True
+    while rodando:
+        dt = clock.tick(FPS) / 1000.0
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                rodando = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    rodando = False
+                elif event.key == pygame.K_p and estado != ESTADO_GAMEOVER:
+                    estado = ESTADO_PAUSA if estado == ESTADO_JOGANDO else ESTADO_JOGANDO
+                elif event.key == pygame.K_r and estado == ESTADO_GAMEOVER:
+                    arena = ArenaMulti(genomas, n_agentes, seed)
+                    acumulador = 0.0
+                    estado = ESTADO_JOGANDO
+
+        if estado == ESTADO_JOGANDO:
+            acumulador = min(acumulador + dt, MAX_PASSOS_POR_FRAME * sim.DT)
+            while acumulador >= sim.DT and not arena.fim:
+                acumulador -= sim.DT
+                arena.step()
+            coin_angle = (coin_angle + COIN_ROT_SPEED * dt) % 360.0
+            coin_pulse_t += dt
+            if arena.fim:
+                estado = ESTADO_GAMEOVER
+                ranking = arena.ranking()
+                for pos, i in enumerate(ranking[:10], 1):
+                    print(f"[ARENA] {pos:2d}º agente #{i} pontos={arena.pontuacao[i]} "
+                          f"coletas={arena.coletas[i]} colisões={arena.colisoes[i]} genes={arena.genomas[i]}")
+
+        # ----------- DESENHO -----------
+        if bg_img:
+            tela.blit(bg_img, (0, 0))
+        else:
+            tela.fill(BG_COR)
+
+        if coin_atlas:
+            coin_img, meio_w, meio_h = quadro_moeda(coin_atlas, coin_angle, coin_pulse_t)
+        for x, y in zip(arena.mx, arena.my):
+            cx, cy = int(x) + RAIO_MOEDA, int(y) + RAIO_MOEDA
+            if coin_atlas:
+                tela.blit(coin_img, (cx - meio_w, cy - meio_h))
+            else:
+                pygame.draw.circle(tela, MOEDA_COR, (cx, cy), int(RAIO_MOEDA * 1.4))
+        for k in range(arena.n_obs):
+            if obs_img:
+                tela.blit(obs_img, (int(arena.ox[k]), int(arena.oy[k])))
+            else:
+                pygame.draw.rect(tela, OBS_COR, (int(arena.ox[k]), int(arena.oy[k]), OBS_W, OBS_H))
+
+        # todos os jogadores num único blits()
+        xs = arena.jx.astype(int).tolist()
+        ys = arena.jy.astype(int).tolist()
+        bateu = arena.bateu.tolist()
+        if player_img:
+            tela.blits([(player_hit if b else player_img, (x, y)) for x, y, b in zip(xs, ys, bateu)],
+                       doreturn=False)
+        else:
+            for x, y, b in zip(xs, ys, bateu):
+                pygame.draw.rect(tela, OBS_COR if b else JOGADOR_COR, (x, y, JOGADOR_W, JOGADOR_H))
+        lider = int(arena.pontuacao.argmax())
+        pygame.draw.rect(tela, MOEDA_COR, (xs[lider] - 3, ys[lider] - 3, JOGADOR_W + 6, JOGADOR_H + 6), 2)
+
+        tempo_rest = max(0, int(TEMPO_MAX_SEG - arena.tempo))
+        sombra_texto(tela, f"Agentes: {len(arena)}", 28, 12, 10)
+        sombra_texto(tela, f"Tempo: {tempo_rest}s", 28, 12, 42)
+        sombra_texto(tela, f"Líder: #{lider} ({arena.pontuacao[lider]} pts)", 24, LARGURA-12-240, 10)
+        sombra_texto(tela, f"Média: {arena.pontuacao.mean():.1f}", 24, LARGURA-12-240, 36)
+
+        if estado == ESTADO_PAUSA:
+            sombra_texto(tela, "PAUSA (P)", 48, LARGURA//2, ALTURA//2, centro=True)
+        elif estado == ESTADO_GAMEOVER:
+            sombra_texto(tela, "FIM DA ARENA!", 56, LARGURA//2, ALTURA//2 - 150, centro=True)
+            for pos, i in enumerate(ranking[:10], 1):
+                desenhar_texto(tela, f"{pos:2d}º  agente #{i}  {arena.pontuacao[i]} pts", 24, HUD,
+                               LARGURA//2, ALTURA//2 - 110 + 24 * pos, centro=True)
+            desenhar_texto(tela, "R para reiniciar | ESC para sair", 22, HUD,
+                           LARGURA//2, ALTURA//2 + 170, centro=True)
 
         pygame.display.flip()
 
     pygame.quit()
     sys.exit()
 
+# =============================
+# REPLAY
+# =============================
+def main_replay(caminho, velocidade=1.0):
+    """Reproduz um replay .bcr; ESPAÇO pausa, ←/→ saltam 5 s, +/- mudam a velocidade."""
+    from replay import LeitorReplay, NOMES_ORIGEM
+
+    leitor = LeitorReplay(caminho)
+    iniciar_pygame()
+    pygame.display.set_caption(f"Coleta & Desvio (AG) - Replay {os.path.basename(caminho)}")
+    largura, altura = leitor.largura, leitor.altura
+    tela = pygame.display.set_mode((largura, altura))
+    clock = pygame.time.Clock()
+
+    bg_img, player_img, coin_atlas, obs_img = carregar_sprites(largura, altura)
+    print(f"[REPLAY] {caminho} | {len(leitor)} ticks | origem={NOMES_ORIGEM.get(leitor.origem)} seed={leitor.seed}")
+
+    pos = 0.0          # tick atual (fracionário para velocidades arbitrárias)
+    pausado = False
+    coin_angle = 0.0
+    coin_pulse_t = 0.0
+    ultimo = max(0, len(leitor) - 1)
+
+    rodando = len(leitor) > 0
+    while rodando:
+        dt = clock.tick(FPS) / 1000.0
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                rodando = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    rodando = False
+                elif event.key == pygame.K_SPACE:
+                    pausado = not pausado
+                elif event.key == pygame.K_RIGHT:
+                    pos = min(ultimo, pos + 5 * sim.SIM_HZ)
+                elif event.key == pygame.K_LEFT:
+                    pos = max(0.0, pos - 5 * sim.SIM_HZ)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    velocidade = min(64.0, velocidade * 2)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    velocidade = max(0.125, velocidade / 2)
+
+        if not pausado:
+            pos = min(ultimo, pos + velocidade * dt * sim.SIM_HZ)
+            coin_angle = (coin_angle + COIN_ROT_SPEED * dt) % 360.0
+            coin_pulse_t += dt
+        q = leitor[int(pos)]  # acesso direto ao tick (mmap), sem re-simular
+
+        if bg_img:
+            tela.blit(bg_img, (0, 0))
+        else:
+            tela.fill(BG_COR)
+        if coin_atlas:
+            coin_img, meio_w, meio_h = quadro_moeda(coin_atlas, coin_angle, coin_pulse_t)
+        for x, y in q.moedas:
+            cx, cy = x + RAIO_MOEDA, y + RAIO_MOEDA
+            if coin_atlas:
+                tela.blit(coin_img, (cx - meio_w, cy - meio_h))
+            else:
+                pygame.draw.circle(tela, MOEDA_COR, (cx, cy), int(RAIO_MOEDA * 1.4))
+        for x, y, _ in q.obstaculos:
+            if obs_img:
+                tela.blit(obs_img, (x, y))
+            else:
+                pygame.draw.rect(tela, OBS_COR, (x, y, OBS_W, OBS_H))
+        jogador = (int(q.jx), int(q.jy))
+        if player_img:
+            tela.blit(player_img, jogador)
+        else:
+            pygame.draw.rect(tela, JOGADOR_COR, (*jogador, JOGADOR_W, JOGADOR_H))
+        if q.colisoes:
+            pygame.draw.rect(tela, OBS_COR, (jogador[0] - 3, jogador[1] - 3, JOGADOR_W + 6, JOGADOR_H + 6), 2)
+
+        sombra_texto(tela, f"Pontos: {q.pontuacao}", 28, 12, 10)
+        sombra_texto(tela, f"Tempo: {q.tempo:5.1f}s", 28, 12, 42)
+        estado_txt = "PAUSA" if pausado else ("FIM" if int(pos) == ultimo else f"{velocidade:g}x")
+        sombra_texto(tela, f"REPLAY {estado_txt}", 28, largura-12-200, 10)
+        desenhar_texto(tela, f"tick {q.tick}/{ultimo} | seed {leitor.seed}", 20, (200, 230, 255), largura-12-200, 42)
+        desenhar_texto(tela, "ESPAÇO pausa | ←/→ 5s | +/- velocidade | ESC sai", 20, HUD, 12, altura - 26)
+
+        pygame.display.flip()
+
+    leitor.fechar()
+    pygame.quit()
+    sys.exit()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--play-best", action="store_true",
                         help="Inicia o jogo com o agente treinado (pula o menu).")
     parser.add_argument("--nome", type=str, default="Jogador",
-                        help="Nome do jogador (usado no placar.csv)")
+                        help="Nome do jogador (usado no placar)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="Redesenha só as regiões que mudaram (útil em vídeo por software)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Mede cada fase do frame (overlay p50/p95/p99 com F3; CSV ao sair)")
+    parser.add_argument("--profile-csv", type=str, default=ARQ_PERFIL,
+                        help="Arquivo CSV com as amostras por frame do --profile")
+    parser.add_argument("--multi", type=int, default=0, metavar="N",
+                        help="Arena com N agentes evoluídos ao mesmo tempo (requer NumPy)")
+    parser.add_argument("--genomas", type=str, default=ARQ_MELHOR,
+                        help="JSON com os genomas do --multi (genoma, lista ou checkpoint do treino)")
+    parser.add_argument("--gravar-replay", type=str, default=None, metavar="DIR",
+                        help="Grava cada partida como replay binário (.bcr) neste diretório")
+    parser.add_argument("--replay", type=str, default=None, metavar="ARQ",
+                        help="Reproduz um replay .bcr")
+    parser.add_argument("--velocidade", type=float, default=1.0,
+                        help="Velocidade inicial do --replay (ex.: 4 = 4x)")
+    parser.add_argument("--startup-timing", action="store_true",
+                        help="Mostra o tempo de cada fase da abertura até o 1º frame")
+    parser.add_argument("--turbo", type=int, nargs="?", const=0, default=None, metavar="N",
+                        help="Agente sem limite de FPS, desenhando a cada N ticks "
+                             "(sem N: ~30 frames/s de relógio); partidas seguidas e resumo no console")
+    parser.add_argument("--no-render", action="store_true",
+                        help="Turbo sem desenhar nada (headless); só o resumo das partidas")
+    parser.add_argument("--partidas", type=int, default=None,
+                        help=f"Partidas do --turbo (padrão: até fechar; {PARTIDAS_SEM_RENDER} com --no-render)")
     args = parser.parse_args()
+    if args.turbo is not None and args.turbo < 0:
+        parser.error("--turbo N requer N >= 0")
+
+    if args.replay:
+        main_replay(args.replay, velocidade=args.velocidade)
+    if args.multi > 0:
+        main_multi(arq_genomas=args.genomas, n_agentes=args.multi)
 
-    if args.play_best:
+    if args.turbo is not None or args.no_render:
+        print("[INFO] Modo --turbo ATIVO (agente de melhor_agente.json, sem limite de FPS).")
+    elif args.play_best:
         print("[INFO] Modo --play-best ATIVO (usa melhor_agente.json).")
     else:
         print("[INFO] Modo manual. Dica: execute 'python genetico.py' para treinar o agente.")
 
-    main(play_best=args.play_best, nome_jogador=args.nome)
+    main(play_best=args.play_best, nome_jogador=args.nome, dirty_rects=args.dirty_rects,
+         profile=args.profile, arq_perfil=args.profile_csv, dir_replay=args.gravar_replay,
+         startup_timing=args.startup_timing, turbo=args.turbo, sem_render=args.no_render,
+         partidas=args.partidas)
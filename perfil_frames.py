@@ -0,0 +1,67 @@
+# perfil_frames.py
+"""
+Profiler por fase do laço de frames do main.py (--profile).
+
+Cada frame soma o tempo (perf_counter) gasto em cada fase; uma janela móvel
+fornece p50/p95/p99 para o overlay e todas as amostras ficam em buffers
+`array('d')` para exportar em CSV ao sair.
+"""
+import csv
+from array import array
+from collections import deque
+
+FASES = ("eventos", "decidir", "fisica", "fundo", "moedas", "entidades", "hud", "apresentar")
+
+def _percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    i = min(len(ordenados) - 1, int(round(p / 100.0 * (len(ordenados) - 1))))
+    return ordenados[i]
+
+class PerfilFrames:
+    def __init__(self, janela=300):
+        self.janela = janela
+        self.atual = dict.fromkeys(FASES, 0.0)
+        self.amostras = {f: array("d") for f in FASES}   # segundos, um valor por frame
+        self.dt = array("d")                               # intervalo entre frames (clock.tick)
+        self.recentes = {f: deque(maxlen=janela) for f in FASES + ("total",)}
+
+    @property
+    def frames(self):
+        return len(self.dt)
+
+    def somar(self, fase, segundos):
+        self.atual[fase] += segundos
+
+    def fechar_frame(self, dt):
+        total = 0.0
+        for f in FASES:
+            v = self.atual[f]
+            self.amostras[f].append(v)
+            self.recentes[f].append(v)
+            total += v
+            self.atual[f] = 0.0
+        self.recentes["total"].append(total)
+        self.dt.append(dt)
+
+    def percentis(self, fase):
+        """(p50, p95, p99) em ms na janela móvel."""
+        ordenados = sorted(self.recentes[fase])
+        return tuple(_percentil(ordenados, p) * 1000.0 for p in (50, 95, 99))
+
+    def linhas_overlay(self):
+        linhas = [f"{'fase':<11}{'p50':>7}{'p95':>7}{'p99':>7} ms"]
+        for f in FASES + ("total",):
+            p50, p95, p99 = self.percentis(f)
+            linhas.append(f"{f:<11}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+        return linhas
+
+    def salvar_csv(self, caminho):
+        with open(caminho, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["frame", "dt_ms", "trabalho_ms"] + [f"{fase}_ms" for fase in FASES])
+            for i in range(len(self.dt)):
+                valores = [self.amostras[fase][i] * 1000.0 for fase in FASES]
+                w.writerow([i, f"{self.dt[i] * 1000.0:.3f}", f"{sum(valores):.3f}"]
+                           + [f"{v:.3f}" for v in valores])
+        print(f"[PERFIL] {len(self.dt)} frames salvos em {caminho}")
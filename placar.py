@@ -0,0 +1,296 @@
+# placar.py
+"""
+Placar em SQLite (placar.sqlite3): uma linha por partida, com índices por
+pontos, por jogador (nome, pontos) e por data, para que "top 10", "top 10 do
+jogador X" e "melhor da semana" leiam só o começo de um índice em vez do
+arquivo inteiro.
+
+Vários processos (jogo, --play-best, scripts) podem gravar ao mesmo tempo: o
+banco usa WAL (leitores não bloqueiam o escritor) e espera o lock em vez de
+falhar. Na primeira abertura, o `placar.csv` e o `score.txt` antigos são
+importados uma única vez.
+
+O jogo grava pelo `EscritorPlacar`: o loop de frames só enfileira a partida
+(O(1)) e uma thread grava em lote, uma transação (e um fsync) por lote, e
+responde top-N/colocação por um Future.
+
+    python placar.py --top 10
+    python placar.py --top 10 --nome Matteo --dias 7
+"""
+import argparse
+import csv
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+ARQ_PLACAR = "placar.sqlite3"
+ARQ_CSV_ANTIGO = "placar.csv"
+ARQ_SCORE_ANTIGO = "score.txt"
+FORMATO_DATA = "%Y-%m-%d %H:%M:%S"   # ordena como texto
+LOTE_MAX = 256   # partidas por transação no EscritorPlacar
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    pontos INTEGER NOT NULL,
+    data_hora TEXT NOT NULL,
+    origem TEXT NOT NULL DEFAULT 'manual'
+);
+CREATE INDEX IF NOT EXISTS idx_partidas_pontos ON partidas (pontos DESC, data_hora);
+CREATE INDEX IF NOT EXISTS idx_partidas_nome ON partidas (nome, pontos DESC, data_hora);
+CREATE INDEX IF NOT EXISTS idx_partidas_data ON partidas (data_hora, pontos);
+CREATE TABLE IF NOT EXISTS importacoes (
+    arquivo TEXT PRIMARY KEY,
+    linhas INTEGER NOT NULL,
+    data_hora TEXT NOT NULL
+);
+"""
+
+def _agora():
+    return datetime.now().strftime(FORMATO_DATA)
+
+def _e_chave_antiga(arquivo, nome):
+    """Chaves de versões anteriores do mesmo arquivo: caminho absoluto ou "nome:sha1"."""
+    return (os.path.isabs(arquivo) and os.path.basename(arquivo) == nome) or arquivo.startswith(nome + ":")
+
+class Placar:
+    def __init__(self, caminho=ARQ_PLACAR, csv_antigo=ARQ_CSV_ANTIGO, score_antigo=ARQ_SCORE_ANTIGO,
+                 timeout=30.0, sincrono="NORMAL"):
+        # isolation_level=None: cada INSERT é sua própria transação (curta);
+        # a importação e os lotes abrem a sua com BEGIN IMMEDIATE
+        self._db = sqlite3.connect(caminho, timeout=timeout, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={sincrono}")
+        self._db.executescript(_ESQUEMA)
+        if csv_antigo:
+            self.importar_csv(csv_antigo)
+        if score_antigo:
+            self.importar_score(score_antigo)
+
+    # ----------------- Importação (uma vez) -----------------
+    def _importar(self, caminho, linhas):
+        """
+        Insere `linhas` numa transação só, se ainda não houve importação com o
+        nome deste arquivo. A chave é só o nome: mover/clonar a pasta ou editar
+        o arquivo depois (ele é versionado) não importa as partidas de novo.
+        """
+        chave = os.path.basename(caminho)
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")   # dois processos abrindo juntos não importam em dobro
+        try:
+            if db.execute("SELECT 1 FROM importacoes WHERE arquivo = ?", (chave,)).fetchone():
+                db.execute("ROLLBACK")
+                return 0
+            # bancos antigos guardavam outra chave: o mesmo nome já importado
+            # conta como importado (e a chave migra)
+            legado = [n for a, n in db.execute("SELECT arquivo, linhas FROM importacoes")
+                      if _e_chave_antiga(a, chave)]
+            if legado:
+                db.execute("INSERT INTO importacoes (arquivo, linhas, data_hora) VALUES (?, ?, ?)",
+                           (chave, legado[0], _agora()))
+                db.execute("COMMIT")
+                return 0
+            linhas = linhas()
+            db.executemany("INSERT INTO partidas (nome, pontos, data_hora, origem) VALUES (?, ?, ?, ?)",
+                           linhas)
+            db.execute("INSERT INTO importacoes (arquivo, linhas, data_hora) VALUES (?, ?, ?)",
+                       (chave, len(linhas), _agora()))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        if linhas:
+            print(f"[PLACAR] {len(linhas)} partida(s) importada(s) de '{caminho}'")
+        return len(linhas)
+
+    def importar_csv(self, caminho):
+        """Importa um placar.csv (nome, pontos, data_hora). Linhas inválidas são ignoradas."""
+        if not os.path.exists(caminho):
+            return 0
+        def ler():
+            linhas = []
+            with open(caminho, "r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    try:
+                        linhas.append((row["nome"], int(row["pontos"]), row["data_hora"], "csv"))
+                    except (KeyError, TypeError, ValueError):
+                        continue
+            return linhas
+        return self._importar(caminho, ler)
+
+    def importar_score(self, caminho):
+        """O score.txt só tem o recorde: vira uma partida se for maior que tudo no placar."""
+        if not os.path.exists(caminho):
+            return 0
+        def ler():
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    valor = int(f.read().strip() or "0")
+            except (OSError, ValueError):
+                return []
+            if valor <= self.recorde():
+                return []
+            data = datetime.fromtimestamp(os.path.getmtime(caminho)).strftime(FORMATO_DATA)
+            return [("(recorde antigo)", valor, data, "score.txt")]
+        return self._importar(caminho, ler)
+
+    # ----------------- Escrita -----------------
+    def registrar(self, nome, pontos, origem="manual", data_hora=None):
+        data_hora = data_hora or _agora()
+        self._db.execute("INSERT INTO partidas (nome, pontos, data_hora, origem) VALUES (?, ?, ?, ?)",
+                         (nome, int(pontos), data_hora, origem))
+        print(f"[PLACAR] nome={nome} pontos={pontos} data_hora={data_hora}")
+
+    def registrar_lote(self, linhas):
+        """[(nome, pontos, data_hora, origem)] numa transação só (um commit para todas)."""
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany("INSERT INTO partidas (nome, pontos, data_hora, origem) VALUES (?, ?, ?, ?)",
+                           linhas)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        for nome, pontos, data_hora, _ in linhas:
+            print(f"[PLACAR] nome={nome} pontos={pontos} data_hora={data_hora}")
+
+    # ----------------- Consultas (todas por índice) -----------------
+    def _filtro(self, nome, desde):
+        where, args = [], []
+        if nome is not None:
+            where.append("nome = ?")
+            args.append(nome)
+        if desde is not None:
+            where.append("data_hora >= ?")
+            args.append(desde.strftime(FORMATO_DATA) if isinstance(desde, datetime) else desde)
+        return (" WHERE " + " AND ".join(where)) if where else "", args
+
+    def top(self, n=10, nome=None, desde=None):
+        """[(nome, pontos, data_hora)] das n maiores pontuações (opcionalmente de um jogador / desde uma data)."""
+        where, args = self._filtro(nome, desde)
+        return self._db.execute(
+            f"SELECT nome, pontos, data_hora FROM partidas{where} "
+            f"ORDER BY pontos DESC, data_hora LIMIT ?", args + [int(n)]).fetchall()
+
+    def recorde(self, nome=None, desde=None):
+        where, args = self._filtro(nome, desde)
+        row = self._db.execute(f"SELECT MAX(pontos) FROM partidas{where}", args).fetchone()
+        return row[0] if row[0] is not None else 0
+
+    def posicao(self, pontos):
+        """Colocação que `pontos` teria no placar geral (1 = primeiro)."""
+        row = self._db.execute("SELECT COUNT(*) FROM partidas WHERE pontos > ?", (int(pontos),)).fetchone()
+        return row[0] + 1
+
+    def fechar(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+# ----------------- Escrita em segundo plano -----------------
+class EscritorPlacar:
+    """
+    Placar com uma thread de escrita: `registrar` e `consultar` só enfileiram e
+    devolvem um Future com (top, posicao, recorde), preenchido depois da gravação.
+
+    A thread junta o que estiver na fila (até LOTE_MAX) numa transação só, com
+    synchronous=FULL: cada lote custa um fsync, e as partidas que chegam durante
+    um commit vão juntas no próximo. `fechar` grava o que falta e espera a thread.
+    """
+    def __init__(self, caminho=ARQ_PLACAR, lote_max=LOTE_MAX, **kw_placar):
+        self._fila = queue.SimpleQueue()
+        self._lote_max = lote_max
+        self._thread = threading.Thread(target=self._rodar, args=(caminho, kw_placar),
+                                        name="escritor-placar", daemon=True)
+        self._thread.start()
+
+    def registrar(self, nome, pontos, origem="manual", data_hora=None, top_n=0):
+        """Enfileira a partida; o Future traz o top-N, a colocação dela e o recorde."""
+        fut = Future()
+        self._fila.put(((nome, int(pontos), data_hora or _agora(), origem), top_n, fut))
+        return fut
+
+    def consultar(self, top_n=0):
+        """Future com (top-N, None, recorde), respondido na ordem da fila."""
+        fut = Future()
+        self._fila.put((None, top_n, fut))
+        return fut
+
+    def fechar(self, timeout=None):
+        if self._thread.is_alive():
+            self._fila.put(None)
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _rodar(self, caminho, kw_placar):
+        # a conexão SQLite é criada e usada só nesta thread
+        placar = erro = None
+        try:
+            placar = Placar(caminho, sincrono="FULL", **kw_placar)
+        except Exception as e:
+            print(f"[AVISO] placar '{caminho}' indisponível ({e})")
+            erro = e
+        fila = self._fila
+        fim = False
+        while not fim:
+            lote = [fila.get()]
+            while lote[-1] is not None and len(lote) < self._lote_max:
+                try:
+                    lote.append(fila.get_nowait())
+                except queue.Empty:
+                    break
+            if lote[-1] is None:
+                fim = True
+                lote.pop()
+            if lote:
+                self._processar(placar, erro, lote)
+        if placar is not None:
+            placar.fechar()
+
+    def _processar(self, placar, erro, lote):
+        linhas = [linha for linha, _, _ in lote if linha is not None]
+        if placar is not None and linhas:
+            try:
+                placar.registrar_lote(linhas)
+            except Exception as e:
+                print(f"[AVISO] {len(linhas)} partida(s) não gravada(s) no placar ({e})")
+                erro = e
+        for linha, top_n, fut in lote:
+            if erro is not None:
+                fut.set_exception(erro)
+                continue
+            try:
+                posicao = placar.posicao(linha[1]) if linha is not None else None
+                fut.set_result((placar.top(top_n) if top_n else [], posicao, placar.recorde()))
+            except Exception as e:
+                fut.set_exception(e)
+
+# ----------------- CLI -----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consulta o placar (placar.sqlite3).")
+    parser.add_argument("--arquivo", type=str, default=ARQ_PLACAR)
+    parser.add_argument("--top", type=int, default=10, help="Quantas partidas listar")
+    parser.add_argument("--nome", type=str, default=None, help="Só as partidas deste jogador")
+    parser.add_argument("--dias", type=int, default=None, help="Só as partidas dos últimos N dias")
+    args = parser.parse_args()
+
+    desde = datetime.now() - timedelta(days=args.dias) if args.dias else None
+    with Placar(args.arquivo) as placar:
+        for i, (nome, pontos, data_hora) in enumerate(placar.top(args.top, args.nome, desde), start=1):
+            print(f"{i:3d}. {nome:<20} {pontos:6d}  {data_hora}")
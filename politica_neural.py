@@ -0,0 +1,147 @@
+# politica_neural.py
+"""
+Política neural (MLP) para o agente: o genoma são os pesos de uma rede
+pequena sobre um vetor fixo de sensores.
+
+    sensores: direção da moeda mais próxima (dx, dy unitários) e, para os
+              K_OBS obstáculos mais próximos, o deslocamento do ponto mais
+              próximo do retângulo até o jogador (dx, dy, como direção
+              ponderada pela proximidade) e a velocidade horizontal
+    rede:     N_ENTRADAS -> OCULTOS (tanh) -> 2 (tanh), saída limitada ao
+              círculo unitário (direção e intensidade do movimento)
+
+Tudo é calculado em lote: `sensores` recebe o estado de N episódios em arrays
+(N, ...) e `forward` faz um matmul por camada para os N de uma vez, cada um com
+os próprios pesos. O jogo e o treino escalar usam `sensores_escalar` (as mesmas
+contas em Python puro, sem dezenas de chamadas NumPy com N = 1) e o mesmo
+`forward` com N = 1, então a trajetória é idêntica à da avaliação vetorizada.
+"""
+import math
+
+import numpy as np
+
+from simulacao import OBS_W, OBS_H, RAIO_MOEDA
+
+K_OBS = 3
+OCULTOS = 16
+N_ENTRADAS = 2 + 3 * K_OBS
+N_PESOS = N_ENTRADAS * OCULTOS + OCULTOS + OCULTOS * 2 + 2
+PESO_LIM = 5.0          # pesos ficam em [-PESO_LIM, PESO_LIM]
+ALCANCE_SENSOR = 160.0  # px: além disso o obstáculo não pesa nos sensores
+ESCALA_VEL = 10.0       # normalização da velocidade dos obstáculos
+PRIOR_MOEDA, PRIOR_FUGA, PRIOR_SAIDA = 1.0, 3.0, 3.0   # ganhos da inicialização
+
+def pesos_aleatorios(rng, ruido=0.2):
+    """
+    Pesos iniciais a partir de um random.Random: a rede começa perto da política
+    paramétrica (atração à moeda + fuga dos obstáculos próximos, pelos neurônios
+    ocultos 0 e 1) e o resto é ruído gaussiano de desvio `ruido`/sqrt(fan_in).
+    Uma rede totalmente aleatória colide o tempo todo, e a seleção converge para
+    o "ficar parado" antes de aprender a desviar.
+    """
+    s1, s2 = ruido / math.sqrt(N_ENTRADAS), ruido / math.sqrt(OCULTOS)
+    w1 = [rng.gauss(0.0, s1) for _ in range(N_ENTRADAS * OCULTOS)]
+    w2 = [rng.gauss(0.0, s2) for _ in range(OCULTOS * 2)]
+    for eixo in (0, 1):  # 0 = x, 1 = y
+        w1[eixo * OCULTOS + eixo] += PRIOR_MOEDA
+        for j in range(K_OBS):
+            w1[(2 + 3 * j + eixo) * OCULTOS + eixo] += PRIOR_FUGA
+        w2[eixo * 2 + eixo] += PRIOR_SAIDA
+    return w1 + [0.0] * OCULTOS + w2 + [0.0] * 2
+
+def empilhar(lista_pesos):
+    """(W1, b1, W2, b2) com N camadas empilhadas: (N, E, H), (N, 1, H), (N, H, 2), (N, 1, 2)."""
+    p = np.asarray(lista_pesos, dtype=np.float64).reshape(len(lista_pesos), N_PESOS)
+    n = len(p)
+    i = N_ENTRADAS * OCULTOS
+    W1 = p[:, :i].reshape(n, N_ENTRADAS, OCULTOS)
+    b1 = p[:, i:i + OCULTOS].reshape(n, 1, OCULTOS)
+    i += OCULTOS
+    W2 = p[:, i:i + OCULTOS * 2].reshape(n, OCULTOS, 2)
+    b2 = p[:, i + OCULTOS * 2:].reshape(n, 1, 2)
+    return W1, b1, W2, b2
+
+def sensores(px, py, mx, my, ox, oy, ovel):
+    """
+    px, py: (N,) centros dos jogadores; mx, my: (N, M) moedas; ox, oy, ovel:
+    (N, K) obstáculos (cantos superiores esquerdos). Devolve (N, N_ENTRADAS).
+    """
+    n = len(px)
+    linhas = np.arange(n)
+    s = np.zeros((n, N_ENTRADAS))
+
+    # direção (unitária) da moeda mais próxima; argmin devolve a primeira nos empates
+    cx = mx + RAIO_MOEDA
+    cy = my + RAIO_MOEDA
+    alvo = np.argmin(np.hypot(cx - px[:, None], cy - py[:, None]), axis=1)
+    tx = cx[linhas, alvo] - px
+    ty = cy[linhas, alvo] - py
+    m = np.hypot(tx, ty)
+    m = np.where(m != 0.0, m, np.inf)
+    s[:, 0] = tx / m
+    s[:, 1] = ty / m
+
+    # K obstáculos mais próximos, pelo ponto mais próximo do retângulo: direção
+    # de fuga ponderada pela proximidade (1 encostado, 0 a ALCANCE_SENSOR ou mais)
+    k = min(K_OBS, ox.shape[1])
+    if k:
+        dx = px[:, None] - np.maximum(ox, np.minimum(ox + OBS_W, px[:, None]))
+        dy = py[:, None] - np.maximum(oy, np.minimum(oy + OBS_H, py[:, None]))
+        d = np.hypot(dx, dy)
+        ordem = np.argsort(d, axis=1, kind="stable")[:, :k]
+        sel = linhas[:, None], ordem
+        d = d[sel]
+        f = np.maximum(0.0, 1.0 - d / ALCANCE_SENSOR) / np.where(d > 0.0, d, np.inf)
+        s[:, 2:2 + 3 * k:3] = dx[sel] * f
+        s[:, 3:3 + 3 * k:3] = dy[sel] * f
+        s[:, 4:4 + 3 * k:3] = ovel[sel] / ESCALA_VEL
+    return s
+
+def sensores_escalar(px, py, mx, my, ox, oy, ovel):
+    """
+    `sensores` de um episódio só (floats e sequências 1-D), como lista de
+    N_ENTRADAS valores. Mesmas operações na mesma ordem; as distâncias passam
+    por um único np.hypot, então o resultado é idêntico bit a bit ao do lote.
+    """
+    s = [0.0] * N_ENTRADAS
+    tx = [x + RAIO_MOEDA - px for x in mx]
+    ty = [y + RAIO_MOEDA - py for y in my]
+    dx = [px - max(x, min(x + OBS_W, px)) for x in ox]
+    dy = [py - max(y, min(y + OBS_H, py)) for y in oy]
+    d = np.hypot(tx + dx, ty + dy).tolist()
+    n_m = len(tx)
+    d_m, d_o = d[:n_m], d[n_m:]
+
+    # moeda mais próxima (a primeira nos empates, como o argmin)
+    alvo = min(range(n_m), key=d_m.__getitem__)
+    m = d_m[alvo] if d_m[alvo] != 0.0 else math.inf
+    s[0] = tx[alvo] / m
+    s[1] = ty[alvo] / m
+
+    # K obstáculos mais próximos (ordenação estável, como o argsort)
+    ordem = sorted(range(len(d_o)), key=d_o.__getitem__)[:K_OBS]
+    for j, i in enumerate(ordem):
+        di = d_o[i]
+        f = max(0.0, 1.0 - di / ALCANCE_SENSOR) / (di if di > 0.0 else math.inf)
+        s[2 + 3 * j] = dx[i] * f
+        s[3 + 3 * j] = dy[i] * f
+        s[4 + 3 * j] = ovel[i] / ESCALA_VEL
+    return s
+
+def forward(camadas, s):
+    """Direções (vx, vy) dos N agentes: um matmul em lote por camada."""
+    W1, b1, W2, b2 = camadas
+    h = np.tanh(np.matmul(s[:, None, :], W1) + b1)
+    out = np.tanh(np.matmul(h, W2) + b2)[:, 0, :]
+    vx, vy = out[:, 0], out[:, 1]
+    m = np.hypot(vx, vy)
+    grande = m > 1.0
+    m = np.where(grande, m, 1.0)
+    return vx / m, vy / m
+
+def decisor_lote(genomas):
+    """decidir(px, py, mx, my, ox, oy, ovel) -> (vx, vy) para a população `genomas`."""
+    camadas = empilhar([g["pesos"] for g in genomas])
+    def decidir(px, py, mx, my, ox, oy, ovel):
+        return forward(camadas, sensores(px, py, mx, my, ox, oy, ovel))
+    return decidir
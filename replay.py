@@ -0,0 +1,262 @@
+# replay.py
+"""
+Replays binários de largura fixa (.bcr): um cabeçalho e um registro por tick.
+
+    cabeçalho: "BCRP", versão, largura, altura, qtd. de moedas, máx. de
+               obstáculos, larguras dos campos, origem, seed, vel. do jogador,
+               genes, nº de ticks
+    tick:      jogador x/y, moedas coletadas e colisões no tick, pontuação
+               (a mesma do HUD), recompensa do tick, nº de obstáculos, moedas
+               (x, y) e obstáculos (x, y, velx)
+
+Coordenadas são int16 e contagens uint8; arenas cujas coordenadas não cabem
+em int16 (ou com mais de 255 moedas/obstáculos) gravam int32/uint16 e marcam
+isso no cabeçalho.
+
+Como todo tick ocupa o mesmo número de bytes, o leitor mapeia o arquivo em
+memória (mmap) e acessa qualquer tick em O(1), sem re-simular o episódio.
+
+    python replay.py gravar --genes melhor_agente.json --seeds 1000 1999 --saida replays/
+    python replay.py info replays/seed_1000.bcr --tick 1800
+"""
+import argparse
+import glob
+import json
+import math
+import mmap
+import os
+import struct
+
+import simulacao as sim
+
+MAGICO = b"BCRP"
+VERSAO = 2
+EXTENSAO = ".bcr"
+
+ORIGEM_MANUAL, ORIGEM_AGENTE, ORIGEM_TREINO = 0, 1, 2
+NOMES_ORIGEM = {ORIGEM_MANUAL: "manual", ORIGEM_AGENTE: "agente", ORIGEM_TREINO: "treino"}
+
+# magico, versao, largura, altura, qtd_moedas, qtd_obs_max, larguras, origem, seed, vel, alc, peso, n_ticks
+_CABECALHO = struct.Struct("<4sHIIIIBBqdddI")
+_POS_N_TICKS = _CABECALHO.size - 4
+_POS_EVENTOS = 8   # coletas e colisões logo depois de jx, jy
+
+# bits de `larguras` no cabeçalho
+COORD_32 = 1      # coordenadas int32 (arena com lado acima de LIM_COORD_16)
+CONTAGEM_16 = 2   # contagens uint16 (mais de 255 moedas ou obstáculos)
+LIM_COORD_16 = 32767 - 1024   # folga: obstáculos passam um pouco da borda antes de quicar
+LIM_CONTAGEM = 65535
+
+def larguras_arena(arena):
+    """Bits de `larguras` que cabem em `arena`; ValueError se nem os campos largos couberem."""
+    if max(arena.qtd_moedas, arena.qtd_obs_max) > LIM_CONTAGEM:
+        raise ValueError(f"replay suporta até {LIM_CONTAGEM} moedas/obstáculos "
+                         f"(arena tem {arena.qtd_moedas} moedas e até {arena.qtd_obs_max} obstáculos)")
+    larguras = 0
+    if max(arena.largura, arena.altura) > LIM_COORD_16:
+        larguras |= COORD_32
+    if max(arena.qtd_moedas, arena.qtd_obs_max) > 255:
+        larguras |= CONTAGEM_16
+    return larguras
+
+def _struct_tick(qtd_moedas, qtd_obs_max, larguras):
+    # jx, jy, coletas, colisões, pontuação, recompensa, nº de obstáculos | moedas (x, y) | obstáculos (x, y, velx)
+    c = "H" if larguras & CONTAGEM_16 else "B"
+    xy = "ii" if larguras & COORD_32 else "hh"
+    return struct.Struct(f"<ff{c}{c}ii{c}" + xy * qtd_moedas + (xy + "f") * qtd_obs_max)
+
+def _struct_eventos(larguras):
+    c = "H" if larguras & CONTAGEM_16 else "B"
+    return struct.Struct(f"<{c}{c}")
+
+class Quadro:
+    """Um tick do replay."""
+    __slots__ = ("tick", "jx", "jy", "coletas", "colisoes", "pontuacao", "recompensa",
+                 "moedas", "obstaculos")
+
+    def __init__(self, tick, valores, qtd_moedas):
+        self.tick = tick
+        (self.jx, self.jy, self.coletas, self.colisoes,
+         self.pontuacao, self.recompensa, n_obs) = valores[:7]
+        m = valores[7:7 + 2 * qtd_moedas]
+        self.moedas = list(zip(m[0::2], m[1::2]))
+        o = valores[7 + 2 * qtd_moedas:]
+        self.obstaculos = list(zip(o[0:3 * n_obs:3], o[1:3 * n_obs:3], o[2:3 * n_obs:3]))
+
+    @property
+    def tempo(self):
+        return (self.tick + 1) * sim.DT
+
+# ----------------- Gravação -----------------
+class GravadorReplay:
+    """
+    Grava um episódio tick a tick. `registrar(estado)` vai logo depois de cada
+    `simulacao.step`; `fechar()` completa o nº de ticks no cabeçalho. As
+    larguras dos campos saem do tamanho da arena (ValueError aqui, antes de
+    abrir o arquivo, se ela não couber no formato).
+    """
+    def __init__(self, caminho, seed, estado, origem=ORIGEM_MANUAL, alc=math.nan, peso=math.nan):
+        arena = estado.arena
+        larguras = larguras_arena(arena)
+        self.qtd_moedas = arena.qtd_moedas
+        self.qtd_obs_max = arena.qtd_obs_max
+        self._tick = _struct_tick(self.qtd_moedas, self.qtd_obs_max, larguras)
+        self._vazio_obs = (0, 0, 0.0) * self.qtd_obs_max
+        self.n_ticks = 0
+        self._coletas = estado.coletas
+        self._colisoes = estado.colisoes
+        self._f = open(caminho, "wb")
+        self._f.write(_CABECALHO.pack(MAGICO, VERSAO, arena.largura, arena.altura, self.qtd_moedas,
+                                      self.qtd_obs_max, larguras, origem, seed, estado.vel_jogador,
+                                      alc, peso, 0))
+
+    def registrar(self, estado, pontuacao=None):
+        """
+        `pontuacao`: a que o jogo mostra e leva ao placar (limitada a 0); sem
+        ela, a do episódio (`estado.pontuacao`, como no treino).
+        """
+        mxs, mys = estado.moedas.x, estado.moedas.y
+        ob = estado.obstaculos
+        n_obs = len(ob.x)
+        coletas = estado.coletas - self._coletas
+        colisoes = estado.colisoes - self._colisoes
+        recompensa = coletas * sim.RECOMPENSA_MOEDA - colisoes * sim.PENALIDADE_COLISAO
+        valores = [estado.jx, estado.jy, coletas, colisoes,
+                   estado.pontuacao if pontuacao is None else pontuacao, recompensa, n_obs]
+        self._coletas, self._colisoes = estado.coletas, estado.colisoes
+        for k in range(self.qtd_moedas):
+            valores += (int(mxs[k]), int(mys[k]))
+        for k in range(n_obs):
+            valores += (int(ob.x[k]), int(ob.y[k]), ob.velx[k])
+        valores += self._vazio_obs[3 * n_obs:]
+        self._f.write(self._tick.pack(*valores))
+        self.n_ticks += 1
+
+    def fechar(self):
+        if self._f is None:
+            return
+        self._f.seek(_POS_N_TICKS)
+        self._f.write(struct.pack("<I", self.n_ticks))
+        self._f.close()
+        self._f = None
+
+def gravar_episodio(caminho, genes, seed, origem=ORIGEM_TREINO):
+    """
+    Simula um episódio completo do agente gravando cada tick. Devolve a pontuação.
+    Genomas neurais ("pesos") gravam alc/peso como NaN no cabeçalho.
+    """
+    estado = sim.novo_estado(seed, vel_jogador=genes["vel_jogador"])
+    if "pesos" in genes:
+        from agente import AgenteNeural
+        alc = peso = math.nan
+        agente = AgenteNeural(genes["pesos"])
+    else:
+        alc, peso = genes["alcance_repulsao"], genes["peso_repulsao"]
+        agente = None
+    gravador = GravadorReplay(caminho, seed, estado, origem, alc, peso)
+    try:
+        while not estado.fim:
+            if agente is None:
+                sim.step_ambiente(estado, alc, peso)
+            else:
+                sim.step(estado, agente.acao(estado))
+            gravador.registrar(estado)
+    finally:
+        gravador.fechar()
+    return estado.pontuacao
+
+# ----------------- Leitura -----------------
+class LeitorReplay:
+    """Replay mapeado em memória; `leitor[i]` devolve o Quadro do tick i em O(1)."""
+    def __init__(self, caminho):
+        self._f = open(caminho, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, versao = struct.unpack_from("<4sH", self._mm, 0) if len(self._mm) >= 6 else (b"", 0)
+        if magico != MAGICO or versao != VERSAO or len(self._mm) < _CABECALHO.size:
+            self.fechar()
+            raise ValueError(f"'{caminho}' não é um replay v{VERSAO}"
+                             + (f" (é v{versao}; grave de novo)" if magico == MAGICO else ""))
+        (_, _, self.largura, self.altura, self.qtd_moedas, self.qtd_obs_max, self.larguras,
+         self.origem, self.seed, self.vel_jogador, self.alc, self.peso,
+         n_ticks) = _CABECALHO.unpack_from(self._mm, 0)
+        self._tick = _struct_tick(self.qtd_moedas, self.qtd_obs_max, self.larguras)
+        self._eventos = _struct_eventos(self.larguras)
+        # gravação interrompida (cabeçalho sem total): conta os registros completos
+        self.n_ticks = n_ticks or (len(self._mm) - _CABECALHO.size) // self._tick.size
+
+    def __len__(self):
+        return self.n_ticks
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.n_ticks
+        if not 0 <= i < self.n_ticks:
+            raise IndexError(i)
+        return Quadro(i, self._tick.unpack_from(self._mm, _CABECALHO.size + i * self._tick.size),
+                      self.qtd_moedas)
+
+    def eventos(self):
+        """(coletas, colisões) de cada tick, lendo só esses dois campos de cada registro."""
+        tam, base = self._tick.size, _CABECALHO.size + _POS_EVENTOS
+        ler, mm = self._eventos.unpack_from, self._mm
+        return [ler(mm, base + i * tam) for i in range(self.n_ticks)]
+
+    def fechar(self):
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+def resumo(caminho):
+    with LeitorReplay(caminho) as r:
+        ev = r.eventos()
+        return {
+            "arquivo": caminho,
+            "origem": NOMES_ORIGEM.get(r.origem, r.origem),
+            "seed": r.seed,
+            "ticks": len(r),
+            "pontuacao": r[-1].pontuacao if len(r) else 0,
+            "coletas": sum(c for c, _ in ev),
+            "colisoes": sum(b for _, b in ev),
+            "genes": None if math.isnan(r.alc) else
+                     {"alcance_repulsao": r.alc, "peso_repulsao": r.peso, "vel_jogador": r.vel_jogador},
+        }
+
+# ----------------- CLI -----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grava e inspeciona replays binários (.bcr).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_gravar = sub.add_parser("gravar", help="Grava episódios do agente treinado (headless)")
+    p_gravar.add_argument("--genes", type=str, default="melhor_agente.json")
+    p_gravar.add_argument("--seeds", type=int, nargs=2, default=[1000, 1009], metavar=("INICIO", "FIM"))
+    p_gravar.add_argument("--saida", type=str, default="replays")
+    p_info = sub.add_parser("info", help="Resumo de replays (aceita curingas)")
+    p_info.add_argument("arquivos", nargs="+")
+    p_info.add_argument("--tick", type=int, default=None, help="Mostra também este tick")
+    args = parser.parse_args()
+
+    if args.comando == "gravar":
+        with open(args.genes, "r", encoding="utf-8") as f:
+            genes = json.load(f)
+        os.makedirs(args.saida, exist_ok=True)
+        for seed in range(args.seeds[0], args.seeds[1] + 1):
+            caminho = os.path.join(args.saida, f"seed_{seed}{EXTENSAO}")
+            pontos = gravar_episodio(caminho, genes, seed)
+            print(f"[REPLAY] {caminho} pontuação={pontos}")
+    else:
+        arquivos = [a for padrao in args.arquivos for a in sorted(glob.glob(padrao))]
+        for caminho in arquivos:
+            print(f"[REPLAY] {resumo(caminho)}")
+            if args.tick is not None:
+                with LeitorReplay(caminho) as r:
+                    if not 0 <= args.tick < len(r):
+                        print(f"  [AVISO] tick {args.tick} fora do replay (0..{len(r) - 1})")
+                        continue
+                    q = r[args.tick]
+                    print(f"  tick {q.tick}: jogador=({q.jx:.1f}, {q.jy:.1f}) pontuação={q.pontuacao} "
+                          f"recompensa={q.recompensa:+d} "
+                          f"moedas={q.moedas} obstáculos={q.obstaculos}")
@@ -0,0 +1,337 @@
+# simulacao.py
+"""
+Núcleo de simulação compartilhado (sem pygame/SDL) com passo de tempo fixo.
+
+`main.py` avança a simulação por um acumulador (independente do FPS de
+renderização) e `genetico.py` chama `step` diretamente: a física é uma só,
+então genes treinados se comportam igual no jogo e no treino.
+
+Moedas e obstáculos ficam em buffers paralelos `array('d')` dentro de classes
+com `__slots__`; colisão e clamp são calculados inline, de modo que o laço
+quente não aloca nenhum objeto por tick. As coordenadas seguem a semântica de
+`pygame.Rect` (inteiras, arredondadas "metade para longe do zero").
+
+Arenas grandes (milhares de entidades) podem usar uma grade espacial
+(`Arena.celula_grade > 0`): as consultas de repulsão, moeda mais próxima e
+colisão passam a olhar só as células vizinhas, com o mesmo resultado.
+"""
+import argparse
+import math
+import random
+import time
+from array import array
+
+from grade_espacial import GradeEspacial
+
+# ----------------- Ambiente -----------------
+LARGURA, ALTURA = 800, 600
+JOGADOR_W, JOGADOR_H = 48, 48
+RAIO_MOEDA = 10
+QTD_MOEDAS = 7
+OBS_W, OBS_H = 80, 40
+QTD_OBS_INICIAL = 4
+QTD_OBS_MAX = 10
+
+# Tempo (passo fixo: velocidades em px por passo)
+SIM_HZ = 60
+DT = 1.0 / SIM_HZ
+TEMPO_MAX_SEG = 60
+STEPS_POR_AVALIACAO = TEMPO_MAX_SEG * SIM_HZ   # um episódio completo
+PASSOS_POR_MARCO = 10 * SIM_HZ                 # dificuldade sobe a cada 10s
+
+VEL_OBS_BASE = 4.0
+VEL_OBS_INCR = 0.8
+VEL_JOGADOR_BASE = 6.0
+
+# Pontuação
+RECOMPENSA_MOEDA = 1
+PENALIDADE_COLISAO = 2
+
+_MOEDA_LADO = RAIO_MOEDA * 2
+
+# ----------------- Arena -----------------
+class Arena:
+    """Dimensões e populações da arena; `celula_grade > 0` liga a grade espacial."""
+    __slots__ = ("largura", "altura", "qtd_moedas", "qtd_obs_inicial", "qtd_obs_max", "celula_grade")
+
+    def __init__(self, largura=LARGURA, altura=ALTURA, qtd_moedas=QTD_MOEDAS,
+                 qtd_obs_inicial=QTD_OBS_INICIAL, qtd_obs_max=QTD_OBS_MAX, celula_grade=0):
+        self.largura = largura
+        self.altura = altura
+        self.qtd_moedas = qtd_moedas
+        self.qtd_obs_inicial = qtd_obs_inicial
+        self.qtd_obs_max = qtd_obs_max
+        self.celula_grade = celula_grade
+
+ARENA_PADRAO = Arena()
+
+# ----------------- Entidades -----------------
+class Moedas:
+    """Posições (canto superior esquerdo) das moedas em buffers paralelos."""
+    __slots__ = ("x", "y")
+
+    def __init__(self):
+        self.x = array("d")
+        self.y = array("d")
+
+    def __len__(self):
+        return len(self.x)
+
+    def adicionar(self, x, y):
+        self.x.append(x)
+        self.y.append(y)
+
+class Obstaculos:
+    """Posições (canto superior esquerdo) e velocidade horizontal dos obstáculos."""
+    __slots__ = ("x", "y", "velx")
+
+    def __init__(self):
+        self.x = array("d")
+        self.y = array("d")
+        self.velx = array("d")
+
+    def __len__(self):
+        return len(self.x)
+
+    def adicionar(self, x, y, velx):
+        self.x.append(x)
+        self.y.append(y)
+        self.velx.append(velx)
+
+class Estado:
+    """Estado completo de um episódio."""
+    __slots__ = ("jx", "jy", "vel_jogador", "moedas", "obstaculos", "vel_obs",
+                 "passo", "pontuacao", "coletas", "colisoes", "rng",
+                 "arena", "grade_moedas", "grade_obs")
+
+    @property
+    def tempo(self):
+        return self.passo * DT
+
+    @property
+    def fim(self):
+        return self.passo >= STEPS_POR_AVALIACAO
+
+# ----------------- Geração -----------------
+def sortear_moeda(rng, largura=LARGURA, altura=ALTURA):
+    x = rng.randint(RAIO_MOEDA + 10, largura - RAIO_MOEDA - 10) - RAIO_MOEDA
+    y = rng.randint(RAIO_MOEDA + 10, altura - RAIO_MOEDA - 10) - RAIO_MOEDA
+    return x, y
+
+def criar_moedas(rng, qtd=QTD_MOEDAS, largura=LARGURA, altura=ALTURA):
+    moedas = Moedas()
+    for _ in range(qtd):
+        moedas.adicionar(*sortear_moeda(rng, largura, altura))
+    return moedas
+
+def criar_obstaculos(qtd, vel_base, rng, obs=None, largura=LARGURA, altura=ALTURA):
+    """Cria `qtd` obstáculos (ou acrescenta a `obs`, se fornecido)."""
+    if obs is None:
+        obs = Obstaculos()
+    for i in range(qtd):
+        x = rng.randint(0, largura - OBS_W)
+        y = rng.randint(60, altura - 60)
+        velx = vel_base if (i % 2 == 0) else -vel_base
+        obs.adicionar(x, y, velx)
+    return obs
+
+def novo_estado(seed=None, vel_jogador=VEL_JOGADOR_BASE, arena=ARENA_PADRAO):
+    """Episódio novo; `seed=None` sorteia (jogo), uma seed fixa reproduz (treino)."""
+    e = Estado()
+    e.rng = random.Random(seed)
+    e.arena = arena
+    e.jx = arena.largura/2 - JOGADOR_W/2
+    e.jy = arena.altura/2 - JOGADOR_H/2
+    e.vel_jogador = float(vel_jogador)
+    e.moedas = criar_moedas(e.rng, arena.qtd_moedas, arena.largura, arena.altura)
+    e.obstaculos = criar_obstaculos(arena.qtd_obs_inicial, VEL_OBS_BASE, e.rng,
+                                    largura=arena.largura, altura=arena.altura)
+    e.vel_obs = VEL_OBS_BASE
+    e.passo = 0
+    e.pontuacao = 0
+    e.coletas = 0
+    e.colisoes = 0
+    e.grade_moedas = e.grade_obs = None
+    if arena.celula_grade > 0:
+        e.grade_moedas = GradeEspacial(arena.largura, arena.altura, arena.celula_grade)
+        e.grade_obs = GradeEspacial(arena.largura, arena.altura, arena.celula_grade)
+        mxs, mys = e.moedas.x, e.moedas.y
+        for k in range(len(mxs)):
+            e.grade_moedas.inserir(k, mxs[k], mys[k], mxs[k] + _MOEDA_LADO, mys[k] + _MOEDA_LADO)
+        oxs, oys = e.obstaculos.x, e.obstaculos.y
+        for k in range(len(oxs)):
+            e.grade_obs.inserir(k, oxs[k], oys[k], oxs[k] + OBS_W, oys[k] + OBS_H)
+    return e
+
+# ----------------- Política paramétrica (genes) -----------------
+def politica(estado, alc, peso):
+    """
+    Direção (vx, vy) unitária: atração à moeda mais próxima + repulsão dos
+    obstáculos dentro de `alc`, com peso `peso`. Usada no treino e pelo agente.
+    """
+    hypot = math.hypot
+    mxs, mys = estado.moedas.x, estado.moedas.y
+    oxs, oys = estado.obstaculos.x, estado.obstaculos.y
+    px, py = estado.jx + JOGADOR_W / 2, estado.jy + JOGADOR_H / 2
+
+    # direção para a moeda mais próxima
+    ax = ay = 0.0
+    if estado.grade_moedas is not None:
+        alvo = estado.grade_moedas.mais_proximo(px, py, mxs, mys, RAIO_MOEDA)
+    else:
+        alvo = -1
+        dmin = 0.0
+        for k in range(len(mxs)):
+            d = hypot(px - (mxs[k] + RAIO_MOEDA), py - (mys[k] + RAIO_MOEDA))
+            if alvo < 0 or d < dmin:
+                alvo, dmin = k, d
+    if alvo >= 0:
+        tx, ty = (mxs[alvo] + RAIO_MOEDA) - px, (mys[alvo] + RAIO_MOEDA) - py
+        m = hypot(tx, ty)
+        if m != 0.0:
+            ax, ay = tx / m, ty / m
+
+    # repulsão de obstáculos (ponto mais próximo do retângulo)
+    if estado.grade_obs is not None:
+        perto = estado.grade_obs.consultar(px - alc, py - alc, px + alc, py + alc)
+    else:
+        perto = range(len(oxs))
+    rx = ry = 0.0
+    for k in perto:
+        left = oxs[k]
+        top = oys[k]
+        qx = left if px < left else (left + OBS_W if px > left + OBS_W else px)
+        qy = top if py < top else (top + OBS_H if py > top + OBS_H else py)
+        dx, dy = px - qx, py - qy
+        d = hypot(dx, dy)
+        if 0.0 < d < alc:
+            f = (alc - d) / alc
+            rx += dx / d * f
+            ry += dy / d * f
+    mag = hypot(rx, ry)
+    if mag > 1.0:
+        rx, ry = rx / mag, ry / mag
+
+    vx, vy = ax + rx * peso, ay + ry * peso
+    m = hypot(vx, vy)
+    if m != 0.0:
+        return vx / m, vy / m
+    return 1.0, 0.0  # fallback para nunca ficar parado
+
+# ----------------- Passo da simulação -----------------
+def step(estado, acao):
+    """
+    Avança um passo fixo (DT). `acao` = (vx, vy), multiplicada pela velocidade
+    do jogador. Devolve a recompensa do passo (+1 por moeda, -2 por colisão).
+    """
+    arena = estado.arena
+    largura, altura = arena.largura, arena.altura
+    mxs, mys = estado.moedas.x, estado.moedas.y
+    oxs, oys, ovs = estado.obstaculos.x, estado.obstaculos.y, estado.obstaculos.velx
+    grade_m, grade_o = estado.grade_moedas, estado.grade_obs
+    n_obs = len(oxs)
+    rng = estado.rng
+    floor = math.floor
+
+    # move jogador
+    vx, vy = acao
+    jx = estado.jx + vx * estado.vel_jogador
+    jy = estado.jy + vy * estado.vel_jogador
+    jx = 0.0 if jx < 0.0 else (largura - JOGADOR_W if jx > largura - JOGADOR_W else jx)
+    jy = 0.0 if jy < 0.0 else (altura - JOGADOR_H if jy > altura - JOGADOR_H else jy)
+    estado.jx, estado.jy = jx, jy
+    rjx, rjy = int(jx), int(jy)
+
+    # move obstáculos
+    if grade_o is None:
+        for k in range(n_obs):
+            x = oxs[k] + ovs[k]
+            # arredonda como pygame.Rect (metade para longe do zero)
+            x = floor(x + 0.5) if x >= 0.0 else -floor(0.5 - x)
+            oxs[k] = x
+            if x <= 0 or x + OBS_W >= largura:
+                ovs[k] = -ovs[k]
+    else:
+        # só horizontal: re-registra na grade apenas quando muda de coluna
+        cel = grade_o.celula
+        faixas = grade_o.faixas
+        for k in range(n_obs):
+            x = oxs[k] + ovs[k]
+            x = floor(x + 0.5) if x >= 0.0 else -floor(0.5 - x)
+            oxs[k] = x
+            if x <= 0 or x + OBS_W >= largura:
+                ovs[k] = -ovs[k]
+            f = faixas[k]
+            if int(x // cel) != f[0] or int((x + OBS_W) // cel) != f[2]:
+                grade_o.mover(k, x, oys[k], x + OBS_W, oys[k] + OBS_H)
+
+    # recompensa
+    if grade_m is not None:
+        cand_m = grade_m.consultar(rjx, rjy, rjx + JOGADOR_W, rjy + JOGADOR_H)
+        cand_o = grade_o.consultar(rjx, rjy, rjx + JOGADOR_W, rjy + JOGADOR_H)
+    else:
+        cand_m = range(len(mxs))
+        cand_o = range(n_obs)
+    coletas = colisoes = 0
+    for k in cand_m:
+        mx, my = mxs[k], mys[k]
+        if rjx < mx + _MOEDA_LADO and rjx + JOGADOR_W > mx and \
+           rjy < my + _MOEDA_LADO and rjy + JOGADOR_H > my:
+            coletas += 1
+            mx, my = sortear_moeda(rng, largura, altura)
+            mxs[k], mys[k] = mx, my
+            if grade_m is not None:
+                grade_m.mover(k, mx, my, mx + _MOEDA_LADO, my + _MOEDA_LADO)
+    for k in cand_o:
+        ox, oy = oxs[k], oys[k]
+        if rjx < ox + OBS_W and rjx + JOGADOR_W > ox and \
+           rjy < oy + OBS_H and rjy + JOGADOR_H > oy:
+            colisoes += 1
+    reward = coletas * RECOMPENSA_MOEDA - colisoes * PENALIDADE_COLISAO
+    estado.coletas += coletas
+    estado.colisoes += colisoes
+    estado.pontuacao += reward
+
+    # dificuldade progressiva
+    estado.passo += 1
+    if estado.passo % PASSOS_POR_MARCO == 0:
+        estado.vel_obs += VEL_OBS_INCR
+        vel_obs = estado.vel_obs
+        for k in range(n_obs):
+            ovs[k] = (vel_obs if ovs[k] > 0 else -vel_obs)
+        if n_obs < arena.qtd_obs_max:
+            criar_obstaculos(1, vel_obs, rng, estado.obstaculos, largura, altura)
+            if grade_o is not None:
+                grade_o.inserir(n_obs, oxs[n_obs], oys[n_obs], oxs[n_obs] + OBS_W, oys[n_obs] + OBS_H)
+
+    return reward
+
+def step_ambiente(estado, alc, peso):
+    """Um passo com a política paramétrica (atalho usado pelo treino)."""
+    return step(estado, politica(estado, alc, peso))
+
+# ----------------- Medição de escala (arena grande) -----------------
+def _medir(arena, passos, seed, alc, peso, vel):
+    estado = novo_estado(seed, vel_jogador=vel, arena=arena)
+    t0 = time.perf_counter()
+    for _ in range(passos):
+        step_ambiente(estado, alc, peso)
+    return estado.pontuacao, passos / (time.perf_counter() - t0)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede passos/s da simulação em arenas grandes.")
+    parser.add_argument("--largura", type=int, default=LARGURA)
+    parser.add_argument("--altura", type=int, default=ALTURA)
+    parser.add_argument("--moedas", type=int, default=QTD_MOEDAS, help="QTD_MOEDAS")
+    parser.add_argument("--obs-inicial", type=int, default=QTD_OBS_INICIAL, help="QTD_OBS_INICIAL")
+    parser.add_argument("--obs-max", type=int, default=QTD_OBS_MAX, help="QTD_OBS_MAX")
+    parser.add_argument("--celula", type=int, default=128, help="Tamanho da célula da grade espacial (px)")
+    parser.add_argument("--passos", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1000)
+    args = parser.parse_args()
+
+    kw = dict(largura=args.largura, altura=args.altura, qtd_moedas=args.moedas,
+              qtd_obs_inicial=args.obs_inicial, qtd_obs_max=max(args.obs_max, args.obs_inicial))
+    for nome, celula in (("linear", 0), (f"grade({args.celula}px)", args.celula)):
+        pontos, pps = _medir(Arena(celula_grade=celula, **kw), args.passos, args.seed, 120.0, 1.2, VEL_JOGADOR_BASE)
+        print(f"[ESCALA] {nome:>14}: {pps:10.0f} passos/s | pontuação={pontos}")
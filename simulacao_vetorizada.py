@@ -0,0 +1,239 @@
+# simulacao_vetorizada.py
+"""
+Simulação headless vetorizada (NumPy).
+
+Avalia uma população inteira de cromossomos em lockstep: posições do jogador,
+retângulos dos obstáculos, moedas e recompensas de todos os N indivíduos ficam
+em arrays e cada tick vira um punhado de operações sobre a população inteira.
+
+Reproduz exatamente a semântica de `simulacao.politica`/`simulacao.step`
+(mesma seed => mesma pontuação), incluindo o arredondamento de `pygame.Rect`.
+A física em lote fica toda em `LoteEpisodios.passo_lote`, que também move o
+`VecEnv` (ambiente_vetorizado.py).
+Genomas neurais usam `politica_neural` (as mesmas funções do agente no jogo).
+"""
+import random
+
+import numpy as np
+
+from simulacao import (
+    LARGURA, ALTURA, JOGADOR_W, JOGADOR_H, RAIO_MOEDA, QTD_MOEDAS,
+    OBS_W, OBS_H, QTD_OBS_INICIAL, QTD_OBS_MAX,
+    STEPS_POR_AVALIACAO, PASSOS_POR_MARCO, VEL_OBS_BASE, VEL_OBS_INCR, VEL_JOGADOR_BASE,
+    RECOMPENSA_MOEDA, PENALIDADE_COLISAO, sortear_moeda,
+)
+
+_MOEDA_LADO = RAIO_MOEDA * 2
+
+
+def _arred_rect(v):
+    # pygame.Rect arredonda coordenadas float "metade para longe do zero"
+    return np.copysign(np.floor(np.abs(v) + 0.5), v)
+
+
+def _sortear_obstaculo(rng):
+    x = rng.randint(0, LARGURA - OBS_W)
+    y = rng.randint(60, ALTURA - 60)
+    return x, y
+
+
+def _politica_parametrica(cromossomos):
+    """decidir(px, py, mx, my, ox, oy, ovel) -> (vx, vy): `simulacao.politica` em lote."""
+    alc = np.array([g["alcance_repulsao"] for g in cromossomos], dtype=np.float64)
+    peso = np.array([g["peso_repulsao"] for g in cromossomos], dtype=np.float64)
+    n = len(cromossomos)
+    linhas = np.arange(n)
+    zero = np.zeros(n, dtype=np.float64)
+
+    def decidir(px, py, mx, my, oxa, oya, ovel):
+        # atração: moeda mais próxima (argmin devolve a primeira, como min())
+        cx = mx + RAIO_MOEDA
+        cy = my + RAIO_MOEDA
+        dist = np.hypot(px[:, None] - cx, py[:, None] - cy)
+        alvo = np.argmin(dist, axis=1)
+        tx = cx[linhas, alvo] - px
+        ty = cy[linhas, alvo] - py
+        m = np.hypot(tx, ty)
+        ok = m != 0.0
+        ax = np.where(ok, tx / np.where(ok, m, 1.0), 0.0)
+        ay = np.where(ok, ty / np.where(ok, m, 1.0), 0.0)
+
+        # repulsão: ponto mais próximo de cada retângulo (clamp)
+        qx = np.maximum(oxa, np.minimum(oxa + OBS_W, px[:, None]))
+        qy = np.maximum(oya, np.minimum(oya + OBS_H, py[:, None]))
+        drx = px[:, None] - qx
+        dry = py[:, None] - qy
+        d = np.hypot(drx, dry)
+        dentro = (d > 0.0) & (d < alc[:, None])
+        d_seg = np.where(dentro, d, 1.0)
+        f = (alc[:, None] - d) / alc[:, None]
+        cx_rep = np.where(dentro, drx / d_seg * f, 0.0)
+        cy_rep = np.where(dentro, dry / d_seg * f, 0.0)
+        # soma sequencial (mesma ordem de ponto flutuante do laço escalar)
+        rx = zero.copy()
+        ry = zero.copy()
+        for k in range(oxa.shape[1]):
+            rx += cx_rep[:, k]
+            ry += cy_rep[:, k]
+        mag = np.hypot(rx, ry)
+        grande = mag > 1.0
+        mag_seg = np.where(grande, mag, 1.0)
+        rx = np.where(grande, rx / mag_seg, rx)
+        ry = np.where(grande, ry / mag_seg, ry)
+
+        vx = ax + rx * peso
+        vy = ay + ry * peso
+        m = np.hypot(vx, vy)
+        ok = m != 0.0
+        m_seg = np.where(ok, m, 1.0)
+        vx = np.where(ok, vx / m_seg, 1.0)  # fallback
+        vy = np.where(ok, vy / m_seg, 0.0)
+        return vx, vy
+    return decidir
+
+
+class LoteEpisodios:
+    """
+    Estado de N episódios independentes em arrays (N, ...), cada um com seu RNG,
+    contador de passos e dificuldade. É o núcleo único da física em lote: a
+    avaliação da população (`fitness_populacao`) e o `VecEnv` só decidem as
+    direções e chamam `passo_lote`. Obstáculos ainda não criados ficam em
+    `ativo = False`, com velocidade 0, e não colidem.
+    """
+    def __init__(self, n, vel_jogador=VEL_JOGADOR_BASE):
+        self.n = n
+        self.vel = np.broadcast_to(np.asarray(vel_jogador, dtype=np.float64), (n,)).copy()
+        self.jx = np.zeros(n)
+        self.jy = np.zeros(n)
+        self.mx = np.zeros((n, QTD_MOEDAS))
+        self.my = np.zeros((n, QTD_MOEDAS))
+        self.ox = np.zeros((n, QTD_OBS_MAX))
+        self.oy = np.zeros((n, QTD_OBS_MAX))
+        self.ovel = np.zeros((n, QTD_OBS_MAX))
+        self.ativo = np.zeros((n, QTD_OBS_MAX), dtype=bool)
+        self.n_obs = np.zeros(n, dtype=np.int64)
+        self.vel_obs = np.zeros(n)
+        self.passo = np.zeros(n, dtype=np.int64)
+        self.pontuacao = np.zeros(n, dtype=np.int64)
+        self.coletas = np.zeros(n, dtype=np.int64)
+        self.colisoes = np.zeros(n, dtype=np.int64)
+        self.seeds = [None] * n
+        self.rngs = [None] * n
+
+    def __len__(self):
+        return self.n
+
+    def iniciar(self, i, seed):
+        """Episódio novo na pista i, com o mesmo sorteio de `simulacao.novo_estado`."""
+        rng = self.rngs[i] = random.Random(seed)
+        self.seeds[i] = seed
+        self.jx[i] = LARGURA/2 - JOGADOR_W/2
+        self.jy[i] = ALTURA/2 - JOGADOR_H/2
+        for k in range(QTD_MOEDAS):
+            self.mx[i, k], self.my[i, k] = sortear_moeda(rng)
+        self.ox[i] = self.oy[i] = self.ovel[i] = 0.0
+        self.ativo[i] = False
+        for k in range(QTD_OBS_INICIAL):
+            self.ox[i, k], self.oy[i, k] = _sortear_obstaculo(rng)
+            self.ovel[i, k] = VEL_OBS_BASE if (k % 2 == 0) else -VEL_OBS_BASE
+        self.ativo[i, :QTD_OBS_INICIAL] = True
+        self.n_obs[i] = QTD_OBS_INICIAL
+        self.vel_obs[i] = VEL_OBS_BASE
+        self.passo[i] = 0
+        self.pontuacao[i] = self.coletas[i] = self.colisoes[i] = 0
+
+    def passo_lote(self, vx, vy):
+        """
+        Um passo fixo de `simulacao.step` para as N pistas, com as direções
+        (vx, vy) já decididas. Devolve a recompensa (N,) do passo.
+        """
+        # move jogadores
+        self.jx = np.maximum(0.0, np.minimum(LARGURA - JOGADOR_W, self.jx + vx * self.vel))
+        self.jy = np.maximum(0.0, np.minimum(ALTURA - JOGADOR_H, self.jy + vy * self.vel))
+        rjx = np.trunc(self.jx)[:, None]
+        rjy = np.trunc(self.jy)[:, None]
+
+        # move obstáculos (quicando nas bordas); colunas além do maior n_obs
+        # estão inativas em todas as pistas e ficam de fora
+        c = int(self.n_obs.max())
+        ox = self.ox[:, :c] = _arred_rect(self.ox[:, :c] + self.ovel[:, :c])
+        ovel = self.ovel[:, :c]
+        quica = (ox <= 0) | (ox + OBS_W >= LARGURA)
+        np.negative(ovel, out=ovel, where=quica)
+
+        # moedas coletadas (+1, renascem pelo RNG da própria pista)
+        mx, my = self.mx, self.my
+        pegou = (rjx < mx + _MOEDA_LADO) & (rjx + JOGADOR_W > mx) & \
+                (rjy < my + _MOEDA_LADO) & (rjy + JOGADOR_H > my)
+        n_pegou = pegou.sum(axis=1)
+        if n_pegou.any():
+            rngs = self.rngs
+            for i, k in zip(*np.nonzero(pegou)):
+                mx[i, k], my[i, k] = sortear_moeda(rngs[i])
+
+        # colisões com obstáculos (-2 cada)
+        oy = self.oy[:, :c]
+        bateu = (rjx < ox + OBS_W) & (rjx + JOGADOR_W > ox) & \
+                (rjy < oy + OBS_H) & (rjy + JOGADOR_H > oy)
+        if self.n_obs.min() < c:   # pistas com menos obstáculos (fora de lockstep)
+            bateu &= self.ativo[:, :c]
+        n_bateu = bateu.sum(axis=1)
+        recompensa = n_pegou * RECOMPENSA_MOEDA - n_bateu * PENALIDADE_COLISAO
+        self.coletas += n_pegou
+        self.colisoes += n_bateu
+        self.pontuacao += recompensa
+
+        # dificuldade progressiva, pelo contador de cada pista
+        self.passo += 1
+        marco = np.flatnonzero(self.passo % PASSOS_POR_MARCO == 0)
+        if len(marco):
+            self.vel_obs[marco] += VEL_OBS_INCR
+            v = self.vel_obs[marco, None]
+            self.ovel[marco] = np.where(self.ovel[marco] > 0, v, np.where(self.ativo[marco], -v, 0.0))
+            for i in marco:
+                k = self.n_obs[i]
+                if k < QTD_OBS_MAX:
+                    self.ox[i, k], self.oy[i, k] = _sortear_obstaculo(self.rngs[i])
+                    self.ovel[i, k] = self.vel_obs[i]
+                    self.ativo[i, k] = True
+                    self.n_obs[i] = k + 1
+        return recompensa
+
+
+def fitness_populacao(cromossomos, seed_base=0, seeds=None, detalhes=False):
+    """
+    Avalia todos os cromossomos na mesma seed, em lockstep (todos paramétricos
+    ou todos neurais). Devolve a lista de pontuações na ordem de `cromossomos`.
+    Com `seeds` (uma por cromossomo), cada pista usa a sua — p.ex. o mesmo
+    genoma repetido em muitas seeds. Com `detalhes`, devolve tuplas
+    (pontuação, coletas, colisões).
+    """
+    n = len(cromossomos)
+    if n == 0:
+        return []
+
+    # genomas neurais ("pesos") usam a MLP em lote; os demais, a política paramétrica
+    if "pesos" in cromossomos[0]:
+        from politica_neural import decisor_lote
+        decidir = decisor_lote(cromossomos)
+    else:
+        decidir = _politica_parametrica(cromossomos)
+
+    # cada pista tem seu próprio RNG (as moedas renascem em momentos diferentes)
+    lote = LoteEpisodios(n, [g["vel_jogador"] for g in cromossomos])
+    if seeds is None:
+        seeds = [seed_base] * n
+    for i, s in enumerate(seeds):
+        lote.iniciar(i, s)
+
+    for _ in range(STEPS_POR_AVALIACAO):
+        # em lockstep todas as pistas têm os mesmos obstáculos ativos: a
+        # política vê só esses (os inativos desviariam a repulsão)
+        k = int(lote.n_obs[0])
+        vx, vy = decidir(lote.jx + JOGADOR_W / 2, lote.jy + JOGADOR_H / 2, lote.mx, lote.my,
+                         lote.ox[:, :k], lote.oy[:, :k], lote.ovel[:, :k])
+        lote.passo_lote(vx, vy)
+
+    if detalhes:
+        return [(int(p), int(c), int(b)) for p, c, b in zip(lote.pontuacao, lote.coletas, lote.colisoes)]
+    return [int(p) for p in lote.pontuacao]
@@ -0,0 +1,259 @@
+# varredura.py
+"""
+Varredura de hiperparâmetros do AG: grade ou busca aleatória sobre
+elitismo_frac, taxa/sigma da mutação, pop_size, geracoes e seeds_por_avaliacao.
+
+Cada treino é um `genetico.evoluir` independente, num processo do pool e num
+diretório próprio (evolucao.csv, melhor_agente.json, checkpoint_treino.json e
+treino.log), então nada do treino "oficial" na raiz é sobrescrito. No fim, as
+configurações são ordenadas pelo fitness final (ou pela média em seeds de
+validação, com --validacao) numa tabela com tempo de parede e avaliações.
+
+    python varredura.py elitismo_frac=0.1,0.2,0.3 taxa_mutacao=0.2,0.3,0.5 --geracoes 30 --workers 4
+    python varredura.py --aleatoria 24 elitismo_frac=0.05:0.4 sigma_mutacao=0.03:0.3 pop_size=20,40,80
+
+Valores: `a,b,c` (lista) ou `lo:hi` (faixa, só na busca aleatória; inteiros
+para pop_size/geracoes/seeds_por_avaliacao). Rodar de novo com o mesmo --saida
+reaproveita os treinos já concluídos com os mesmos parâmetros.
+"""
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import time
+
+from genetico import AGENTES, evoluir
+
+DIR_SAIDA = "varredura"
+ARQ_RESULTADO = "resultado.json"
+ARQ_RESUMO = "resumo.csv"
+
+# hiperparâmetros aceitos no espaço de busca -> (tipo, opção equivalente do genetico.py)
+PARAMETROS = {
+    "elitismo_frac": (float, "--elitismo"),
+    "taxa_mutacao": (float, "--taxa-mutacao"),
+    "sigma_mutacao": (float, "--sigma-mutacao"),
+    "pop_size": (int, "--pop"),
+    "geracoes": (int, "--geracoes"),
+    "seeds_por_avaliacao": (int, "--seeds"),
+}
+
+# ----------------- Espaço de busca -----------------
+def ler_espaco(specs):
+    """["nome=a,b", "nome=lo:hi"] -> {nome: ("lista", [..]) | ("faixa", lo, hi)}."""
+    espaco = {}
+    for spec in specs:
+        nome, sep, valores = spec.partition("=")
+        if not sep or nome not in PARAMETROS:
+            raise ValueError(f"esperava nome=valores com nome em {', '.join(PARAMETROS)}: {spec!r}")
+        tipo = PARAMETROS[nome][0]
+        if ":" in valores:
+            lo, hi = (tipo(v) for v in valores.split(":", 1))
+            if lo > hi:
+                raise ValueError(f"faixa vazia: {spec!r}")
+            espaco[nome] = ("faixa", lo, hi)
+        else:
+            espaco[nome] = ("lista", [tipo(v) for v in valores.split(",")])
+    return espaco
+
+def configuracoes_grade(espaco):
+    """Produto cartesiano das listas (na ordem dada)."""
+    faixas = [nome for nome, dom in espaco.items() if dom[0] == "faixa"]
+    if faixas:
+        raise ValueError(f"a grade precisa de listas (a,b,c); faixa em: {', '.join(faixas)} "
+                         f"(use --aleatoria N para sortear)")
+    nomes = list(espaco)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*(espaco[n][1] for n in nomes))]
+
+def configuracoes_aleatorias(espaco, n, rng):
+    """`n` sorteios: listas por escolha uniforme, faixas uniformes (inteiras para os tipos int)."""
+    configs = []
+    for _ in range(n):
+        c = {}
+        for nome, dom in espaco.items():
+            if dom[0] == "lista":
+                c[nome] = rng.choice(dom[1])
+            elif PARAMETROS[nome][0] is int:
+                c[nome] = rng.randint(dom[1], dom[2])
+            else:
+                c[nome] = rng.uniform(dom[1], dom[2])
+        configs.append(c)
+    return configs
+
+# ----------------- Execução (um treino por processo) -----------------
+def _avaliacoes_usadas(log_csv):
+    with open(log_csv, "r", newline="", encoding="utf-8") as f:
+        return sum(int(row["avaliacoes"]) for row in csv.DictReader(f))
+
+def executar(diretorio, kw_evoluir, validacao=0):
+    """
+    Um treino completo em `diretorio` (saída do treino em treino.log). Devolve
+    o resultado (também gravado em resultado.json); se o diretório já tem um
+    resultado com os mesmos parâmetros, só o relê.
+    """
+    arq_resultado = os.path.join(diretorio, ARQ_RESULTADO)
+    if os.path.exists(arq_resultado):
+        with open(arq_resultado, "r", encoding="utf-8") as f:
+            anterior = json.load(f)
+        if anterior["params"] == kw_evoluir and anterior["validacao_seeds"] == validacao:
+            anterior["reaproveitado"] = True
+            return anterior
+
+    os.makedirs(diretorio, exist_ok=True)
+    log_csv = os.path.join(diretorio, "evolucao.csv")
+    t0 = time.perf_counter()
+    with open(os.path.join(diretorio, "treino.log"), "w", encoding="utf-8") as log, \
+            contextlib.redirect_stdout(log):
+        melhor = evoluir(log_csv=log_csv, plotar=False, checkpoint_cada=0,
+                         arq_melhor=os.path.join(diretorio, "melhor_agente.json"),
+                         arq_checkpoint=os.path.join(diretorio, "checkpoint_treino.json"), **kw_evoluir)
+    tempo = time.perf_counter() - t0
+
+    val = None
+    if validacao and melhor:
+        # seeds fora das do treino, as mesmas para todas as execuções
+        from avaliar_agente import SEED_INICIAL, avaliar
+        seeds = list(range(SEED_INICIAL, SEED_INICIAL + validacao))
+        res = avaliar(melhor[0], seeds, vetorizado=kw_evoluir.get("vetorizado", False))
+        val = statistics.fmean(r[0] for r in res)
+
+    resultado = {
+        "params": kw_evoluir,
+        "fitness": melhor[1] if melhor else None,
+        "validacao": val,
+        "validacao_seeds": validacao,
+        "tempo_s": tempo,
+        "avaliacoes": _avaliacoes_usadas(log_csv),
+        "diretorio": diretorio,
+    }
+    tmp = arq_resultado + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, arq_resultado)
+    resultado["reaproveitado"] = False
+    return resultado
+
+def _executar_tarefa(tarefa):
+    i, diretorio, kw, validacao = tarefa
+    return i, executar(diretorio, kw, validacao)
+
+def varrer(configs, fixos, saida=DIR_SAIDA, repeticoes=1, seed=42, workers=1, validacao=0):
+    """
+    Roda cada configuração com `repeticoes` seeds de treino (seed, seed+1, ...)
+    em `workers` processos. Devolve [(config, [resultados])] na ordem de `configs`.
+    """
+    tarefas = []
+    for i, c in enumerate(configs):
+        for r in range(repeticoes):
+            kw = dict(fixos, **c, seed=seed + r)
+            tarefas.append((i, os.path.join(saida, f"run_{i:03d}_seed{seed + r}"), kw, validacao))
+
+    resultados = [[] for _ in configs]
+    print(f"[VARREDURA] {len(configs)} configuração(ões) x {repeticoes} seed(s) = {len(tarefas)} treinos "
+          f"| {workers} processo(s) | saída em '{saida}/'")
+    t0 = time.perf_counter()
+    with multiprocessing.Pool(processes=workers) as pool:
+        for feitos, (i, res) in enumerate(pool.imap_unordered(_executar_tarefa, tarefas), start=1):
+            resultados[i].append(res)
+            extra = " (reaproveitado)" if res["reaproveitado"] else f" em {res['tempo_s']:.1f} s"
+            print(f"[VARREDURA] {feitos}/{len(tarefas)} {os.path.basename(res['diretorio'])} "
+                  f"{_descrever(configs[i])} -> fitness={res['fitness']}{extra}")
+    print(f"[VARREDURA] concluída em {time.perf_counter() - t0:.1f} s")
+    return list(zip(configs, resultados))
+
+# ----------------- Resumo -----------------
+def _descrever(c):
+    return " ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in c.items())
+
+def _media_desvio(vals):
+    vals = [v for v in vals if v is not None]
+    if not vals:
+        return None, None
+    return statistics.fmean(vals), (statistics.stdev(vals) if len(vals) > 1 else 0.0)
+
+def resumir(varredura):
+    """Uma linha por configuração, da melhor para a pior (validação, se houver; senão fitness)."""
+    linhas = []
+    for c, res in varredura:
+        fit, fit_dp = _media_desvio([r["fitness"] for r in res])
+        val, val_dp = _media_desvio([r["validacao"] for r in res])
+        linhas.append({
+            "config": c, "execucoes": len(res),
+            "fitness": fit, "fitness_desvio": fit_dp, "validacao": val, "validacao_desvio": val_dp,
+            "tempo_s": statistics.fmean(r["tempo_s"] for r in res),
+            "avaliacoes": statistics.fmean(r["avaliacoes"] for r in res),
+        })
+    chave = "validacao" if any(l["validacao"] is not None for l in linhas) else "fitness"
+    linhas.sort(key=lambda l: float("-inf") if l[chave] is None else l[chave], reverse=True)
+    return linhas, chave
+
+def imprimir_tabela(linhas, chave):
+    print(f"\n{'#':>3}  {'fitness final':>15}  {'validação':>15}  {'tempo (s)':>9}  {'avaliações':>10}  configuração"
+          f"   (ordem: {chave})")
+    for pos, l in enumerate(linhas, start=1):
+        fit = "-" if l["fitness"] is None else f"{l['fitness']:.2f}±{l['fitness_desvio']:.2f}"
+        val = "-" if l["validacao"] is None else f"{l['validacao']:.2f}±{l['validacao_desvio']:.2f}"
+        print(f"{pos:>3}  {fit:>15}  {val:>15}  {l['tempo_s']:>9.1f}  {l['avaliacoes']:>10.0f}  "
+              f"{_descrever(l['config'])}")
+
+def salvar_resumo(caminho, linhas):
+    nomes = sorted({k for l in linhas for k in l["config"]})
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["posicao"] + nomes + ["execucoes", "fitness_media", "fitness_desvio",
+                                          "validacao_media", "validacao_desvio", "tempo_medio_s",
+                                          "avaliacoes_media"])
+        for pos, l in enumerate(linhas, start=1):
+            w.writerow([pos] + [l["config"].get(n, "") for n in nomes] +
+                       [l["execucoes"], l["fitness"], l["fitness_desvio"], l["validacao"],
+                        l["validacao_desvio"], round(l["tempo_s"], 3), l["avaliacoes"]])
+    print(f"[SALVO] {caminho}")
+
+# ----------------- CLI -----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Varredura de hiperparâmetros do AG (treinos em paralelo).")
+    parser.add_argument("espaco", nargs="+", metavar="nome=valores",
+                        help=f"a,b,c ou lo:hi; nomes: {', '.join(PARAMETROS)}")
+    parser.add_argument("--aleatoria", type=int, default=0, metavar="N",
+                        help="Busca aleatória com N configurações (padrão: grade completa)")
+    parser.add_argument("--geracoes", type=int, default=15, help="Gerações (se não estiver no espaço)")
+    parser.add_argument("--pop", type=int, default=40, help="População (se não estiver no espaço)")
+    parser.add_argument("--seeds", type=int, default=1, help="Seeds por avaliação (se não estiver no espaço)")
+    parser.add_argument("--repeticoes", type=int, default=1, help="Seeds de treino por configuração")
+    parser.add_argument("--seed", type=int, default=42, help="Seed do 1º treino e do sorteio da busca aleatória")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Treinos em paralelo")
+    parser.add_argument("--vetorizado", action="store_true", help="Cada treino avalia a população com NumPy")
+    parser.add_argument("--corrida", action="store_true", help="Corrida nas avaliações multi-seed")
+    parser.add_argument("--agente", choices=AGENTES, default="parametrico")
+    parser.add_argument("--validacao", type=int, default=0, metavar="N",
+                        help="Reavalia o melhor de cada treino em N seeds fora do treino e ordena por isso")
+    parser.add_argument("--saida", type=str, default=DIR_SAIDA, help="Diretório dos treinos e do resumo")
+    args = parser.parse_args()
+
+    try:
+        espaco = ler_espaco(args.espaco)
+        if args.aleatoria > 0:
+            configs = configuracoes_aleatorias(espaco, args.aleatoria, random.Random(args.seed))
+        else:
+            configs = configuracoes_grade(espaco)
+    except ValueError as e:
+        parser.error(str(e))
+
+    fixos = {"geracoes": args.geracoes, "pop_size": args.pop, "seeds_por_avaliacao": args.seeds,
+             "vetorizado": args.vetorizado, "corrida": args.corrida, "agente": args.agente}
+    varredura = varrer(configs, fixos, saida=args.saida, repeticoes=args.repeticoes, seed=args.seed,
+                       workers=args.workers, validacao=args.validacao)
+    linhas, chave = resumir(varredura)
+    imprimir_tabela(linhas, chave)
+    salvar_resumo(os.path.join(args.saida, ARQ_RESUMO), linhas)
+
+    melhor = dict(fixos, **linhas[0]["config"])
+    opcoes = " ".join(f"{PARAMETROS[k][1]} {melhor[k]}" for k in PARAMETROS if k in melhor)
+    print(f"[VARREDURA] melhor configuração: python genetico.py {opcoes}"
+          + (" --vetorizado" if args.vetorizado else "") + (" --corrida" if args.corrida else "")
+          + (f" --agente {args.agente}" if args.agente != "parametrico" else ""))